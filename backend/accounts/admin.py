@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.html import format_html
-from .models import User, UserProfile, EmailVerification, PasswordReset, SecurityAuditLog
+from .models import User, UserColdData, UserProfile, EmailVerification, PasswordReset, SecurityAuditLog, SecurityAuditArchive
 
 
 @admin.register(UserProfile)
@@ -36,10 +36,19 @@ class UserProfileAdmin(admin.ModelAdmin):
     )
 
 
+class UserColdDataInline(admin.StackedInline):
+    """Rarely read user columns stored outside the users table."""
+    
+    model = UserColdData
+    can_delete = False
+    fields = ('two_factor_backup_codes', 'unlock_request_message', 'bitcoin_qr_code')
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     """Admin configuration for User model."""
     
+    inlines = [UserColdDataInline]
     list_display = [
         'email', 'username', 'full_name', 'account_number', 'balance', 
         'is_verified', 'email_verified', 'is_active', 'created_at'
@@ -72,7 +81,7 @@ class UserAdmin(BaseUserAdmin):
             'fields': ('is_verified', 'email_verified', 'phone_verified')
         }),
         ('Security', {
-            'fields': ('two_factor_enabled', 'two_factor_secret', 'two_factor_backup_codes', 
+            'fields': ('two_factor_enabled', 'two_factor_secret', 
                       'two_factor_setup_completed', 'transfer_pin_setup_completed',
                       'transaction_pin', 'failed_pin_attempts', 'pin_locked_until',
                       'last_login_ip', 'failed_login_attempts', 'account_locked_until')
@@ -137,6 +146,18 @@ class SecurityAuditLogAdmin(admin.ModelAdmin):
         return request.user.is_superuser  # Only superusers can delete audit logs
 
 
+@admin.register(SecurityAuditArchive)
+class SecurityAuditArchiveAdmin(admin.ModelAdmin):
+    """Admin configuration for SecurityAuditArchive model."""
+    
+    list_display = ['period_start', 'row_count', 'size_bytes', 'storage_path', 'created_at']
+    readonly_fields = ['period_start', 'row_count', 'storage_path', 'size_bytes', 'checksum', 'created_at']
+    ordering = ['-period_start']
+    
+    def has_add_permission(self, request):
+        return False  # Archives are created by the retention job
+
+
 @admin.register(EmailVerification)
 class EmailVerificationAdmin(admin.ModelAdmin):
     """Admin configuration for EmailVerification model."""
@@ -0,0 +1,164 @@
+"""
+Retention and cold-storage archival for security audit logs.
+
+``security_audit_logs`` is treated as a set of monthly partitions. Whole months
+older than ``SECURITY_AUDIT_RETENTION_DAYS`` are exported to gzip-compressed JSON
+Lines files in the private ``audit_archive`` storage (``STORAGES``), read back and
+checked, recorded in ``SecurityAuditArchive`` and only then deleted from the
+live table, which therefore only ever holds a recent window.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import tempfile
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import storages
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import SecurityAuditLog, SecurityAuditArchive
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PREFIX = 'audit-archive/security_audit_logs'
+EXPORT_CHUNK_SIZE = 2000
+DELETE_CHUNK_SIZE = 5000
+ARCHIVE_STORAGE = 'audit_archive'
+EXPORT_FIELDS = ('id', 'user_id', 'event_type', 'description', 'ip_address', 'user_agent', 'metadata', 'created_at')
+
+
+def month_start(value):
+    """First day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+def next_month(period_start):
+    return date(period_start.year + period_start.month // 12, period_start.month % 12 + 1, 1)
+
+
+def month_range(period_start):
+    """Aware [start, end) datetimes for the month beginning at ``period_start``."""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(period_start, datetime.min.time()), tz)
+    end = timezone.make_aware(datetime.combine(next_month(period_start), datetime.min.time()), tz)
+    return start, end
+
+
+def retention_cutoff(now=None):
+    """Months starting before this date are eligible for archival."""
+    now = now or timezone.now()
+    retention_days = getattr(settings, 'SECURITY_AUDIT_RETENTION_DAYS', 365)
+    return month_start(timezone.localtime(now - timedelta(days=retention_days)))
+
+
+def verify_archive(storage, storage_path, row_count, checksum):
+    """
+    Read a stored archive back and check it against what was written.
+
+    Returns:
+        str: empty if the stored file matches, otherwise what is wrong with it
+    """
+    if not storage.exists(storage_path):
+        return 'file is missing'
+    stored_checksum = hashlib.sha256()
+    with storage.open(storage_path, 'rb') as stored:
+        for block in iter(lambda: stored.read(1024 * 1024), b''):
+            stored_checksum.update(block)
+    if stored_checksum.hexdigest() != checksum:
+        return 'checksum does not match'
+    with storage.open(storage_path, 'rb') as stored, gzip.GzipFile(fileobj=stored, mode='rb') as gz:
+        stored_rows = sum(1 for _ in gz)
+    if stored_rows != row_count:
+        return f'holds {stored_rows} rows, expected {row_count}'
+    return ''
+
+
+def archive_month(period_start):
+    """
+    Export one month of audit logs to cold storage and delete it from the live table.
+
+    The live rows are only deleted once the stored copy has been read back and
+    matches the export.
+
+    Returns:
+        SecurityAuditArchive or None if the month held no rows or the stored
+        copy failed verification
+    """
+    start, end = month_range(period_start)
+    month_qs = SecurityAuditLog.objects.filter(created_at__gte=start, created_at__lt=end)
+
+    # Pin the row set so rows exported and rows deleted are exactly the same
+    max_id = month_qs.order_by('-id').values_list('id', flat=True).first()
+    if max_id is None:
+        return None
+    month_qs = month_qs.filter(id__lte=max_id)
+
+    row_count = 0
+    with tempfile.TemporaryFile() as tmp:
+        with gzip.GzipFile(fileobj=tmp, mode='wb') as gz:
+            for row in month_qs.order_by('id').values(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                gz.write(json.dumps(row, cls=DjangoJSONEncoder).encode('utf-8'))
+                gz.write(b'\n')
+                row_count += 1
+
+        size_bytes = tmp.tell()
+        tmp.seek(0)
+        checksum = hashlib.sha256()
+        for block in iter(lambda: tmp.read(1024 * 1024), b''):
+            checksum.update(block)
+        tmp.seek(0)
+
+        storage = storages[ARCHIVE_STORAGE]
+        storage_path = storage.save(f'{ARCHIVE_PREFIX}/{period_start:%Y-%m}.jsonl.gz', File(tmp))
+
+    problem = verify_archive(storage, storage_path, row_count, checksum.hexdigest())
+    if problem:
+        logger.error(
+            f"Security audit archive {storage_path} for {period_start:%Y-%m} failed verification "
+            f"({problem}); keeping the live rows"
+        )
+        return None
+
+    archive = SecurityAuditArchive.objects.create(
+        period_start=period_start,
+        row_count=row_count,
+        storage_path=storage_path,
+        size_bytes=size_bytes,
+        checksum=checksum.hexdigest(),
+    )
+
+    # Delete in chunks to keep each statement and its locks short
+    while True:
+        ids = list(month_qs.values_list('id', flat=True)[:DELETE_CHUNK_SIZE])
+        if not ids:
+            break
+        SecurityAuditLog.objects.filter(id__in=ids).delete()
+
+    logger.info(f"Archived {row_count} security audit logs for {period_start:%Y-%m} to {storage_path}")
+    return archive
+
+
+def archive_expired_security_logs(now=None):
+    """
+    Archive every whole month that has fallen out of the retention window.
+
+    Returns:
+        list: SecurityAuditArchive records created by this run
+    """
+    cutoff = retention_cutoff(now)
+    oldest = SecurityAuditLog.objects.order_by('created_at').values_list('created_at', flat=True).first()
+    if oldest is None:
+        return []
+
+    archives = []
+    period = month_start(timezone.localtime(oldest))
+    while period < cutoff:
+        archive = archive_month(period)
+        if archive:
+            archives.append(archive)
+        period = next_month(period)
+    return archives
@@ -1,10 +1,15 @@
 """
 Custom authentication classes for cookie-based JWT authentication.
 """
+from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework.authentication import CSRFCheck
 from rest_framework import exceptions
 
+from .user_cache import get_cached_user
+
 
 class CookieJWTAuthentication(JWTAuthentication):
     """
@@ -15,26 +20,52 @@ class CookieJWTAuthentication(JWTAuthentication):
     def authenticate(self, request):
         # 1. Try Authorization header first (standard JWT behavior)
         # This allows the frontend to explicitly override cookies (e.g., using fallback from sessionStorage)
+        validated_token = None
         header = self.get_header(request)
         if header is not None:
             raw_token = self.get_raw_token(header)
             if raw_token is not None:
                 try:
                     validated_token = self.get_validated_token(raw_token)
-                    return self.get_user(validated_token), validated_token
                 except Exception:
                     # If header token is invalid, fall through to try cookie
                     pass
         
         # 2. Fallback to HTTP-only cookie
-        raw_token = request.COOKIES.get('access_token')
-        if raw_token is None:
-            return None
+        if validated_token is None:
+            raw_token = request.COOKIES.get('access_token')
+            if raw_token is None:
+                return None
+            
+            try:
+                validated_token = self.get_validated_token(raw_token)
+            except Exception:
+                # If cookie token is invalid, treat as unauthenticated
+                # This allows AllowAny views to work even with expired cookies
+                return None
         
+        # Resolve the user once, whichever token was accepted
         try:
-            validated_token = self.get_validated_token(raw_token)
             return self.get_user(validated_token), validated_token
         except Exception:
-            # If cookie token is invalid, treat as unauthenticated
-            # This allows AllowAny views to work even with expired cookies
             return None
+    
+    def get_user(self, validated_token):
+        """Resolve the user from the cached auth snapshot instead of a full row fetch."""
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation compares against the current password hash, which is never cached
+            return super().get_user(validated_token)
+        
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+        
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        
+        return user
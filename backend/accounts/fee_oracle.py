@@ -0,0 +1,167 @@
+"""
+Bitcoin network fee oracle.
+
+Fee rates (satoshis per virtual byte) for the low/medium/high tiers are fetched
+from BlockCypher by the ``refresh_bitcoin_fee_rates`` task and kept in the shared cache.
+Request paths only read the cache: if the fresh entry has expired they use the
+last rates that were fetched successfully, and if there are none, a fixed fallback
+table. A BTC send never waits on the fee API.
+
+Fees are sized from the transaction shape (input/output counts and script types)
+rather than a single fixed transaction size.
+"""
+import logging
+import math
+import time
+from decimal import Decimal
+
+import requests
+from django.conf import settings
+
+from utils.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+
+FEE_TIERS = ('low', 'medium', 'high')
+
+FEE_RATES_CACHE_KEY = 'bitcoin_fee_rates'
+LAST_GOOD_FEE_RATES_CACHE_KEY = 'bitcoin_fee_rates:last_good'
+
+# sat/vB used when no fetched rates are available
+FALLBACK_FEE_RATES = {'low': 5, 'medium': 15, 'high': 30}
+
+# Floor so a bad API response never produces an unrelayable transaction
+MIN_RELAY_FEE_RATE = 1
+
+# Virtual bytes per input / output by script type
+SCRIPT_SIZES = {
+    'p2pkh': {'input': 148, 'output': 34},
+    'p2sh-p2wpkh': {'input': 91, 'output': 32},
+    'p2wpkh': {'input': 68, 'output': 31},
+    'p2wsh': {'input': 105, 'output': 43},  # input assumes 2-of-3 multisig
+    'p2tr': {'input': 57.5, 'output': 43},
+}
+LEGACY_OVERHEAD = 10
+SEGWIT_OVERHEAD = 10.5
+
+SATOSHIS_PER_BTC = Decimal('100000000')
+
+
+def address_script_type(address):
+    """Best-effort script type of a mainnet or testnet address (defaults to p2wpkh)."""
+    if not address:
+        return 'p2wpkh'
+    lowered = address.lower()
+    if lowered.startswith(('bc1p', 'tb1p')):
+        return 'p2tr'
+    if lowered.startswith(('bc1q', 'tb1q')):
+        return 'p2wsh' if len(address) > 50 else 'p2wpkh'
+    if address[0] in ('3', '2'):
+        return 'p2sh-p2wpkh'
+    if address[0] in ('1', 'm', 'n'):
+        return 'p2pkh'
+    return 'p2wpkh'
+
+
+def estimate_vsize(input_types, output_types):
+    """
+    Virtual size of a transaction.
+
+    Args:
+        input_types (list): Script type of each input
+        output_types (list): Script type of each output
+
+    Returns:
+        int: Size in vbytes, rounded up
+    """
+    segwit = any(script_type != 'p2pkh' for script_type in input_types)
+    size = SEGWIT_OVERHEAD if segwit else LEGACY_OVERHEAD
+    size += sum(SCRIPT_SIZES[script_type]['input'] for script_type in input_types)
+    size += sum(SCRIPT_SIZES[script_type]['output'] for script_type in output_types)
+    return math.ceil(size)
+
+
+def fetch_fee_rates():
+    """Fetch current tier rates (sat/vB) from BlockCypher."""
+    response = requests.get('https://api.blockcypher.com/v1/btc/main', timeout=5)
+    response.raise_for_status()
+    data = response.json()
+    return {
+        tier: max(MIN_RELAY_FEE_RATE, round(data[f'{tier}_fee_per_kb'] / 1000, 2))
+        for tier in FEE_TIERS
+    }
+
+
+def refresh_fee_rates():
+    """
+    Fetch rates and store them in the cache.
+
+    Returns:
+        dict or None: The stored entry, or None if the fetch failed
+    """
+    try:
+        rates = fetch_fee_rates()
+    except Exception as e:
+        logger.warning(f"Could not refresh Bitcoin fee rates: {e}")
+        return None
+
+    entry = {'rates': rates, 'source': 'blockcypher', 'fetched_at': time.time()}
+    shared_cache.set(FEE_RATES_CACHE_KEY, entry, settings.BITCOIN_FEE_RATES_TTL)
+    shared_cache.set(LAST_GOOD_FEE_RATES_CACHE_KEY, entry, None)
+    return entry
+
+
+def get_fee_rates():
+    """
+    Current tier rates without any network call.
+
+    Returns:
+        dict: {'rates': {tier: sat/vB}, 'source': str, 'fetched_at': float or None}
+    """
+    entry = shared_cache.get(FEE_RATES_CACHE_KEY)
+    if entry is not None:
+        return entry
+
+    entry = shared_cache.get(LAST_GOOD_FEE_RATES_CACHE_KEY)
+    if entry is not None:
+        return dict(entry, source='stale')
+
+    return {'rates': dict(FALLBACK_FEE_RATES), 'source': 'fallback', 'fetched_at': None}
+
+
+def estimate_fee(tier='medium', from_address=None, to_address=None, num_inputs=1, with_change=True):
+    """
+    Estimate the fee for a send.
+
+    Args:
+        tier (str): One of FEE_TIERS
+        from_address (str): Sender address; sets the input and change script type
+        to_address (str): Recipient address; sets the output script type
+        num_inputs (int): Number of UTXOs spent
+        with_change (bool): Whether the transaction has a change output
+
+    Returns:
+        dict: tier, fee_rate (sat/vB), vsize, fee_satoshi, fee_btc (Decimal), source
+    """
+    if tier not in FEE_TIERS:
+        raise ValueError(f"Invalid fee tier '{tier}'. Allowed values are: {', '.join(FEE_TIERS)}")
+
+    entry = get_fee_rates()
+    fee_rate = entry['rates'][tier]
+
+    sender_type = address_script_type(from_address)
+    output_types = [address_script_type(to_address)]
+    if with_change:
+        output_types.append(sender_type)
+    vsize = estimate_vsize([sender_type] * max(1, num_inputs), output_types)
+
+    fee_satoshi = math.ceil(fee_rate * vsize)
+    return {
+        'tier': tier,
+        'fee_rate': fee_rate,
+        'vsize': vsize,
+        'fee_satoshi': fee_satoshi,
+        'fee_btc': Decimal(fee_satoshi) / SATOSHIS_PER_BTC,
+        'source': entry['source'],
+    }
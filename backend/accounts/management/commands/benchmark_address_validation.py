@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from blockcypher.utils import is_valid_address as blockcypher_is_valid_address
+from utils.bitcoin_address import clear_address_cache, is_valid_address, validate_addresses
+import timeit
+
+
+SAMPLE_ADDRESSES = [
+    '1BoatSLRHtKNngkdXEeobR76b53LETtpyT',  # P2PKH
+    '3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy',  # P2SH
+    'bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq',  # P2WPKH
+    'bc1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3qccfmv3',  # P2WSH
+    'bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj0',  # P2TR
+    'mipcBbFg9gMiCh81Kj8tqqdgoZub1ZJRfn',  # Testnet P2PKH
+    'tb1qw508d6qejxtdg4y5r3zarvary0c5xw7kxpjzsx',  # Testnet P2WPKH
+    '1BoatSLRHtKNngkdXEeobR76b53LETtpyU',  # Bad Base58Check checksum
+    'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t5',  # Bad Bech32 checksum
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare local Bitcoin address validation with blockcypher.is_valid_address'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000, help='Passes over the sample addresses')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        def uncached():
+            clear_address_cache()
+            for address in SAMPLE_ADDRESSES:
+                is_valid_address(address)
+
+        scenarios = [
+            ('blockcypher is_valid_address', lambda: [blockcypher_is_valid_address(a) for a in SAMPLE_ADDRESSES]),
+            ('local validator, cold cache', uncached),
+            ('local validator, warm cache', lambda: [is_valid_address(a) for a in SAMPLE_ADDRESSES]),
+            ('local batch validate_addresses', lambda: validate_addresses(SAMPLE_ADDRESSES)),
+        ]
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Results'))
+        for address, info in validate_addresses(SAMPLE_ADDRESSES).items():
+            self.stdout.write(f'{address:66s} local={info.valid!s:5s} blockcypher={blockcypher_is_valid_address(address)!s:5s} {info.script_type or ""}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Timing ({iterations} passes over {len(SAMPLE_ADDRESSES)} addresses)'))
+        for name, func in scenarios:
+            elapsed = timeit.timeit(func, number=iterations)
+            self.stdout.write(f'{name:35s} {elapsed / (iterations * len(SAMPLE_ADDRESSES)) * 1_000_000:8.3f} µs/address')
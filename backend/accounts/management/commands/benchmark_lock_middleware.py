@@ -0,0 +1,48 @@
+from django.contrib.auth import SESSION_KEY
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from accounts.middleware import AccountLockMiddleware, DEFAULT_EXEMPT_PATHS
+from accounts.models import User
+import timeit
+
+
+class Command(BaseCommand):
+    help = 'Measure per-request overhead of AccountLockMiddleware'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=100000, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        middleware = AccountLockMiddleware(lambda request: HttpResponse())
+        factory = RequestFactory()
+
+        exempt_request = factory.get('/api/auth/account-status/')
+        anonymous_request = factory.get('/api/banking/balance/')
+        anonymous_request.session = {}
+
+        user = User.objects.filter(is_staff=False).first()
+        user_request = factory.get('/api/banking/balance/')
+        user_request.session = {SESSION_KEY: str(user.pk)} if user else {}
+
+        def legacy_skip_check(request):
+            # Previous implementation: list rebuilt per request plus a linear startswith scan
+            skip_paths = list(DEFAULT_EXEMPT_PATHS)
+            return any(request.path.startswith(path) for path in skip_paths)
+
+        scenarios = [
+            ('legacy skip-list scan (exempt path)', lambda: legacy_skip_check(exempt_request)),
+            ('legacy skip-list scan (non-exempt path)', lambda: legacy_skip_check(anonymous_request)),
+            ('exempt path', lambda: middleware.process_request(exempt_request)),
+            ('anonymous request', lambda: middleware.process_request(anonymous_request)),
+        ]
+        if user:
+            middleware.process_request(user_request)  # Warm the auth snapshot
+            scenarios.append(('session user, cached snapshot', lambda: middleware.process_request(user_request)))
+        else:
+            self.stdout.write(self.style.WARNING('No non-staff user found; skipping authenticated scenario'))
+
+        for name, func in scenarios:
+            elapsed = timeit.timeit(func, number=iterations)
+            self.stdout.write(f'{name:45s} {elapsed / iterations * 1_000_000:8.3f} µs/request')
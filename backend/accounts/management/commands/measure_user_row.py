@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from accounts.models import User, UserColdData
+from accounts.user_cache import SNAPSHOT_FIELDS, get_cached_user
+import time
+
+
+class Command(BaseCommand):
+    help = 'Report user row sizes and auth-path lookup latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500, help='Lookups per timing scenario')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Row size (average bytes per row)'))
+        self.report_row_size(User, [f.column for f in User._meta.concrete_fields])
+        self.report_row_size(User, [User._meta.get_field(name).column for name in SNAPSHOT_FIELDS], label='users (auth snapshot columns)')
+        self.report_row_size(UserColdData, [f.column for f in UserColdData._meta.concrete_fields])
+
+        user = User.objects.order_by('id').first()
+        if user is None:
+            self.stdout.write(self.style.WARNING('No users found; skipping latency measurements'))
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Auth-path lookup latency ({iterations} iterations)'))
+        get_cached_user(user.pk)  # Warm the snapshot
+        scenarios = [
+            ('full row (User.objects.get)', lambda: User.objects.get(pk=user.pk)),
+            ('hot projection (.only snapshot fields)', lambda: User.objects.only(*SNAPSHOT_FIELDS).get(pk=user.pk)),
+            ('cached auth snapshot', lambda: get_cached_user(user.pk)),
+        ]
+        for name, func in scenarios:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'{name:42s} {elapsed / iterations * 1000:8.3f} ms/lookup')
+
+    def report_row_size(self, model, columns, label=None):
+        table = model._meta.db_table
+        label = label or table
+        quoted = [connection.ops.quote_name(column) for column in columns]
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                size_expr = ' + '.join(f'COALESCE(pg_column_size({column}), 0)' for column in quoted)
+            else:
+                size_expr = ' + '.join(f'COALESCE(LENGTH(CAST({column} AS TEXT)), 0)' for column in quoted)
+            cursor.execute(f'SELECT COUNT(*), AVG({size_expr}), MAX({size_expr}) FROM {connection.ops.quote_name(table)}')
+            count, average, maximum = cursor.fetchone()
+
+        self.stdout.write(f'{label:42s} rows={count:<8d} avg={float(average or 0):10.1f} max={maximum or 0}')
@@ -1,56 +1,103 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
 from rest_framework import status
 
+from .user_cache import get_cached_user
+
+
+# Path prefixes that are never blocked by an account lock.
+# Override with ACCOUNT_LOCK_EXEMPT_PATHS in settings.
+DEFAULT_EXEMPT_PATHS = (
+    '/api/auth/login/',
+    '/api/auth/register/',
+    '/api/auth/refresh/',
+    '/api/auth/password-reset-request/',
+    '/api/auth/password-reset/',
+    '/api/auth/verify-email/',
+    '/api/auth/two-factor-login-verify/',
+    '/api/auth/request-unlock/',
+    '/api/auth/profile/',  # Allow profile access to get lock status
+    '/api/auth/account-status/',  # Allow account status check
+    '/admin/',  # Skip admin endpoints
+    '/static/',
+    '/media/',
+    '/livez',
+    '/readyz',
+)
+
+
+def compile_exempt_paths(prefixes):
+    """Compile path prefixes into one anchored regex (longest first)."""
+    if not prefixes:
+        return None
+    alternatives = '|'.join(re.escape(prefix) for prefix in sorted(prefixes, key=len, reverse=True))
+    return re.compile(f'(?:{alternatives})')
+
 
 class AccountLockMiddleware(MiddlewareMixin):
     """
     Middleware to check if authenticated user's account is locked.
     Returns 403 with lock details if account is locked.
+    
+    Lock state is read from the cached auth snapshot (accounts.user_cache), so the
+    check neither forces lazy authentication nor loads the full user row.
     """
     
-    def process_request(self, request):
-        # Skip check for certain paths
-        skip_paths = [
-            '/api/auth/login/',
-            '/api/auth/register/',
-            '/api/auth/refresh/',
-            '/api/auth/password-reset-request/',
-            '/api/auth/password-reset/',
-            '/api/auth/verify-email/',
-            '/api/auth/two-factor-login-verify/',
-            '/api/auth/request-unlock/',
-            '/api/auth/profile/',  # Allow profile access to get lock status
-            '/api/auth/account-status/',  # Allow account status check
-            '/admin/',  # Skip admin endpoints
-            '/static/',
-            '/media/',
-        ]
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        self.exempt_paths = compile_exempt_paths(
+            getattr(settings, 'ACCOUNT_LOCK_EXEMPT_PATHS', DEFAULT_EXEMPT_PATHS)
+        )
+    
+    def is_exempt(self, path):
+        return self.exempt_paths is not None and self.exempt_paths.match(path) is not None
+    
+    def get_user_id(self, request):
+        """User id for the request without triggering authentication."""
+        # Already resolved earlier in the request
+        user = getattr(request, '_cached_user', None)
+        if user is not None:
+            return user.pk if user.is_authenticated else None
         
+        session = getattr(request, 'session', None)
+        if session is None:
+            return None
+        return session.get(SESSION_KEY)
+    
+    def process_request(self, request):
         # Skip if path should be ignored
-        if any(request.path.startswith(path) for path in skip_paths):
+        if self.is_exempt(request.path):
             return None
-            
+        
         # Skip if user is not authenticated
-        if not hasattr(request, 'user') or not request.user.is_authenticated:
+        user_id = self.get_user_id(request)
+        if user_id is None:
+            return None
+        
+        user = get_cached_user(user_id)
+        if user is None:
             return None
             
         # Skip if user is admin (admins can't be locked by this system)
-        if request.user.is_staff or request.user.is_superuser:
+        if user.is_staff or user.is_superuser:
             return None
             
         # Check if account is locked - block most API calls but allow viewing lock status
-        if hasattr(request.user, 'is_account_locked') and request.user.is_account_locked():
+        if user.is_account_locked():
             # Convert datetime to JSON-safe string
-            locked_until_str = request.user.account_locked_until.isoformat() if request.user.account_locked_until else None
+            locked_until_str = user.account_locked_until.isoformat() if user.account_locked_until else None
             
             return JsonResponse({
                 'error': 'Account is locked',
                 'account_locked': True,
                 'locked_until': locked_until_str,
-                'lock_reason': request.user.account_lock_reason,
-                'unlock_request_pending': request.user.unlock_request_pending,
-                'message': f'Your account has been locked. Reason: {request.user.account_lock_reason}. Please request an unlock or wait until {locked_until_str}.'
+                'lock_reason': user.account_lock_reason,
+                'unlock_request_pending': user.unlock_request_pending,
+                'message': f'Your account has been locked. Reason: {user.account_lock_reason}. Please request an unlock or wait until {locked_until_str}.'
             }, status=status.HTTP_403_FORBIDDEN)
             
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+# Trigram indexes on the exact expressions Django emits for icontains/istartswith
+# on PostgreSQL (UPPER(col::text) LIKE ...). Other backends skip these.
+SEARCH_COLUMNS = ('email', 'first_name', 'last_name')
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS users_{column}_upper_trgm_idx '
+            f'ON users USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS users_{column}_upper_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_profile_image_url'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='securityauditlog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
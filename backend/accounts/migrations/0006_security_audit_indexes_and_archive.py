@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_log_created_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SecurityAuditArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_start', models.DateField(db_index=True)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('storage_path', models.CharField(max_length=500)),
+                ('size_bytes', models.PositiveBigIntegerField(default=0)),
+                ('checksum', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'security_audit_archives',
+                'ordering': ['-period_start'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='securityauditlog',
+            index=models.Index(fields=['user', '-created_at'], name='audit_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='securityauditlog',
+            index=models.Index(fields=['event_type', '-created_at'], name='audit_event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='securityauditlog',
+            index=models.Index(fields=['-created_at'], name='audit_created_idx'),
+        ),
+    ]
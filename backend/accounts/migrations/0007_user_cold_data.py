@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+COLD_FIELDS = ('bitcoin_qr_code', 'two_factor_backup_codes', 'unlock_request_message')
+BATCH_SIZE = 1000
+
+
+def copy_to_cold_data(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    UserColdData = apps.get_model('accounts', 'UserColdData')
+
+    # Only users with something to move get a row; others are created lazily
+    users = (
+        User.objects.exclude(bitcoin_qr_code='', two_factor_backup_codes=[], unlock_request_message='')
+        .values_list('id', *COLD_FIELDS)
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    batch = []
+    for user_id, qr_code, backup_codes, unlock_message in users:
+        batch.append(UserColdData(
+            user_id=user_id,
+            bitcoin_qr_code=qr_code,
+            two_factor_backup_codes=backup_codes or [],
+            unlock_request_message=unlock_message,
+        ))
+        if len(batch) >= BATCH_SIZE:
+            UserColdData.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        UserColdData.objects.bulk_create(batch)
+
+
+def copy_from_cold_data(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    UserColdData = apps.get_model('accounts', 'UserColdData')
+
+    for cold in UserColdData.objects.iterator(chunk_size=BATCH_SIZE):
+        User.objects.filter(pk=cold.user_id).update(**{field: getattr(cold, field) for field in COLD_FIELDS})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_security_audit_indexes_and_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserColdData',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='cold_data', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('bitcoin_qr_code', models.TextField(blank=True)),
+                ('two_factor_backup_codes', models.JSONField(blank=True, default=list)),
+                ('unlock_request_message', models.TextField(blank=True)),
+            ],
+            options={
+                'db_table': 'user_cold_data',
+            },
+        ),
+        migrations.RunPython(copy_to_cold_data, copy_from_cold_data),
+        migrations.RemoveField(
+            model_name='user',
+            name='bitcoin_qr_code',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='two_factor_backup_codes',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='unlock_request_message',
+        ),
+    ]
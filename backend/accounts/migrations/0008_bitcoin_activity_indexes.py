@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_user_cold_data'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bitcointransaction',
+            index=models.Index(fields=['user', '-created_at'], name='acct_btc_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bitcointransaction',
+            index=models.Index(fields=['user', 'updated_at'], name='acct_btc_user_updated_idx'),
+        ),
+    ]
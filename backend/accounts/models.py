@@ -5,6 +5,22 @@ from django.utils import timezone
 import uuid
 
 
+# Wide, rarely read columns live in UserColdData (user_cold_data) so the hot
+# ``users`` row stays narrow. These names remain readable/writable on User.
+COLD_FIELDS = ('bitcoin_qr_code', 'two_factor_backup_codes', 'unlock_request_message')
+
+
+def _cold_field(name):
+    """Proxy a UserColdData column as a User attribute, loaded on first access."""
+    def getter(self):
+        return getattr(self.get_cold_data(), name)
+    
+    def setter(self, value):
+        setattr(self.get_cold_data(), name, value)
+    
+    return property(getter, setter)
+
+
 class User(AbstractUser):
     """Custom User model for PrimeTrust banking application."""
     
@@ -32,7 +48,6 @@ class User(AbstractUser):
     # Bitcoin information
     bitcoin_balance = models.DecimalField(max_digits=20, decimal_places=8, default=0.00000000)
     bitcoin_wallet_address = models.CharField(max_length=100, blank=True)
-    bitcoin_qr_code = models.TextField(blank=True)  # Store QR code data or URL
     
     # Transaction PIN for Bitcoin transactions
     transaction_pin = models.CharField(max_length=10, blank=True)  # 4-digit PIN
@@ -46,7 +61,6 @@ class User(AbstractUser):
     # Security
     two_factor_enabled = models.BooleanField(default=False)
     two_factor_secret = models.CharField(max_length=32, blank=True)  # TOTP secret key
-    two_factor_backup_codes = models.JSONField(default=list, blank=True)  # Backup codes
     two_factor_setup_completed = models.BooleanField(default=False)  # Track 2FA setup completion
     transfer_pin_setup_completed = models.BooleanField(default=False)  # Track PIN setup completion
     last_login_ip = models.GenericIPAddressField(null=True, blank=True)
@@ -55,7 +69,6 @@ class User(AbstractUser):
     account_lock_reason = models.CharField(max_length=255, blank=True)  # Reason for account lock
     unlock_request_pending = models.BooleanField(default=False)  # User requested unlock
     unlock_request_submitted_at = models.DateTimeField(null=True, blank=True)  # When unlock was requested
-    unlock_request_message = models.TextField(blank=True)  # User's message for unlock request
     failed_pin_attempts = models.PositiveIntegerField(default=0)  # Track failed PIN attempts
     pin_locked_until = models.DateTimeField(null=True, blank=True)  # PIN lockout
     
@@ -64,6 +77,11 @@ class User(AbstractUser):
     updated_at = models.DateTimeField(auto_now=True)
     last_activity = models.DateTimeField(auto_now=True)
     
+    # Cold columns (stored in UserColdData)
+    bitcoin_qr_code = _cold_field('bitcoin_qr_code')  # Store QR code data or URL
+    two_factor_backup_codes = _cold_field('two_factor_backup_codes')  # Backup codes
+    unlock_request_message = _cold_field('unlock_request_message')  # User's message for unlock request
+    
     # Override username field to use email
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
@@ -85,7 +103,31 @@ class User(AbstractUser):
         if not self.routing_number:
             self.routing_number = self.generate_routing_number()
         
-        super().save(*args, **kwargs)
+        # Cold columns are not fields on this table; save them with the side row
+        update_fields = kwargs.get('update_fields')
+        save_cold = update_fields is None
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            save_cold = bool(update_fields & set(COLD_FIELDS))
+            kwargs['update_fields'] = update_fields - set(COLD_FIELDS)
+        
+        if kwargs.get('update_fields') is None or kwargs['update_fields']:
+            super().save(*args, **kwargs)
+        
+        # Only touch the side row if it was loaded (i.e. a cold field was read or written)
+        cold_data = self._state.fields_cache.get('cold_data')
+        if save_cold and cold_data is not None:
+            cold_data.user = self
+            cold_data.save()
+    
+    def get_cold_data(self):
+        """Return the UserColdData row, creating it in memory if missing."""
+        try:
+            return self.cold_data
+        except UserColdData.DoesNotExist:
+            cold_data = UserColdData(user=self)
+            self.cold_data = cold_data
+            return cold_data
     
     def generate_account_number(self):
         """Generate a unique 10-digit account number."""
@@ -322,6 +364,21 @@ class User(AbstractUser):
         )
 
 
+class UserColdData(models.Model):
+    """Rarely read, wide user columns kept out of the hot users table."""
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='cold_data')
+    bitcoin_qr_code = models.TextField(blank=True)  # Store QR code data or URL
+    two_factor_backup_codes = models.JSONField(default=list, blank=True)  # Backup codes
+    unlock_request_message = models.TextField(blank=True)  # User's message for unlock request
+    
+    class Meta:
+        db_table = 'user_cold_data'
+    
+    def __str__(self):
+        return f"Cold data for {self.user_id}"
+
+
 class EmailVerification(models.Model):
     """Model for email verification tokens."""
     
@@ -469,6 +526,10 @@ class BitcoinTransaction(models.Model):
     class Meta:
         db_table = 'account_bitcoin_transactions'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='acct_btc_user_created_idx'),
+            models.Index(fields=['user', 'updated_at'], name='acct_btc_user_updated_idx'),
+        ]
     
     def __str__(self):
         return f"Bitcoin {self.transaction_type} - {self.user.email} - {self.amount_btc} BTC"
@@ -516,11 +577,35 @@ class SecurityAuditLog(models.Model):
     metadata = models.JSONField(default=dict, blank=True)  # Additional event data
     
     # Timestamps
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Explicit default (not auto_now_add) so buffered bulk inserts keep the event time
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         db_table = 'security_audit_logs'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='audit_user_created_idx'),
+            models.Index(fields=['event_type', '-created_at'], name='audit_event_created_idx'),
+            models.Index(fields=['-created_at'], name='audit_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.event_type} - {self.created_at}"
+
+
+class SecurityAuditArchive(models.Model):
+    """One archived calendar month of security audit logs in cold storage."""
+    
+    period_start = models.DateField(db_index=True)  # First day of the archived month
+    row_count = models.PositiveIntegerField(default=0)
+    storage_path = models.CharField(max_length=500)
+    size_bytes = models.PositiveBigIntegerField(default=0)
+    checksum = models.CharField(max_length=64)  # SHA-256 of the compressed file
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'security_audit_archives'
+        ordering = ['-period_start']
+    
+    def __str__(self):
+        return f"Security audit archive {self.period_start:%Y-%m} ({self.row_count} rows)"
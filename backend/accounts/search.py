@@ -0,0 +1,84 @@
+"""
+Indexed user search shared by the admin user list and the API search endpoints.
+
+On PostgreSQL the lookups below are served by the trigram GIN indexes created in
+``accounts/migrations/0004_user_search_trigram_indexes.py``. Django renders
+``icontains``/``istartswith`` as ``UPPER(col) LIKE UPPER(...)``, which is exactly the
+expression those indexes are built on, so no full table scan is needed.
+"""
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+
+USER_SEARCH_FIELDS = ('email', 'first_name', 'last_name')
+
+# Result caps
+AUTOCOMPLETE_LIMIT = 8
+MAX_SEARCH_RESULTS = 200
+MIN_QUERY_LENGTH = 2
+
+
+class UserSearchService:
+    """Ranked, capped user search."""
+
+    @staticmethod
+    def normalize(query):
+        """Collapse whitespace and lowercase the query."""
+        return ' '.join((query or '').split()).lower()
+
+    @staticmethod
+    def _term_filter(terms, lookup):
+        """Every term must match at least one of the search fields."""
+        condition = Q()
+        for term in terms:
+            term_q = Q()
+            for field in USER_SEARCH_FIELDS:
+                term_q |= Q(**{f'{field}__{lookup}': term})
+            condition &= term_q
+        return condition
+
+    @staticmethod
+    def _rank(query):
+        """Lower rank is a better match: exact email, email prefix, name prefix, substring."""
+        return Case(
+            When(email__iexact=query, then=Value(0)),
+            When(email__istartswith=query, then=Value(1)),
+            When(Q(first_name__istartswith=query) | Q(last_name__istartswith=query), then=Value(2)),
+            default=Value(3),
+            output_field=IntegerField(),
+        )
+
+    @classmethod
+    def search(cls, queryset, query, autocomplete=False):
+        """Filter and rank ``queryset`` by ``query``; returns an ordered queryset."""
+        query = cls.normalize(query)
+        if len(query) < MIN_QUERY_LENGTH:
+            return queryset.none()
+
+        terms = query.split(' ')
+        lookup = 'istartswith' if autocomplete else 'icontains'
+        queryset = queryset.filter(cls._term_filter(terms, lookup)).annotate(search_rank=cls._rank(query))
+        ordering = ['search_rank']
+
+        if connection.vendor == 'postgresql':
+            from django.contrib.postgres.search import TrigramSimilarity
+
+            queryset = queryset.annotate(
+                search_similarity=Greatest(*[TrigramSimilarity(field, query) for field in USER_SEARCH_FIELDS])
+            )
+            ordering.append('-search_similarity')
+
+        return queryset.order_by(*ordering, 'id')
+
+    @classmethod
+    def autocomplete(cls, queryset, query, limit=AUTOCOMPLETE_LIMIT):
+        """Prefix matches only, narrow column set, small fixed cap."""
+        return cls.search(
+            queryset.only('id', *USER_SEARCH_FIELDS), query, autocomplete=True
+        )[:min(limit, AUTOCOMPLETE_LIMIT)]
+
+    @staticmethod
+    def to_result(user):
+        """Compact representation used by the search endpoints."""
+        return {'id': user.id, 'name': user.get_full_name(), 'email': user.email}
@@ -458,6 +458,7 @@ class BitcoinSendSerializer(serializers.Serializer):
     recipient_wallet_address = serializers.CharField(max_length=100)
     recipient_name = serializers.CharField(max_length=100, required=False, allow_blank=True)
     transaction_pin = serializers.CharField(max_length=10, min_length=4)
+    fee_tier = serializers.ChoiceField(choices=['low', 'medium', 'high'], default='medium')
     
     def validate(self, attrs):
         """Validate the Bitcoin send transaction."""
@@ -5,7 +5,6 @@ from decimal import Decimal
 from django.conf import settings
 from django.core.cache import cache
 from blockcypher import get_address_details, get_transaction_details, pushtx
-from blockcypher.utils import is_valid_address
 import environ
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
@@ -76,11 +75,9 @@ class BitcoinService:
     
     @classmethod
     def validate_bitcoin_address(cls, address):
-        """Validate Bitcoin address using BlockCypher."""
-        try:
-            return is_valid_address(address)
-        except Exception:
-            return False
+        """Validate Bitcoin address offline (Base58Check / Bech32 checksums, cached)."""
+        from utils.bitcoin_address import is_valid_address
+        return is_valid_address(address)
     
     @classmethod
     def get_address_balance(cls, address):
@@ -99,34 +96,16 @@ class BitcoinService:
             return None
     
     @classmethod
-    def estimate_transaction_fee(cls, amount_btc):
-        """Estimate transaction fee based on current network conditions."""
-        try:
-            # Get current fee estimates from BlockCypher
-            response = requests.get(
-                f"{cls.BLOCKCYPHER_API_URL}/btc/main",
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            # Use medium priority fee
-            fee_per_byte = data.get('medium_fee_per_kb', 10000) / 1000  # Convert to per byte
-            
-            # Estimate transaction size (typical P2PKH transaction is ~225 bytes)
-            estimated_size = 225
-            estimated_fee_satoshi = int(fee_per_byte * estimated_size)
-            estimated_fee_btc = Decimal(str(estimated_fee_satoshi)) / Decimal('100000000')
-            
-            return estimated_fee_btc
-            
-        except Exception as e:
-            print(f"Error estimating transaction fee: {e}")
-            # Fallback fee calculation
-            return Decimal('0.001')  # 0.001 BTC as fallback
+    def estimate_transaction_fee(cls, amount_btc, tier='medium', from_address=None, to_address=None):
+        """
+        Estimate transaction fee in BTC from the cached network fee rates.
+        Never calls the fee API; see accounts.fee_oracle.
+        """
+        from .fee_oracle import estimate_fee
+        return estimate_fee(tier=tier, from_address=from_address, to_address=to_address)['fee_btc']
     
     @classmethod
-    def create_bitcoin_transaction(cls, from_address, to_address, amount_btc, private_key=None):
+    def create_bitcoin_transaction(cls, from_address, to_address, amount_btc, private_key=None, fee_btc=None):
         """
         Create and broadcast a Bitcoin transaction.
         Note: In production, you should use a proper wallet service or hardware security module.
@@ -150,7 +129,9 @@ class BitcoinService:
             transaction_data = {
                 'tx_hash': f"simulated_tx_{int(time.time())}",
                 'status': 'pending',
-                'fee': cls.estimate_transaction_fee(amount_btc),
+                'fee': fee_btc if fee_btc is not None else cls.estimate_transaction_fee(
+                    amount_btc, from_address=from_address, to_address=to_address
+                ),
                 'created_at': time.time()
             }
             
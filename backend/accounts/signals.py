@@ -1,10 +1,18 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import User
+from .user_cache import invalidate_user_snapshot
 
 
 @receiver(post_save, sender=User)
 def ensure_account_number(sender, instance, created, **kwargs):
     """Ensure user has an account number after creation."""
     if created and not instance.account_number:
-        instance.save()  # This will trigger account number generation in the save method 
\ No newline at end of file
+        instance.save()  # This will trigger account number generation in the save method
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_auth_snapshot(sender, instance, **kwargs):
+    """Drop the cached auth snapshot whenever the user row changes."""
+    invalidate_user_snapshot(instance.pk)
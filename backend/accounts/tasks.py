@@ -0,0 +1,37 @@
+"""
+Celery tasks for account operations
+"""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def archive_security_audit_logs():
+    """
+    Move whole months of security audit logs past the retention window to cold storage.
+    Runs daily; months that are already archived hold no rows and are skipped.
+    """
+    from .audit_retention import archive_expired_security_logs
+    
+    archives = archive_expired_security_logs()
+    archived_rows = sum(archive.row_count for archive in archives)
+    
+    logger.info(f"Archived {len(archives)} month(s), {archived_rows} security audit logs")
+    return {'months': len(archives), 'rows': archived_rows}
+
+
+@shared_task
+def refresh_bitcoin_fee_rates():
+    """
+    Fetch network fee rates into the cache so sends never call the fee API.
+    Runs every 2 minutes; on failure the last good rates stay in use.
+    """
+    from .fee_oracle import refresh_fee_rates
+    
+    entry = refresh_fee_rates()
+    if entry is None:
+        return {'refreshed': False}
+    logger.info(f"Refreshed Bitcoin fee rates: {entry['rates']}")
+    return {'refreshed': True, 'rates': entry['rates']}
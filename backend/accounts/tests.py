@@ -1,3 +1,266 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.files.storage import InMemoryStorage
+from django.conf import settings
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from utils.buffered_flush import flush_all_buffers
+from utils.shared_cache import shared_cache
+
+from . import fee_oracle
+from .audit_retention import archive_month, month_range
+from .middleware import AccountLockMiddleware, compile_exempt_paths
+from .search import AUTOCOMPLETE_LIMIT, UserSearchService
+from .models import SecurityAuditArchive, SecurityAuditLog, User
+from .user_cache import get_cached_user
+from .utils import log_security_event, security_audit_writer
+
+
+@override_settings(AUTH_USER_SNAPSHOT_ENABLED=True)
+class SnapshotUserTests(TestCase):
+
+    def setUp(self):
+        shared_cache.clear()
+        self.user = User.objects.create_user(username='holder', email='holder@example.com', password=None)
+
+    def test_lock_check_reads_only_the_snapshot(self):
+        get_cached_user(self.user.pk)
+        with self.assertNumQueries(0):
+            cached = get_cached_user(self.user.pk)
+            self.assertTrue(cached.is_active)
+            self.assertFalse(cached.is_account_locked())
+
+    def test_save_does_not_write_back_cached_lock_fields(self):
+        cached = get_cached_user(self.user.pk)
+        self.assertFalse(cached.is_account_locked())
+
+        # Admin locks the account after the snapshot was taken
+        locked_until = timezone.now() + timedelta(hours=1)
+        User.objects.filter(pk=self.user.pk).update(account_locked_until=locked_until, is_active=False)
+
+        cached.first_name = 'Renamed'
+        cached.save()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Renamed')
+        self.assertEqual(self.user.account_locked_until, locked_until)
+        self.assertFalse(self.user.is_active)
+
+    def test_lock_invalidates_the_snapshot(self):
+        self.assertFalse(get_cached_user(self.user.pk).is_account_locked())
+        self.user.lock_account(30, 'Suspicious activity')
+
+        cached = get_cached_user(self.user.pk)
+        self.assertTrue(cached.is_account_locked())
+        self.assertEqual(cached.account_lock_reason, 'Suspicious activity')
+
+        self.user.approve_unlock()
+        self.assertFalse(get_cached_user(self.user.pk).is_account_locked())
+
+    @override_settings(AUTH_USER_SNAPSHOT_ENABLED=False)
+    def test_disabled_snapshot_loads_the_row(self):
+        get_cached_user(self.user.pk)
+        with self.assertNumQueries(1):
+            cached = get_cached_user(self.user.pk)
+        self.assertIs(type(cached), User)
+
+
+@override_settings(AUTH_USER_SNAPSHOT_ENABLED=True)
+class AccountLockMiddlewareTests(TestCase):
+
+    def setUp(self):
+        shared_cache.clear()
+        self.user = User.objects.create_user(username='holder', email='holder@example.com', password=None)
+        self.middleware = AccountLockMiddleware(lambda request: None)
+
+    def request(self, path):
+        request = RequestFactory().get(path)
+        request._cached_user = self.user
+        return self.middleware.process_request(request)
+
+    def test_exempt_paths_match_by_prefix(self):
+        pattern = compile_exempt_paths(['/api/auth/', '/api/auth/login/', '/livez'])
+        self.assertIsNotNone(pattern.match('/api/auth/login/'))
+        self.assertIsNotNone(pattern.match('/livez'))
+        self.assertIsNone(pattern.match('/api/dashboard/'))
+        self.assertIsNone(pattern.match('/v1/livez'))
+        self.assertIsNone(compile_exempt_paths([]))
+
+    def test_locked_user_is_blocked_outside_exempt_paths(self):
+        self.assertIsNone(self.request('/api/dashboard/'))
+        self.user.lock_account(30, 'Suspicious activity')
+
+        response = self.request('/api/dashboard/')
+        self.assertEqual(response.status_code, 403)
+        self.assertIn(b'"account_locked": true', response.content)
+        self.assertIsNone(self.request('/api/auth/account-status/'))
+
+    def test_staff_are_not_blocked(self):
+        self.user.is_staff = True
+        self.user.lock_account(30, 'Suspicious activity')
+        self.assertIsNone(self.request('/api/dashboard/'))
+
+
+# Flushed by hand; the background flusher thread is not started
+@mock.patch.object(security_audit_writer, '_ensure_flusher')
+@override_settings(BUFFERED_LOG_WRITES=True)
+class SecurityAuditWriterTests(TestCase):
+
+    def setUp(self):
+        # Start from an empty buffer, whatever other tests left queued
+        buffer = mock.patch.object(security_audit_writer, '_buffer', [])
+        buffer.start()
+        self.addCleanup(buffer.stop)
+        self.user = User.objects.create_user(username='holder', email='holder@example.com', password=None)
+
+    def log(self, event_type='login_success', **fields):
+        log_security_event(self.user, event_type, 'Event', **fields)
+
+    def test_events_are_written_on_flush(self, ensure_flusher):
+        for _ in range(3):
+            self.log()
+        self.assertEqual(security_audit_writer.pending(), 3)
+        self.assertFalse(SecurityAuditLog.objects.exists())
+
+        self.assertEqual(flush_all_buffers(), 3)
+        self.assertEqual(security_audit_writer.pending(), 0)
+        self.assertEqual(SecurityAuditLog.objects.filter(user=self.user).count(), 3)
+
+    def test_full_buffer_wakes_the_flusher(self, ensure_flusher):
+        with mock.patch.object(security_audit_writer, '_wake') as wake, self.settings(BUFFERED_LOG_BATCH_SIZE=2):
+            self.log()
+            wake.assert_not_called()
+            self.log()
+            wake.assert_called_once()
+
+    def test_bad_row_does_not_drop_the_batch(self, ensure_flusher):
+        self.log()
+        self.log(metadata={'amount': object()})  # not JSON-serializable
+        self.log()
+        with self.assertLogs('utils.buffered_writer', 'ERROR'):
+            self.assertEqual(security_audit_writer.flush(), 2)
+        self.assertEqual(SecurityAuditLog.objects.count(), 2)
+
+    @override_settings(BUFFERED_LOG_WRITES=False)
+    def test_unbuffered_writes_are_immediate(self, ensure_flusher):
+        self.log()
+        self.assertEqual(security_audit_writer.pending(), 0)
+        self.assertEqual(SecurityAuditLog.objects.count(), 1)
+
+
+class UserSearchTests(TestCase):
+
+    def setUp(self):
+        for username, email, first_name, last_name in [
+            ('ann', 'ann.lee@example.com', 'Ann', 'Lee'),
+            ('annabel', 'annabel@example.com', 'Annabel', 'Hart'),
+            ('joanne', 'jo@example.com', 'Joanne', 'Annson'),
+            ('mark', 'mark@example.com', 'Mark', 'Bright'),
+        ]:
+            User.objects.create_user(username, email, None, first_name=first_name, last_name=last_name)
+
+    def search(self, query, **kwargs):
+        return [user.username for user in UserSearchService.search(User.objects.all(), query, **kwargs)]
+
+    def test_results_are_ranked(self):
+        self.assertEqual(self.search('ANN.LEE@example.com'), ['ann'])
+        self.assertEqual(self.search('  ann '), ['ann', 'annabel', 'joanne'])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search('ann hart'), ['annabel'])
+        self.assertEqual(self.search('ann bright'), [])
+
+    def test_short_queries_return_nothing(self):
+        self.assertEqual(self.search('a'), [])
+
+    def test_autocomplete_matches_prefixes_only(self):
+        self.assertEqual(self.search('ann', autocomplete=True), ['ann', 'annabel', 'joanne'])
+        self.assertEqual(self.search('nne', autocomplete=True), [])
+
+    def test_autocomplete_is_capped(self):
+        for i in range(AUTOCOMPLETE_LIMIT + 2):
+            User.objects.create_user(f'annie{i}', f'annie{i}@example.com', None)
+        users = UserSearchService.autocomplete(User.objects.all(), 'ann', limit=50)
+        self.assertEqual(len(users), AUTOCOMPLETE_LIMIT)
+
+
+@mock.patch('accounts.fee_oracle.requests.get', side_effect=AssertionError('no network on the request path'))
+class FeeOracleTests(TestCase):
+
+    def setUp(self):
+        shared_cache.clear()
+
+    def test_fallback_rates_until_a_refresh(self, requests_get):
+        self.assertEqual(fee_oracle.get_fee_rates()['source'], 'fallback')
+
+        with mock.patch.object(fee_oracle, 'fetch_fee_rates', return_value={'low': 2, 'medium': 8, 'high': 20}):
+            fee_oracle.refresh_fee_rates()
+        entry = fee_oracle.get_fee_rates()
+        self.assertEqual((entry['source'], entry['rates']['medium']), ('blockcypher', 8))
+
+    def test_last_good_rates_outlive_the_fresh_entry(self, requests_get):
+        with mock.patch.object(fee_oracle, 'fetch_fee_rates', return_value={'low': 2, 'medium': 8, 'high': 20}):
+            fee_oracle.refresh_fee_rates()
+        shared_cache.delete(fee_oracle.FEE_RATES_CACHE_KEY)
+
+        with self.assertLogs('accounts.fee_oracle', 'WARNING'):
+            self.assertIsNone(fee_oracle.refresh_fee_rates())
+        entry = fee_oracle.get_fee_rates()
+        self.assertEqual((entry['source'], entry['rates']['medium']), ('stale', 8))
+
+    def test_fee_is_sized_from_the_transaction_shape(self, requests_get):
+        self.assertEqual(fee_oracle.estimate_vsize(['p2wpkh'], ['p2wpkh', 'p2wpkh']), 141)
+        self.assertEqual(fee_oracle.estimate_vsize(['p2pkh'], ['p2pkh', 'p2pkh']), 226)
+
+        legacy_address, segwit_address = '1BoatSLRHtKNngkdXEeobR76b53LETtpyT', 'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4'
+        legacy = fee_oracle.estimate_fee('medium', from_address=legacy_address, to_address=legacy_address)
+        segwit = fee_oracle.estimate_fee('medium', from_address=segwit_address, to_address=segwit_address)
+        self.assertEqual(legacy['fee_satoshi'], 15 * 226)
+        self.assertEqual(segwit['fee_satoshi'], 15 * 141)
+        self.assertEqual(segwit['fee_btc'], Decimal('0.00002115'))
+
+        with self.assertRaises(ValueError):
+            fee_oracle.estimate_fee('urgent')
+
+
+class TruncatingStorage(InMemoryStorage):
+    """Loses the tail of every file it stores."""
+
+    def _save(self, name, content):
+        return super()._save(name, ContentFile(content.read()[:-8]))
+
+
+IN_MEMORY_ARCHIVE = {'BACKEND': 'django.core.files.storage.InMemoryStorage'}
+TRUNCATING_ARCHIVE = {'BACKEND': 'accounts.tests.TruncatingStorage'}
+
+
+class AuditArchiveTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='holder', email='holder@example.com', password=None)
+        self.period = date(2023, 1, 1)
+        start, _ = month_range(self.period)
+        SecurityAuditLog.objects.bulk_create([
+            SecurityAuditLog(user=self.user, event_type='login_success', description=f'Login {i}')
+            for i in range(5)
+        ])
+        SecurityAuditLog.objects.update(created_at=start + timedelta(days=3))
+
+    def archive(self, archive_storage):
+        with self.settings(STORAGES={**settings.STORAGES, 'audit_archive': archive_storage}):
+            return archive_month(self.period)
+
+    def test_verified_archive_removes_live_rows(self):
+        archive = self.archive(IN_MEMORY_ARCHIVE)
+        self.assertEqual(archive.row_count, 5)
+        self.assertFalse(SecurityAuditLog.objects.exists())
+
+    def test_unverified_archive_keeps_live_rows(self):
+        with self.assertLogs('accounts.audit_retention', 'ERROR'):
+            self.assertIsNone(self.archive(TRUNCATING_ARCHIVE))
+        self.assertEqual(SecurityAuditLog.objects.count(), 5)
+        self.assertFalse(SecurityAuditArchive.objects.exists())
@@ -39,6 +39,7 @@ urlpatterns = [
     # Bitcoin
     path('bitcoin/balance/', views.BitcoinBalanceView.as_view(), name='bitcoin-balance'),
     path('bitcoin/price/', views.BitcoinPriceView.as_view(), name='bitcoin-price'),
+    path('bitcoin/fees/', views.BitcoinFeeView.as_view(), name='bitcoin-fees'),
     path('bitcoin/send/', views.BitcoinSendView.as_view(), name='bitcoin-send'),
     path('bitcoin/transactions/', views.BitcoinTransactionListView.as_view(), name='bitcoin-transactions'),
     path('bitcoin/transactions/<int:transaction_id>/', views.BitcoinTransactionDetailView.as_view(), name='bitcoin-transaction-detail'),
@@ -0,0 +1,120 @@
+"""
+Short-lived cache of the user fields needed to authenticate a request.
+
+Authentication and the account lock check read only the snapshot, so a request
+that needs nothing else from ``request.user`` runs no user query. The first
+access to any other attribute, or any write, loads the full row in one query
+(``SnapshotUser``). From then on every attribute comes from that fresh row, so
+cached values are never saved back.
+
+Snapshots live in the shared cache, keyed by user id and a per-user version
+number. Any write to the user bumps the version (see ``accounts.signals``),
+which orphans the old entry. With ``AUTH_USER_SNAPSHOT_ENABLED`` off (the
+default when the shared cache is process-local) every request loads the row.
+"""
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject, empty
+
+from utils.shared_cache import shared_cache
+from utils.versioned_cache import get_version, bump_version
+
+from .models import User
+
+
+SNAPSHOT_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name',
+    'is_active', 'is_staff', 'is_superuser', 'is_verified', 'email_verified',
+    'two_factor_enabled', 'two_factor_setup_completed', 'transfer_pin_setup_completed',
+    'account_locked_until', 'account_lock_reason', 'unlock_request_pending',
+    'account_number', 'profile_image_url', 'date_joined', 'last_login',
+)
+
+
+def _snapshot_key(user_id, version):
+    return f'auth_user_snapshot:{user_id}:{version}'
+
+
+def get_snapshot_version(user_id):
+    """Current snapshot version for a user."""
+    return get_version(f'auth_user:{user_id}')
+
+
+def invalidate_user_snapshot(user_id):
+    """Orphan any cached snapshot for this user."""
+    bump_version(f'auth_user:{user_id}')
+
+
+# User methods that read only snapshot fields
+SNAPSHOT_METHODS = ('is_account_locked',)
+
+
+class SnapshotUser(SimpleLazyObject):
+    """
+    A ``User`` that answers snapshot fields from the cache until it has to load.
+
+    Anything outside the snapshot, and any attribute write, loads the full row
+    once; the loaded user is then used for everything.
+    """
+
+    def __init__(self, values):
+        user_id = values['id']
+        super().__init__(lambda: User.objects.get(pk=user_id))
+        self.__dict__['_snapshot'] = values
+
+    def __getattr__(self, name):
+        if self._wrapped is empty:
+            snapshot = self.__dict__['_snapshot']
+            if name in snapshot:
+                return snapshot[name]
+            if name == 'pk':
+                return snapshot['id']
+            if name == '_meta':
+                return User._meta
+            if name == 'is_authenticated':
+                return True
+            if name == 'is_anonymous':
+                return False
+            if name in SNAPSHOT_METHODS:
+                return getattr(User, name).__get__(self)
+        return super().__getattr__(name)
+
+    def __bool__(self):
+        return True
+
+    # isinstance() checks (e.g. filter(user=request.user)) should not load the row
+    @property
+    def __class__(self):
+        return User
+
+
+def get_user_snapshot(user_id):
+    """
+    Cached snapshot field values for ``user_id``.
+
+    Returns:
+        dict or None if the user does not exist
+    """
+    key = _snapshot_key(user_id, get_snapshot_version(user_id))
+    values = shared_cache.get(key)
+    if values is not None:
+        return values
+
+    values = User.objects.filter(pk=user_id).values(*SNAPSHOT_FIELDS).first()
+    if values is None:
+        return None
+    shared_cache.set(key, values, getattr(settings, 'AUTH_USER_SNAPSHOT_TTL', 60))
+    return values
+
+
+def get_cached_user(user_id):
+    """
+    Return a ``SnapshotUser`` for ``user_id``, or the full row when
+    ``AUTH_USER_SNAPSHOT_ENABLED`` is off.
+
+    Returns:
+        User or None if the user does not exist
+    """
+    if not settings.AUTH_USER_SNAPSHOT_ENABLED:
+        return User.objects.filter(pk=user_id).first()
+    values = get_user_snapshot(user_id)
+    return SnapshotUser(values) if values is not None else None
@@ -3,6 +3,8 @@ import base64
 from io import BytesIO
 import pyotp
 
+from utils.buffered_writer import BufferedModelWriter
+
 
 def generate_qr_code(uri, size=200):
     """
@@ -117,6 +119,10 @@ def validate_pin(pin):
     return True, "PIN is valid"
 
 
+# Audit rows are buffered and bulk-inserted off the request path
+security_audit_writer = BufferedModelWriter('accounts.SecurityAuditLog')
+
+
 def log_security_event(user, event_type, description, request=None, metadata=None):
     """
     Log security events for audit purposes.
@@ -129,8 +135,6 @@ def log_security_event(user, event_type, description, request=None, metadata=Non
         metadata (dict): Additional event data (optional)
     """
     try:
-        from .models import SecurityAuditLog
-        
         ip_address = None
         user_agent = None
         
@@ -149,7 +153,7 @@ def log_security_event(user, event_type, description, request=None, metadata=Non
         if user_agent is None:
             user_agent = ''
         
-        SecurityAuditLog.objects.create(
+        security_audit_writer.add(
             user=user,
             event_type=event_type,
             description=description,
@@ -498,10 +498,13 @@ class BalanceView(APIView):
         if not user.account_number:
             user.save()  # This will trigger account number generation
         
+        # Fresh balance via a narrow projection of the hot columns
+        current = User.objects.filter(pk=user.pk).values('balance', 'updated_at').get()
+        
         serializer = BalanceSerializer({
-            'balance': user.balance,
+            'balance': current['balance'],
             'currency': 'USD',
-            'last_updated': user.updated_at
+            'last_updated': current['updated_at']
         })
         
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -1063,6 +1066,39 @@ class BitcoinPriceView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class BitcoinFeeView(APIView):
+    """View for current network fee tiers."""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """Fee rate and estimated fee per tier for a send to ?address= (optional)."""
+        from decimal import Decimal
+        from .fee_oracle import FEE_TIERS, estimate_fee
+        
+        price_usd = BitcoinService.get_bitcoin_price()['price_usd']
+        estimates = [
+            estimate_fee(
+                tier=tier,
+                from_address=request.user.bitcoin_wallet_address,
+                to_address=request.query_params.get('address')
+            )
+            for tier in FEE_TIERS
+        ]
+        return Response({
+            'tiers': {
+                estimate['tier']: {
+                    'fee_rate_sat_per_vbyte': estimate['fee_rate'],
+                    'estimated_vsize': estimate['vsize'],
+                    'fee_btc': str(estimate['fee_btc']),
+                    'fee_usd': str((estimate['fee_btc'] * price_usd).quantize(Decimal('0.01'))),
+                }
+                for estimate in estimates
+            },
+            'source': estimates[0]['source'],
+        }, status=status.HTTP_200_OK)
+
+
 class BitcoinSendView(APIView):
     """View for sending Bitcoin."""
     
@@ -1109,9 +1145,14 @@ class BitcoinSendView(APIView):
                         status=status.HTTP_400_BAD_REQUEST
                     )
             
-            # Estimate real transaction fee
-            transaction_fee_btc = BitcoinService.estimate_transaction_fee(amount_btc)
-            transaction_fee_usd = transaction_fee_btc * float(bitcoin_price_usd)
+            # Estimate the fee once from cached network rates; reused for the blockchain transaction
+            transaction_fee_btc = BitcoinService.estimate_transaction_fee(
+                amount_btc,
+                tier=data.get('fee_tier', 'medium'),
+                from_address=user.bitcoin_wallet_address,
+                to_address=data['recipient_wallet_address']
+            )
+            transaction_fee_usd = transaction_fee_btc * bitcoin_price_usd
             
             # Create Bitcoin transaction record
             transaction = BitcoinTransaction.objects.create(
@@ -1134,7 +1175,8 @@ class BitcoinSendView(APIView):
                     blockchain_tx = BitcoinService.create_bitcoin_transaction(
                         from_address=user.bitcoin_wallet_address,
                         to_address=data['recipient_wallet_address'],
-                        amount_btc=amount_btc
+                        amount_btc=amount_btc,
+                        fee_btc=transaction_fee_btc
                     )
                     
                     if blockchain_tx:
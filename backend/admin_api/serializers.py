@@ -15,6 +15,8 @@ class UserSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = User
+        # unlock_request_message and bitcoin_qr_code are read from cold_data
+        select_related = ['cold_data']
         fields = [
             'id', 'username', 'email', 'first_name', 'last_name', 'is_active',
             'is_staff', 'is_superuser', 'date_joined', 'last_login',
@@ -37,6 +39,7 @@ class TransactionSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Transaction
+        select_related = ['user']
         fields = [
             'id', 'user', 'user_name', 'transaction_type', 'amount',
             'currency', 'status', 'description', 'created_at'
@@ -117,6 +120,7 @@ class LoanSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = AppLoan
+        select_related = ['user']
         fields = [
             'id', 'user', 'user_name', 'loan_type', 'amount', 'interest_rate',
             'term_months', 'status', 'purpose', 'monthly_payment', 'remaining_balance',
@@ -214,6 +218,7 @@ class CheckDepositSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = CheckDeposit
+        select_related = ['user', 'admin_approved_by']
         fields = [
             'id', 'user', 'user_name', 'user_email', 'check_number', 'amount',
             'front_image', 'back_image', 'payer_name', 'memo',
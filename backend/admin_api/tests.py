@@ -0,0 +1,179 @@
+from datetime import date
+from decimal import Decimal
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import SecurityAuditLog
+from api.models import Notification
+from banking.models import VirtualCard, CardApplication, Transfer, CheckDeposit
+from bitcoin_wallet.models import CurrencySwap
+from loans.models import Loan, LoanApplication
+from transactions.models import Bill, Investment, BitcoinTransaction, Transaction
+
+User = get_user_model()
+
+_sequence = count(1)
+
+
+def _user():
+    n = next(_sequence)
+    return User.objects.create_user(
+        username=f'user{n}', email=f'user{n}@example.com', password=None,
+        first_name='Test', last_name=f'User{n}'
+    )
+
+
+def _reference():
+    return f'REF{next(_sequence):010d}'
+
+
+def _transaction():
+    return Transaction.objects.create(
+        user=_user(), transaction_type='deposit', amount=Decimal('25.00'), status='completed',
+        reference_number=_reference(), balance_before=Decimal('0.00'), balance_after=Decimal('25.00')
+    )
+
+
+def _transfer():
+    return Transfer.objects.create(
+        sender=_user(), recipient=_user(), amount=Decimal('50.00'), reference_number=_reference(), status='completed'
+    )
+
+
+def _check_deposit():
+    # bulk_create skips the Celery fan-out in CheckDeposit.save()
+    return CheckDeposit.objects.bulk_create([
+        CheckDeposit(user=_user(), amount=Decimal('120.00'), front_image='checks/front.jpg')
+    ])[0]
+
+
+# Endpoint name -> callable creating one row it lists
+ROW_FACTORIES = {
+    'admin-users': _user,
+    'admin-transactions': lambda: (_transaction(), _transfer()),
+    'admin-cards': lambda: VirtualCard.objects.create(
+        user=_user(), card_number=f'4111{next(_sequence):012d}', cvv='123',
+        expiry_month=12, expiry_year=2030
+    ),
+    'admin-applications': lambda: CardApplication.objects.create(user=_user()),
+    'admin-notifications': lambda: Notification.objects.create(
+        user=_user(), notification_type='account', title='Notice', message='Message'
+    ),
+    'admin-currency-swaps': lambda: CurrencySwap.objects.create(
+        user=_user(), swap_type='usd_to_btc', amount_from=Decimal('100.00'),
+        amount_to=Decimal('0.00150000'), exchange_rate=Decimal('66666.67')
+    ),
+    'admin-bitcoin-transactions': lambda: BitcoinTransaction.objects.create(
+        user=_user(), transaction_type='incoming', amount=Decimal('0.01000000'),
+        bitcoin_address='bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq'
+    ),
+    'admin-loans': lambda: Loan.objects.create(
+        user=_user(), loan_type='personal', amount=Decimal('5000.00'), interest_rate=Decimal('7.50'),
+        term_months=24, monthly_payment=Decimal('225.00'), remaining_balance=Decimal('5000.00'),
+        next_payment_date=date(2030, 1, 1)
+    ),
+    'admin-loan-applications': lambda: LoanApplication.objects.create(
+        user=_user(), loan_type='personal', requested_amount=Decimal('5000.00'), purpose='Purpose',
+        employment_status='employed', annual_income=Decimal('60000.00')
+    ),
+    'admin-bills': lambda: Bill.objects.create(user=_user(), amount=Decimal('80.00'), due_date=date(2030, 1, 1)),
+    'admin-investments': lambda: Investment.objects.create(user=_user(), investment_type='stocks'),
+    'admin-security-logs': lambda: SecurityAuditLog.objects.create(
+        user=_user(), event_type='2fa_enabled', description='Enabled'
+    ),
+    'admin-pending-transfers': lambda: Transfer.objects.create(
+        sender=_user(), recipient=_user(), amount=Decimal('50.00'), reference_number=_reference(),
+        status='pending', requires_admin_approval=True
+    ),
+    'admin-unlock-requests': lambda: User.objects.filter(pk=_user().pk).update(unlock_request_pending=True),
+    'admin-check-deposits': _check_deposit,
+    'admin-pending-check-deposits': _check_deposit,
+}
+
+# Endpoint name -> queries per request: authentication, page count (not on
+# cursor-paginated endpoints) and the rows with their joined relations. The
+# combined transactions list also runs the UNION page query and counts and
+# loads each table separately.
+QUERY_BUDGETS = {
+    'admin-users': 3,
+    'admin-transactions': 6,
+    'admin-cards': 3,
+    'admin-applications': 3,
+    'admin-notifications': 3,
+    'admin-currency-swaps': 3,
+    'admin-bitcoin-transactions': 3,
+    'admin-loans': 2,
+    'admin-loan-applications': 2,
+    'admin-bills': 3,
+    'admin-investments': 3,
+    'admin-security-logs': 3,
+    'admin-pending-transfers': 3,
+    'admin-unlock-requests': 3,
+    'admin-check-deposits': 3,
+    'admin-pending-check-deposits': 3,
+}
+
+
+class AdminListQueryBudgetTests(TestCase):
+    """Admin list endpoints stay within a fixed number of queries, however many rows they return."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='x', is_staff=True, is_superuser=True
+        )
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.admin).access_token}')
+
+    def assertQueryBudget(self, name, budget):
+        # Start from a cold cache so the authentication lookup is always counted
+        for backend in caches.all(initialized_only=True):
+            backend.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(f'admin_api:{name}'))
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertLessEqual(
+            len(queries), budget,
+            f"{name} ran {len(queries)} queries (budget {budget}):\n"
+            + '\n'.join(query['sql'] for query in queries.captured_queries)
+        )
+        return len(queries)
+
+    def test_every_list_endpoint_has_a_budget(self):
+        self.assertEqual(set(ROW_FACTORIES), set(QUERY_BUDGETS))
+
+    def test_query_budgets(self):
+        for name, budget in QUERY_BUDGETS.items():
+            with self.subTest(endpoint=name):
+                ROW_FACTORIES[name]()
+                few = self.assertQueryBudget(name, budget)
+                for _ in range(10):
+                    ROW_FACTORIES[name]()
+                self.assertEqual(self.assertQueryBudget(name, budget), few)
+
+
+class AdminTransactionListTests(TestCase):
+
+    def setUp(self):
+        admin = User.objects.create_user(username='admin', email='admin@example.com', password=None, is_staff=True)
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(admin).access_token}')
+
+    def test_pages_merge_both_tables_newest_first(self):
+        rows = [_transaction() if n % 2 else _transfer() for n in range(5)]
+        response = self.client.get(reverse('admin_api:admin-transactions'), {'page': 2, 'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 5)
+        newest_first = [(row.__class__.__name__.lower(), row.pk) for row in reversed(rows)]
+        self.assertEqual([(item['type'], item['id']) for item in response.data['results']], newest_first[2:4])
+
+    def test_bad_page_parameters_are_rejected(self):
+        response = self.client.get(reverse('admin_api:admin-transactions'), {'page': 'last'})
+        self.assertEqual(response.status_code, 400)
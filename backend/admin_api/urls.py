@@ -27,6 +27,7 @@ urlpatterns = [
     path('currency-swaps/', views.AdminCurrencySwapListView.as_view(), name='admin-currency-swaps'),
     path('bitcoin-transactions/', views.AdminBitcoinTransactionListView.as_view(), name='admin-bitcoin-transactions'),
     path('loans/', views.AdminLoanListView.as_view(), name='admin-loans'),
+    path('loans/portfolio/', views.AdminLoanPortfolioView.as_view(), name='admin-loan-portfolio'),
     path('loan-applications/', views.AdminLoanApplicationListView.as_view(), name='admin-loan-applications'),
     path('loan-applications/<int:loan_id>/status/', views.AdminLoanStatusView.as_view(), name='admin-loan-status'),
     path('bills/', views.AdminBillListView.as_view(), name='admin-bills'),
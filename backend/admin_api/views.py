@@ -4,9 +4,11 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from django.conf import settings
+from datetime import timedelta
 from django.db.models import Sum, Count, Avg
 from django.db import connection
-from django.db.models import Q
+from django.db.models import CharField, F, Q, Value
 from django.core.cache import cache
 import redis
 import time
@@ -15,14 +17,19 @@ import cloudinary
 import cloudinary.uploader
 
 from accounts.models import SecurityAuditLog
+from accounts.search import UserSearchService, MAX_SEARCH_RESULTS
 from transactions.models import Transaction, Bill, Investment, BitcoinTransaction
 from loans.models import Loan as AppLoan, LoanApplication
 from banking.models import VirtualCard, CardApplication, Transfer, CheckDeposit
 from api.models import Notification, SystemStatus
+from api.unread_counter import UnreadNotificationCounter
 from bitcoin_wallet.models import CurrencySwap, BitcoinWallet
 
+from utils.query_planning import QueryPlanMixin, apply_query_plan
+
 User = get_user_model()
 
+from .pagination import AdminCursorPagination
 from .serializers import (
     UserSerializer, TransactionSerializer, VirtualCardSerializer,
     CardApplicationSerializer, NotificationSerializer, SystemStatusSerializer,
@@ -58,7 +65,7 @@ class AdminAuthView(APIView):
         }, status=status.HTTP_200_OK)
 
 
-class AdminUserListView(generics.ListAPIView):
+class AdminUserListView(QueryPlanMixin, generics.ListAPIView):
     """List all users (admin only)."""
     
     permission_classes = [permissions.IsAdminUser]
@@ -67,15 +74,6 @@ class AdminUserListView(generics.ListAPIView):
     def get_queryset(self):
         queryset = User.objects.all()
         
-        # Filter by search query
-        search = self.request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(email__icontains=search) | 
-                Q(first_name__icontains=search) | 
-                Q(last_name__icontains=search)
-            )
-        
         # Filter by status
         status_filter = self.request.query_params.get('status')
         if status_filter == 'active':
@@ -83,6 +81,11 @@ class AdminUserListView(generics.ListAPIView):
         elif status_filter == 'inactive':
             queryset = queryset.filter(is_active=False)
         
+        # Filter by search query (ranked, indexed)
+        search = self.request.query_params.get('search')
+        if search:
+            return UserSearchService.search(queryset, search)[:MAX_SEARCH_RESULTS]
+        
         return queryset.order_by('-date_joined')
 
 
@@ -264,10 +267,18 @@ class AdminUpdateUserBitcoinInfoView(APIView):
 
 
 class AdminTransactionListView(APIView):
-    """List all transactions and transfers combined (admin only)."""
+    """
+    List all transactions and transfers combined (admin only).
+    
+    The database merges, sorts and pages both tables in one ``UNION ALL`` over
+    (kind, id, created_at); only the rows on the requested page are loaded and
+    serialized.
+    """
     
     permission_classes = [permissions.IsAdminUser]
     
+    MAX_PAGE_SIZE = 200
+    
     def get(self, request):
         from banking.serializers import TransferSerializer
         
@@ -275,11 +286,13 @@ class AdminTransactionListView(APIView):
         user_id = request.query_params.get('user')
         status_filter = request.query_params.get('status')
         transaction_type = request.query_params.get('type')
-        page = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('page_size', 50))
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+            page_size = max(1, min(int(request.query_params.get('page_size', 50)), self.MAX_PAGE_SIZE))
+        except ValueError:
+            return Response({'error': 'page and page_size must be integers'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Fetch transactions with optimized query
-        transactions_queryset = Transaction.objects.select_related('user').all()
+        transactions_queryset = Transaction.objects.all()
         if user_id:
             transactions_queryset = transactions_queryset.filter(user_id=user_id)
         if status_filter:
@@ -287,8 +300,7 @@ class AdminTransactionListView(APIView):
         if transaction_type:
             transactions_queryset = transactions_queryset.filter(transaction_type=transaction_type)
         
-        # Fetch transfers with optimized query
-        transfers_queryset = Transfer.objects.all().select_related('sender', 'recipient')
+        transfers_queryset = Transfer.objects.all()
         if user_id:
             transfers_queryset = transfers_queryset.filter(Q(sender_id=user_id) | Q(recipient_id=user_id))
         if status_filter:
@@ -296,28 +308,35 @@ class AdminTransactionListView(APIView):
         if transaction_type:
             transfers_queryset = transfers_queryset.filter(transfer_type=transaction_type)
         
-        # Serialize both
-        transactions_data = TransactionSerializer(transactions_queryset, many=True).data
-        transfers_data = TransferSerializer(transfers_queryset, many=True).data
-        
-        # Add type discriminator to each item
-        for item in transactions_data:
-            item['type'] = 'transaction'
-        for item in transfers_data:
-            item['type'] = 'transfer'
-        
-        # Combine and sort by created_at
-        combined_data = list(transactions_data) + list(transfers_data)
-        combined_data.sort(key=lambda x: x['created_at'], reverse=True)
-        
-        # Paginate
+        # One sorted, paged list of (kind, id) across both tables
+        columns = ('row_kind', 'row_id', 'row_created')
+        keys = [
+            queryset.order_by().annotate(
+                row_kind=Value(kind, output_field=CharField()), row_id=F('id'), row_created=F('created_at')
+            ).values(*columns)
+            for kind, queryset in (('transaction', transactions_queryset), ('transfer', transfers_queryset))
+        ]
         start = (page - 1) * page_size
-        end = start + page_size
-        paginated_data = combined_data[start:end]
+        page_keys = list(
+            keys[0].union(keys[1], all=True).order_by('-row_created', 'row_kind', '-row_id')[start:start + page_size]
+        )
+        
+        ids = {'transaction': [], 'transfer': []}
+        for key in page_keys:
+            ids[key['row_kind']].append(key['row_id'])
+        serialized = {}
+        if ids['transaction']:
+            rows = apply_query_plan(Transaction.objects.filter(pk__in=ids['transaction']), TransactionSerializer)
+            for item in TransactionSerializer(rows, many=True).data:
+                serialized['transaction', item['id']] = {**item, 'type': 'transaction'}
+        if ids['transfer']:
+            rows = apply_query_plan(Transfer.objects.filter(pk__in=ids['transfer']), TransferSerializer)
+            for item in TransferSerializer(rows, many=True).data:
+                serialized['transfer', item['id']] = {**item, 'type': 'transfer'}
         
         return Response({
-            'results': paginated_data,
-            'count': len(combined_data),
+            'results': [serialized[key['row_kind'], key['row_id']] for key in page_keys],
+            'count': transactions_queryset.count() + transfers_queryset.count(),
             'page': page,
             'page_size': page_size
         }, status=status.HTTP_200_OK)
@@ -379,7 +398,7 @@ class AdminTransferStatusView(APIView):
         return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AdminVirtualCardListView(generics.ListAPIView):
+class AdminVirtualCardListView(QueryPlanMixin, generics.ListAPIView):
     """List all virtual cards (admin only)."""
     
     permission_classes = [permissions.IsAdminUser]
@@ -415,7 +434,7 @@ class AdminVirtualCardDeleteView(APIView):
         }, status=status.HTTP_204_NO_CONTENT)
 
 
-class AdminCardApplicationListView(generics.ListAPIView):
+class AdminCardApplicationListView(QueryPlanMixin, generics.ListAPIView):
     """List all card applications (admin only)."""
     
     permission_classes = [permissions.IsAdminUser]
@@ -510,7 +529,7 @@ class AdminCardApplicationCompleteView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class AdminNotificationListView(generics.ListAPIView):
+class AdminNotificationListView(QueryPlanMixin, generics.ListAPIView):
     """List all notifications (admin only)."""
     
     permission_classes = [permissions.IsAdminUser]
@@ -571,7 +590,7 @@ class AdminDashboardView(APIView):
         
         # Notification statistics
         total_notifications = Notification.objects.count()
-        unread_notifications = Notification.objects.filter(is_read=False).count()
+        unread_notifications = UnreadNotificationCounter.get_total()
         
         # Check deposit statistics
         total_check_deposits = CheckDeposit.objects.count()
@@ -641,341 +660,26 @@ class AdminUserDeleteView(APIView):
 
 
 class AdminSystemStatusView(APIView):
-    """Get system status information with real-time health checks."""
+    """Get system status from the periodically refreshed health probes."""
     
     permission_classes = [permissions.IsAdminUser]
     
     def get(self, request):
         try:
-            import time
-            from django.core.cache import cache
-            from django.db import connection
-            
-            # Define components with their health check functions
-            components = [
-                {
-                    'name': 'api',
-                    'display_name': 'API Server',
-                    'check': self._check_api_health
-                },
-                {
-                    'name': 'database',
-                    'display_name': 'Database',
-                    'check': self._check_database_health
-                },
-                {
-                    'name': 'redis',
-                    'display_name': 'Redis Cache',
-                    'check': self._check_redis_health
-                },
-                {
-                    'name': 'celery',
-                    'display_name': 'Celery Workers',
-                    'check': self._check_celery_health
-                },
-                {
-                    'name': 'email',
-                    'display_name': 'Email Service',
-                    'check': self._check_email_health
-                },
-                {
-                    'name': 'payment',
-                    'display_name': 'Payment Gateway',
-                    'check': self._check_payment_config
-                },
-                {
-                    'name': 'market_data',
-                    'display_name': 'Market Data Feed',
-                    'check': self._check_market_data_health
-                }
-            ]
-            
-            status_data = []
-            
-            for component in components:
-                # Perform real-time health check
-                start_time = time.time()
-                try:
-                    health_result = component['check']()
-                    response_time = round((time.time() - start_time) * 1000, 2)  # Convert to milliseconds
-                    
-                    # Update or create SystemStatus record
-                    status_obj, created = SystemStatus.objects.get_or_create(
-                        component=component['name'],
-                        defaults={
-                            'status': health_result['status'],
-                            'message': health_result['message'],
-                            'response_time': response_time,
-                            'uptime_percentage': health_result.get('uptime_percentage', 99.9),
-                            'error_count': health_result.get('error_count', 0),
-                            'request_count': health_result.get('request_count', 0)
-                        }
-                    )
-                    
-                    # Update with real-time data
-                    status_obj.status = health_result['status']
-                    status_obj.message = health_result['message']
-                    status_obj.response_time = response_time
-                    status_obj.uptime_percentage = health_result.get('uptime_percentage', 99.9)
-                    status_obj.last_check = timezone.now()
-                    if health_result['status'] != 'operational':
-                        status_obj.error_count += 1
-                    status_obj.save()
-                    
-                    status_data.append(SystemStatusSerializer(status_obj).data)
-                    
-                except Exception as e:
-                    # Handle health check failure
-                    response_time = round((time.time() - start_time) * 1000, 2)
-                    
-                    status_obj, created = SystemStatus.objects.get_or_create(
-                        component=component['name'],
-                        defaults={
-                            'status': 'major_outage',
-                            'message': f'Health check failed: {str(e)}',
-                            'response_time': response_time,
-                            'uptime_percentage': 0.0,
-                            'error_count': 1,
-                            'request_count': 0
-                        }
-                    )
-                    
-                    status_obj.status = 'major_outage'
-                    status_obj.message = f'Health check failed: {str(e)}'
-                    status_obj.response_time = response_time
-                    status_obj.uptime_percentage = 0.0
-                    status_obj.error_count += 1
-                    status_obj.last_check = timezone.now()
-                    status_obj.save()
-                    
-                    status_data.append(SystemStatusSerializer(status_obj).data)
-            
-            # Calculate overall system status
-            overall_status = 'operational'
-            for component in status_data:
-                if component['status'] == 'major_outage':
-                    overall_status = 'major_outage'
-                    break
-                elif component['status'] == 'partial_outage' and overall_status == 'operational':
-                    overall_status = 'partial_outage'
-                elif component['status'] == 'degraded' and overall_status == 'operational':
-                    overall_status = 'degraded'
-            
-            return Response({
-                'overall_status': overall_status,
-                'components': status_data,
-                'last_updated': timezone.now()
-            }, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    def _check_api_health(self):
-        """Check API health and detailed system metrics."""
-        import os
-        try:
-            import psutil
-            cpu_usage = psutil.cpu_percent()
-            memory = psutil.virtual_memory()
-            memory_usage = memory.percent
-            message = f"CPU: {cpu_usage}%, Memory: {memory_usage}%"
-        except ImportError:
-            # Fallback if psutil is not installed
-            if hasattr(os, 'getloadavg'):
-                load = os.getloadavg()
-                message = f"Load Avg: {load[0]}, {load[1]}, {load[2]}"
-            else:
-                message = "API responding normally (no metrics available)"
-
-        return {
-            'status': 'operational',
-            'message': message,
-            'uptime_percentage': 99.99,
-            'error_count': 0,
-            'request_count': 0
-        }
-    
-    def _check_database_health(self):
-        """Check database health."""
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                return {
-                    'status': 'operational',
-                    'message': 'Database connection active',
-                    'uptime_percentage': 99.95,
-                    'error_count': 0,
-                    'request_count': 0
-                }
-        except Exception as e:
-            return {
-                'status': 'major_outage',
-                'message': f'Connection failed: {str(e)}',
-                'uptime_percentage': 0.0,
-                'error_count': 1,
-                'request_count': 0
-            }
-    
-    def _check_redis_health(self):
-        """Check Redis health."""
-        try:
-            cache.set('health_check', 'ok', 5)
-            result = cache.get('health_check')
-            if result == 'ok':
-                return {
-                    'status': 'operational',
-                    'message': 'Redis operational',
-                    'uptime_percentage': 99.95,
-                    'error_count': 0,
-                    'request_count': 0
-                }
-            else:
-                return {
-                    'status': 'degraded',
-                    'message': 'Cache write succeeded but read failed',
-                    'uptime_percentage': 95.0,
-                    'error_count': 1,
-                    'request_count': 0
-                }
-        except Exception as e:
-            return {
-                'status': 'partial_outage',
-                'message': f'Redis unavailable: {str(e)}',
-                'uptime_percentage': 0.0,
-                'error_count': 1,
-                'request_count': 0
-            }
-    
-    def _check_celery_health(self):
-        """Check Celery health by inspecting workers."""
-        try:
-            # We can't always ping workers from the web process reliably without proper config
-            # But we can check if the broker (Redis) is reachable, which we already did.
-            # A more robust check: inspect active queues
-            from primetrust.celery import app as celery_app
-            
-            # Set a short timeout
-            i = celery_app.control.inspect(timeout=1.0)
-            available_nodes = i.ping()
+            from api.health import get_system_status, refresh_system_status
             
-            if available_nodes:
-                count = len(available_nodes)
-                return {
-                    'status': 'operational',
-                    'message': f'{count} worker node(s) active',
-                    'uptime_percentage': 99.5,
-                    'error_count': 0,
-                    'request_count': 0
-                }
+            # ?refresh=1 re-probes now instead of waiting for the next scheduled refresh
+            if request.query_params.get('refresh') in ('1', 'true'):
+                snapshot = refresh_system_status()
             else:
-                return {
-                    'status': 'degraded',
-                    'message': 'No active Celery workers found',
-                    'uptime_percentage': 50.0,
-                    'error_count': 1,
-                    'request_count': 0
-                }
-        except ImportError:
-             return {
-                'status': 'maintenance',
-                'message': 'Celery app not found/configured',
-                'uptime_percentage': 0,
-                'error_count': 0,
-                'request_count': 0
-            }
-        except Exception as e:
-            # If broker is down, this might fail
-            return {
-                'status': 'degraded',
-                'message': f'Could not contact workers: {str(e)}',
-                'uptime_percentage': 80.0,
-                'error_count': 1,
-                'request_count': 0
-            }
-    
-    def _check_email_health(self):
-        """Check email service health."""
-        try:
-             # Actually try to open a connection to the SMTP server
-            from django.core.mail import get_connection
-            connection = get_connection()
-            connection.open()
-            connection.close()
+                snapshot = get_system_status()
+            return Response(snapshot, status=status.HTTP_200_OK)
             
-            return {
-                'status': 'operational',
-                'message': 'SMTP connection successful',
-                'uptime_percentage': 99.8,
-                'error_count': 0,
-                'request_count': 0
-            }
         except Exception as e:
-            return {
-                'status': 'partial_outage',
-                'message': f'SMTP connection failed: {str(e)}',
-                'uptime_percentage': 70.0,
-                'error_count': 1,
-                'request_count': 0
-            }
-    
-    def _check_payment_config(self):
-        """Check payment configuration."""
-        # Since we can't easily ping a payment gateway without credentials or making a transaction,
-        # we check if critical settings are present.
-        from django.conf import settings
-        
-        has_stripe = hasattr(settings, 'STRIPE_SECRET_KEY') and settings.STRIPE_SECRET_KEY
-        # Or checking env directly if settings wrapper hides it
-        
-        if has_stripe:
-             return {
-                'status': 'operational',
-                'message': 'Payment configuration present',
-                'uptime_percentage': 100.0,
-                'error_count': 0,
-                'request_count': 0
-            }
-        else:
-             # It's not really an outage if it's not configured, but let's call it maintenance
-             return {
-                'status': 'maintenance',
-                'message': 'Payment gateway not configured',
-                'uptime_percentage': 100.0,
-                'error_count': 0,
-                'request_count': 0
-            }
-    
-    def _check_market_data_health(self):
-        """Check market data service (CoinGecko)."""
-        try:
-            response = requests.get('https://api.coingecko.com/api/v3/ping', timeout=3)
-            if response.status_code == 200:
-                return {
-                    'status': 'operational',
-                    'message': 'CoinGecko API reachable',
-                    'uptime_percentage': 99.0,
-                    'error_count': 0,
-                    'request_count': 0
-                }
-            else:
-                return {
-                    'status': 'degraded',
-                    'message': f'CoinGecko returned {response.status_code}',
-                    'uptime_percentage': 80.0,
-                    'error_count': 1,
-                    'request_count': 0
-                }
-        except Exception as e:
-            return {
-                'status': 'partial_outage',
-                'message': f'Market data unavailable: {str(e)}',
-                'uptime_percentage': 60.0,
-                'error_count': 1,
-                'request_count': 0
-            }
+            return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class AdminCurrencySwapListView(generics.ListAPIView):
+class AdminCurrencySwapListView(QueryPlanMixin, generics.ListAPIView):
     """List all currency swaps."""
     
     permission_classes = [permissions.IsAdminUser]
@@ -985,7 +689,7 @@ class AdminCurrencySwapListView(generics.ListAPIView):
         return CurrencySwap.objects.all().order_by('-created_at')
 
 
-class AdminBitcoinTransactionListView(generics.ListAPIView):
+class AdminBitcoinTransactionListView(QueryPlanMixin, generics.ListAPIView):
     """List all Bitcoin transactions."""
     
     permission_classes = [permissions.IsAdminUser]
@@ -995,27 +699,77 @@ class AdminBitcoinTransactionListView(generics.ListAPIView):
         return BitcoinTransaction.objects.all().order_by('-created_at')
 
 
-class AdminLoanListView(generics.ListAPIView):
-    """List all loans."""
+class AdminLoanListView(QueryPlanMixin, generics.ListAPIView):
+    """List loans, newest first, filterable by status and type."""
     
     permission_classes = [permissions.IsAdminUser]
     serializer_class = LoanSerializer
+    pagination_class = AdminCursorPagination
     
     def get_queryset(self):
-        return AppLoan.objects.all().order_by('-created_at')
+        queryset = AppLoan.objects.all()
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        loan_type = self.request.query_params.get('type')
+        if loan_type:
+            queryset = queryset.filter(loan_type=loan_type)
+        return queryset
 
 
-class AdminLoanApplicationListView(generics.ListAPIView):
-    """List all loan applications."""
+class AdminLoanApplicationListView(QueryPlanMixin, generics.ListAPIView):
+    """List loan applications, newest first, filterable by status."""
     
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = AdminCursorPagination
     
     def get_serializer_class(self):
         from loans.serializers import LoanApplicationSerializer
         return LoanApplicationSerializer
     
     def get_queryset(self):
-        return LoanApplication.objects.all().order_by('-created_at')
+        queryset = LoanApplication.objects.all()
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        return queryset
+
+
+class AdminLoanPortfolioView(APIView):
+    """Loan book risk figures from the nightly portfolio snapshots."""
+    
+    permission_classes = [permissions.IsAdminUser]
+    
+    def get(self, request):
+        from loans.models import LoanPortfolioSnapshot
+        
+        days = request.query_params.get('days')
+        if days:
+            try:
+                days = max(1, min(int(days), 366))
+            except ValueError:
+                return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            history = LoanPortfolioSnapshot.objects.only(
+                'as_of', 'active_loans', 'outstanding_balance', 'outstanding_principal', 'delinquency'
+            )[:days]
+            return Response({
+                'history': [
+                    {
+                        'as_of': snapshot.as_of,
+                        'active_loans': snapshot.active_loans,
+                        'outstanding_balance': str(snapshot.outstanding_balance),
+                        'outstanding_principal': str(snapshot.outstanding_principal),
+                        'delinquency': snapshot.delinquency,
+                    }
+                    for snapshot in history
+                ]
+            }, status=status.HTTP_200_OK)
+        
+        snapshot = LoanPortfolioSnapshot.objects.first()
+        if snapshot is None:
+            # Built only by loans.tasks.snapshot_loan_portfolio, never on a request
+            return Response({'error': 'No portfolio snapshot has been taken yet'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(snapshot.get_summary(), status=status.HTTP_200_OK)
 
 
 class AdminLoanStatusView(APIView):
@@ -1082,6 +836,9 @@ class AdminLoanStatusView(APIView):
                         approval_date=timezone.now()
                     )
                     
+                    from loans.amortization import build_schedule
+                    build_schedule(loan)
+                    
                     # Create transaction record for loan disbursement
                     from transactions.models import Transaction
                     Transaction.objects.create(
@@ -1141,7 +898,7 @@ class AdminLoanStatusView(APIView):
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class AdminBillListView(generics.ListAPIView):
+class AdminBillListView(QueryPlanMixin, generics.ListAPIView):
     """List all bills."""
     
     permission_classes = [permissions.IsAdminUser]
@@ -1151,7 +908,7 @@ class AdminBillListView(generics.ListAPIView):
         return Bill.objects.all().order_by('-created_at')
 
 
-class AdminInvestmentListView(generics.ListAPIView):
+class AdminInvestmentListView(QueryPlanMixin, generics.ListAPIView):
     """List all investments."""
     
     permission_classes = [permissions.IsAdminUser]
@@ -1161,18 +918,35 @@ class AdminInvestmentListView(generics.ListAPIView):
         return Investment.objects.all().order_by('-created_at')
 
 
-class AdminSecurityAuditLogListView(generics.ListAPIView):
+class AdminSecurityAuditLogListView(QueryPlanMixin, generics.ListAPIView):
     """List all security audit logs."""
     
     permission_classes = [permissions.IsAdminUser]
     serializer_class = SecurityAuditLogSerializer
     
     def get_queryset(self):
-        return SecurityAuditLog.objects.all().order_by('-created_at') 
+        # Bounded to a recent window so queries stay on the newest index range
+        try:
+            days = int(self.request.query_params.get('days', settings.SECURITY_AUDIT_ADMIN_WINDOW_DAYS))
+        except (TypeError, ValueError):
+            days = settings.SECURITY_AUDIT_ADMIN_WINDOW_DAYS
+        since = timezone.now() - timedelta(days=max(days, 1))
+        
+        queryset = SecurityAuditLog.objects.filter(created_at__gte=since)
+        
+        user_id = self.request.query_params.get('user')
+        if user_id:
+            queryset = queryset.filter(user_id=user_id)
+        
+        event_type = self.request.query_params.get('event_type')
+        if event_type:
+            queryset = queryset.filter(event_type=event_type)
+        
+        return queryset.order_by('-created_at')
 
 
 
-class AdminPendingTransfersView(generics.ListAPIView):
+class AdminPendingTransfersView(QueryPlanMixin, generics.ListAPIView):
     """List all pending transfers awaiting approval (admin only)."""
     
     permission_classes = [permissions.IsAdminUser]
@@ -1186,7 +960,7 @@ class AdminPendingTransfersView(generics.ListAPIView):
         return Transfer.objects.filter(
             status__in=['pending', 'processing'],
             requires_admin_approval=True
-        ).select_related('sender', 'recipient', 'admin_approved_by').order_by('created_at')
+        ).order_by('created_at')
 
 
 class AdminApproveTransferView(APIView):
@@ -1344,7 +1118,7 @@ class AdminUnlockUserAccountView(APIView):
         }, status=status.HTTP_200_OK)
 
 
-class AdminUnlockRequestListView(generics.ListAPIView):
+class AdminUnlockRequestListView(QueryPlanMixin, generics.ListAPIView):
     """List all pending unlock requests (admin only)."""
     
     permission_classes = [permissions.IsAdminUser]
@@ -1435,14 +1209,14 @@ class AdminRejectUnlockView(APIView):
 
 # Check Deposit Admin Views
 
-class AdminCheckDepositListView(generics.ListAPIView):
+class AdminCheckDepositListView(QueryPlanMixin, generics.ListAPIView):
     """List all check deposits (admin only)."""
     
     permission_classes = [permissions.IsAdminUser]
     serializer_class = CheckDepositSerializer
     
     def get_queryset(self):
-        queryset = CheckDeposit.objects.all().select_related('user', 'admin_approved_by')
+        queryset = CheckDeposit.objects.all()
         
         # Filter by status
         status_filter = self.request.query_params.get('status')
@@ -1557,7 +1331,7 @@ class AdminCompleteCheckDepositView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AdminPendingCheckDepositsView(generics.ListAPIView):
+class AdminPendingCheckDepositsView(QueryPlanMixin, generics.ListAPIView):
     """List all pending check deposits awaiting approval (admin only)."""
     
     permission_classes = [permissions.IsAdminUser]
@@ -1567,4 +1341,4 @@ class AdminPendingCheckDepositsView(generics.ListAPIView):
         """Return pending check deposits."""
         return CheckDeposit.objects.filter(
             status='pending'
-        ).select_related('user').order_by('created_at')
+        ).order_by('created_at')
@@ -0,0 +1,92 @@
+"""
+Cached per-user dashboard payload.
+
+The payload is rebuilt lazily on the first load after an invalidation. Writes that
+change what the dashboard shows (transactions, transfers, notifications, balance)
+call ``invalidate_dashboard`` via the signal handlers in ``api.signals`` or directly
+where they bypass signals with ``QuerySet.update``.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from utils.shared_cache import shared_cache
+from utils.versioned_cache import get_version, bump_version, bump_versions
+
+
+def _version_name(user_id):
+    return f'dashboard:{user_id}'
+
+
+def _payload_key(user_id, version):
+    return f'dashboard_payload:{user_id}:{version}'
+
+
+def build_dashboard_payload(user_id):
+    """Run the dashboard queries for a user."""
+    from accounts.models import User
+    from banking.models import Transfer
+    from transactions.models import Transaction
+    from .unread_counter import UnreadNotificationCounter
+
+    # Get recent transactions
+    recent_transactions = Transaction.objects.filter(user_id=user_id).only(
+        'id', 'description', 'amount', 'transaction_type', 'created_at'
+    ).order_by('-created_at')[:5]
+
+    # Get account balance
+    balance = User.objects.filter(pk=user_id).values_list('balance', flat=True).get()
+
+    # Get notification count (maintained incrementally)
+    unread_notifications = UnreadNotificationCounter.get(user_id)
+
+    # Get pending transfers
+    pending_transfers = Transfer.objects.filter(sender_id=user_id, status='pending').count()
+
+    return {
+        'balance': str(balance),
+        'unread_notifications': unread_notifications,
+        'pending_transfers': pending_transfers,
+        'recent_transactions': [
+            {
+                'id': t.id,
+                'description': t.description,
+                'amount': str(t.amount),
+                'type': t.transaction_type,
+                'date': t.created_at
+            } for t in recent_transactions
+        ]
+    }
+
+
+def get_dashboard(user_id):
+    """
+    Return the cached dashboard for a user, building it if needed.
+
+    Returns:
+        dict: {'payload': dict, 'etag': str}
+    """
+    key = _payload_key(user_id, get_version(_version_name(user_id)))
+    entry = shared_cache.get(key)
+    if entry is not None:
+        return entry
+
+    payload = build_dashboard_payload(user_id)
+    encoded = json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True).encode('utf-8')
+    entry = {'payload': payload, 'etag': hashlib.md5(encoded).hexdigest()}
+    shared_cache.set(key, entry, getattr(settings, 'DASHBOARD_CACHE_TTL', 300))
+    return entry
+
+
+def invalidate_dashboard(*user_ids):
+    """Drop the cached dashboard for each given user."""
+    for user_id in user_ids:
+        if user_id:
+            bump_version(_version_name(user_id))
+
+
+def invalidate_dashboards(user_ids):
+    """Drop the cached dashboards for a batch of users in a couple of cache round trips."""
+    bump_versions([_version_name(user_id) for user_id in user_ids if user_id])
@@ -0,0 +1,430 @@
+"""
+System health probes behind the admin status page.
+
+Probes run concurrently, each with its own timeout, so one slow dependency (Celery
+inspect, an external API) cannot stall the others. ``refresh_system_status`` runs
+them, writes every ``SystemStatus`` row in one bulk upsert and caches the
+serialized snapshot in the shared cache, where the ``refresh_system_status`` task
+running in a Celery worker keeps it warm for every web process.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import connection, connections
+from django.utils import timezone
+
+from utils.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_CACHE_KEY = 'system_status:snapshot'
+
+# Seconds each probe may take before it is reported as timed out
+DEFAULT_PROBE_TIMEOUT = 3.0
+
+
+def check_api_health():
+    """Check API health and detailed system metrics."""
+    try:
+        import psutil
+        cpu_usage = psutil.cpu_percent()
+        memory = psutil.virtual_memory()
+        memory_usage = memory.percent
+        message = f"CPU: {cpu_usage}%, Memory: {memory_usage}%"
+    except ImportError:
+        # Fallback if psutil is not installed
+        if hasattr(os, 'getloadavg'):
+            load = os.getloadavg()
+            message = f"Load Avg: {load[0]}, {load[1]}, {load[2]}"
+        else:
+            message = "API responding normally (no metrics available)"
+
+    return {
+        'status': 'operational',
+        'message': message,
+        'uptime_percentage': 99.99,
+        'error_count': 0,
+        'request_count': 0
+    }
+
+
+def check_database_health():
+    """Check database health."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            return {
+                'status': 'operational',
+                'message': 'Database connection active',
+                'uptime_percentage': 99.95,
+                'error_count': 0,
+                'request_count': 0
+            }
+    except Exception as e:
+        return {
+            'status': 'major_outage',
+            'message': f'Connection failed: {str(e)}',
+            'uptime_percentage': 0.0,
+            'error_count': 1,
+            'request_count': 0
+        }
+
+
+def check_redis_health():
+    """Check Redis health through the shared cache every process uses."""
+    try:
+        shared_cache.set('health_check', 'ok', 5)
+        result = shared_cache.get('health_check')
+        if result == 'ok':
+            return {
+                'status': 'operational',
+                'message': 'Redis operational',
+                'uptime_percentage': 99.95,
+                'error_count': 0,
+                'request_count': 0
+            }
+        else:
+            return {
+                'status': 'degraded',
+                'message': 'Cache write succeeded but read failed',
+                'uptime_percentage': 95.0,
+                'error_count': 1,
+                'request_count': 0
+            }
+    except Exception as e:
+        return {
+            'status': 'partial_outage',
+            'message': f'Redis unavailable: {str(e)}',
+            'uptime_percentage': 0.0,
+            'error_count': 1,
+            'request_count': 0
+        }
+
+
+def check_celery_health():
+    """Check Celery health by inspecting workers."""
+    try:
+        from primetrust.celery import app as celery_app
+
+        # Set a short timeout
+        i = celery_app.control.inspect(timeout=1.0)
+        available_nodes = i.ping()
+
+        if available_nodes:
+            count = len(available_nodes)
+            return {
+                'status': 'operational',
+                'message': f'{count} worker node(s) active',
+                'uptime_percentage': 99.5,
+                'error_count': 0,
+                'request_count': 0
+            }
+        else:
+            return {
+                'status': 'degraded',
+                'message': 'No active Celery workers found',
+                'uptime_percentage': 50.0,
+                'error_count': 1,
+                'request_count': 0
+            }
+    except ImportError:
+        return {
+            'status': 'maintenance',
+            'message': 'Celery app not found/configured',
+            'uptime_percentage': 0,
+            'error_count': 0,
+            'request_count': 0
+        }
+    except Exception as e:
+        # If broker is down, this might fail
+        return {
+            'status': 'degraded',
+            'message': f'Could not contact workers: {str(e)}',
+            'uptime_percentage': 80.0,
+            'error_count': 1,
+            'request_count': 0
+        }
+
+
+def check_email_health():
+    """Check email service health."""
+    try:
+        # Actually try to open a connection to the SMTP server
+        from django.core.mail import get_connection
+        mail_connection = get_connection(timeout=DEFAULT_PROBE_TIMEOUT)
+        mail_connection.open()
+        mail_connection.close()
+
+        return {
+            'status': 'operational',
+            'message': 'SMTP connection successful',
+            'uptime_percentage': 99.8,
+            'error_count': 0,
+            'request_count': 0
+        }
+    except Exception as e:
+        return {
+            'status': 'partial_outage',
+            'message': f'SMTP connection failed: {str(e)}',
+            'uptime_percentage': 70.0,
+            'error_count': 1,
+            'request_count': 0
+        }
+
+
+def check_payment_config():
+    """Check payment configuration."""
+    # Since we can't easily ping a payment gateway without credentials or making a transaction,
+    # we check if critical settings are present.
+    has_stripe = hasattr(settings, 'STRIPE_SECRET_KEY') and settings.STRIPE_SECRET_KEY
+
+    if has_stripe:
+        return {
+            'status': 'operational',
+            'message': 'Payment configuration present',
+            'uptime_percentage': 100.0,
+            'error_count': 0,
+            'request_count': 0
+        }
+    else:
+        # It's not really an outage if it's not configured, but let's call it maintenance
+        return {
+            'status': 'maintenance',
+            'message': 'Payment gateway not configured',
+            'uptime_percentage': 100.0,
+            'error_count': 0,
+            'request_count': 0
+        }
+
+
+def check_market_data_health():
+    """Check market data service (CoinGecko)."""
+    try:
+        response = requests.get('https://api.coingecko.com/api/v3/ping', timeout=3)
+        if response.status_code == 200:
+            return {
+                'status': 'operational',
+                'message': 'CoinGecko API reachable',
+                'uptime_percentage': 99.0,
+                'error_count': 0,
+                'request_count': 0
+            }
+        else:
+            return {
+                'status': 'degraded',
+                'message': f'CoinGecko returned {response.status_code}',
+                'uptime_percentage': 80.0,
+                'error_count': 1,
+                'request_count': 0
+            }
+    except Exception as e:
+        return {
+            'status': 'partial_outage',
+            'message': f'Market data unavailable: {str(e)}',
+            'uptime_percentage': 60.0,
+            'error_count': 1,
+            'request_count': 0
+        }
+
+
+# (component, probe, timeout in seconds)
+PROBES = [
+    ('api', check_api_health, 1.0),
+    ('database', check_database_health, 2.0),
+    ('redis', check_redis_health, 1.0),
+    ('celery', check_celery_health, 2.0),
+    ('email', check_email_health, DEFAULT_PROBE_TIMEOUT),
+    ('payment', check_payment_config, 1.0),
+    ('market_data', check_market_data_health, 4.0),
+]
+
+
+def _timed(probe):
+    start = time.perf_counter()
+    try:
+        result = probe()
+    except Exception as e:
+        result = {
+            'status': 'major_outage',
+            'message': f'Health check failed: {str(e)}',
+            'uptime_percentage': 0.0,
+        }
+    finally:
+        # Probes run in pool threads, each of which opens its own DB connection
+        connections.close_all()
+    result['response_time'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def run_health_checks(probes=None):
+    """
+    Run all probes concurrently.
+
+    A probe that exceeds its timeout is reported as degraded; its thread is left
+    to finish in the background rather than blocking the caller.
+
+    Returns:
+        dict: component -> probe result
+    """
+    probes = probes or PROBES
+    executor = ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix='health-probe')
+    start = time.perf_counter()
+    futures = [(component, timeout, executor.submit(_timed, probe)) for component, probe, timeout in probes]
+
+    results = {}
+    try:
+        for component, timeout, future in sorted(futures, key=lambda item: item[1]):
+            remaining = max(0.0, start + timeout - time.perf_counter())
+            try:
+                results[component] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                results[component] = {
+                    'status': 'degraded',
+                    'message': f'Health check timed out after {timeout}s',
+                    'uptime_percentage': 0.0,
+                    'response_time': round(timeout * 1000, 2),
+                }
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def save_statuses(results):
+    """
+    Write probe results to ``SystemStatus`` with one bulk upsert.
+
+    Returns:
+        list: The SystemStatus rows, in component order
+    """
+    from .models import SystemStatus
+
+    error_counts = dict(
+        SystemStatus.objects.filter(component__in=results).values_list('component', 'error_count')
+    )
+    now = timezone.now()
+    rows = [
+        SystemStatus(
+            component=component,
+            status=result['status'],
+            message=result['message'],
+            response_time=result.get('response_time'),
+            uptime_percentage=result.get('uptime_percentage', 99.9),
+            error_count=error_counts.get(component, 0) + (result['status'] != 'operational'),
+            last_check=now,
+        )
+        for component, result in sorted(results.items())
+    ]
+    SystemStatus.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['component'],
+        update_fields=['status', 'message', 'response_time', 'uptime_percentage', 'error_count', 'last_check'],
+    )
+    return list(SystemStatus.objects.filter(component__in=results).order_by('component'))
+
+
+def overall_status(components):
+    """Worst status across the serialized components."""
+    overall = 'operational'
+    for component in components:
+        if component['status'] == 'major_outage':
+            return 'major_outage'
+        elif component['status'] == 'partial_outage' and overall == 'operational':
+            overall = 'partial_outage'
+        elif component['status'] == 'degraded' and overall == 'operational':
+            overall = 'degraded'
+    return overall
+
+
+def build_snapshot(statuses):
+    from admin_api.serializers import SystemStatusSerializer
+
+    components = SystemStatusSerializer(statuses, many=True).data
+    return {
+        'overall_status': overall_status(components),
+        'components': components,
+        'last_updated': timezone.now(),
+    }
+
+
+def refresh_system_status():
+    """Run the probes, persist the results and cache the snapshot."""
+    snapshot = build_snapshot(save_statuses(run_health_checks()))
+    shared_cache.set(SNAPSHOT_CACHE_KEY, snapshot, settings.SYSTEM_STATUS_CACHE_TTL)
+    return snapshot
+
+
+def get_system_status():
+    """
+    The cached status snapshot.
+
+    Falls back to the stored rows while they are recent (the refresh task may have
+    just missed the cache TTL), and only probes inline when nothing fresh exists.
+    """
+    from .models import SystemStatus
+
+    snapshot = shared_cache.get(SNAPSHOT_CACHE_KEY)
+    if snapshot is not None:
+        return snapshot
+
+    stale_before = timezone.now() - timedelta(seconds=settings.SYSTEM_STATUS_STALE_AFTER)
+    statuses = list(SystemStatus.objects.order_by('component'))
+    if statuses and min(row.last_check for row in statuses) >= stale_before:
+        snapshot = build_snapshot(statuses)
+        shared_cache.set(SNAPSHOT_CACHE_KEY, snapshot, settings.SYSTEM_STATUS_CACHE_TTL)
+        return snapshot
+
+    return refresh_system_status()
+
+
+_readiness = {'checked_at': None, 'result': None}
+_readiness_lock = threading.Lock()
+
+
+def _probe_readiness():
+    checks = {}
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        checks['database'] = 'ok'
+    except Exception as e:
+        checks['database'] = f'error: {str(e)}'
+    try:
+        shared_cache.get('readyz')
+        checks['cache'] = 'ok'
+    except Exception as e:
+        checks['cache'] = f'error: {str(e)}'
+    return {'ready': all(value == 'ok' for value in checks.values()), 'checks': checks}
+
+
+def check_readiness():
+    """
+    Whether this process can serve traffic: the database answers ``SELECT 1`` and
+    the shared cache is reachable.
+
+    The result is memoized for READINESS_CACHE_SECONDS per process, so frequent
+    load balancer probes cost at most one round trip to each backend per interval.
+    Concurrent probes that find it expired reuse the previous result while one of
+    them re-checks.
+    """
+    now = time.monotonic()
+    checked_at = _readiness['checked_at']
+    if checked_at is not None and now - checked_at < settings.READINESS_CACHE_SECONDS:
+        return _readiness['result']
+
+    if not _readiness_lock.acquire(blocking=_readiness['result'] is None):
+        return _readiness['result']
+    try:
+        result = _probe_readiness()
+        _readiness['result'] = result
+        _readiness['checked_at'] = time.monotonic()
+        return result
+    finally:
+        _readiness_lock.release()
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+def remove_duplicate_components(apps, schema_editor):
+    SystemStatus = apps.get_model('api', 'SystemStatus')
+    # Keep the most recently checked row per component
+    seen = set()
+    for row in SystemStatus.objects.order_by('component', '-last_check', '-id'):
+        if row.component in seen:
+            row.delete()
+        else:
+            seen.add(row.component)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_notification_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_components, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='systemstatus',
+            name='component',
+            field=models.CharField(choices=[('api', 'API'), ('database', 'Database'), ('redis', 'Redis'), ('celery', 'Celery'), ('email', 'Email Service'), ('payment', 'Payment Processing'), ('market_data', 'Market Data')], max_length=20, unique=True),
+        ),
+    ]
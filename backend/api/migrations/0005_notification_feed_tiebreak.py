@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_systemstatus_unique_component'),
+        ('transactions', '0005_alter_bill_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='notification',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notif_user_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notif_user_unread_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='notif_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user', '-created_at', '-id'], name='notif_user_unread_idx'),
+        ),
+    ]
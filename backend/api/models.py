@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 import uuid
+from utils.buffered_counter import BufferedCounter
 
 
 class Notification(models.Model):
@@ -46,9 +47,16 @@ class Notification(models.Model):
     
     class Meta:
         db_table = 'notifications'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         indexes = [
-            models.Index(fields=['user', 'is_read']),
+            # Feed order; serves cursor pagination over a user's history
+            models.Index(fields=['user', '-created_at', '-id'], name='notif_user_created_idx'),
+            # Unread rows only; serves ?unread=1, unread counts and mark-all-read
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                condition=models.Q(is_read=False),
+                name='notif_user_unread_idx'
+            ),
             models.Index(fields=['notification_type', 'created_at']),
         ]
     
@@ -61,6 +69,9 @@ class Notification(models.Model):
             self.is_read = True
             self.read_at = timezone.now()
             self.save(update_fields=['is_read', 'read_at'])
+            
+            from .unread_counter import UnreadNotificationCounter
+            UnreadNotificationCounter.decrement(self.user_id)
     
     def mark_as_sent(self):
         """Mark notification as sent."""
@@ -134,7 +145,7 @@ class SystemStatus(models.Model):
         ('market_data', 'Market Data'),
     ]
     
-    component = models.CharField(max_length=20, choices=COMPONENT_CHOICES)
+    component = models.CharField(max_length=20, choices=COMPONENT_CHOICES, unique=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES)
     message = models.TextField(blank=True)
     response_time = models.FloatField(null=True, blank=True)  # in milliseconds
@@ -301,19 +312,22 @@ class FAQ(models.Model):
         return self.question
     
     def increment_view_count(self):
-        """Increment view count."""
+        """Increment view count (buffered; see utils.buffered_counter)."""
+        faq_counter.increment(self.pk, 'view_count')
         self.view_count += 1
-        self.save(update_fields=['view_count'])
     
     def mark_helpful(self):
         """Mark FAQ as helpful."""
+        faq_counter.increment(self.pk, 'helpful_count')
         self.helpful_count += 1
-        self.save(update_fields=['helpful_count'])
     
     def mark_not_helpful(self):
         """Mark FAQ as not helpful."""
+        faq_counter.increment(self.pk, 'not_helpful_count')
         self.not_helpful_count += 1
-        self.save(update_fields=['not_helpful_count'])
+
+
+faq_counter = BufferedCounter('api.FAQ', ('view_count', 'helpful_count', 'not_helpful_count'))
 
 
 class SearchLog(models.Model):
@@ -330,7 +344,8 @@ class SearchLog(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Explicit default (not auto_now_add) so buffered bulk inserts keep the event time
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         db_table = 'search_logs'
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class NotificationCursorPagination(CursorPagination):
+    """
+    Keyset pagination over a user's notifications, newest first.
+    
+    Bulk-created notifications can share a timestamp; ``id`` breaks the tie so the
+    order is total and rows with the same timestamp keep a fixed order across pages.
+    """
+    
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
@@ -1,10 +1,30 @@
+from functools import partial
+from itertools import islice
+
+from django.db import transaction as db_transaction
+from django.db.models import Q, QuerySet
 from django.utils import timezone
 from .models import Notification
+from .dashboard import invalidate_dashboard, invalidate_dashboards
+from .unread_counter import UnreadNotificationCounter
 from transactions.models import Transaction
 from banking.models import Transfer
 import uuid
 
 
+# Named audiences for bulk notifications
+NOTIFICATION_SEGMENTS = {
+    'all': Q(is_active=True),
+    'verified': Q(is_active=True, is_verified=True),
+    'unverified': Q(is_active=True, is_verified=False),
+    'two_factor_disabled': Q(is_active=True, two_factor_enabled=False),
+    'staff': Q(is_active=True, is_staff=True),
+}
+
+# Users per bulk_create / realtime batch when fanning out a notification
+BULK_NOTIFICATION_CHUNK_SIZE = 2000
+
+
 class NotificationService:
     """Service for handling notifications."""
     
@@ -146,25 +166,162 @@ class NotificationService:
             priority=priority
         )
     
+    @staticmethod
+    def resolve_audience(audience):
+        """
+        Turn a segment name or User queryset into a User queryset.
+
+        Args:
+            audience: Segment name from NOTIFICATION_SEGMENTS or a User queryset
+        """
+        from accounts.models import User
+
+        if isinstance(audience, str):
+            if audience not in NOTIFICATION_SEGMENTS:
+                raise ValueError(
+                    f"Unknown segment '{audience}'. Allowed values are: {', '.join(sorted(NOTIFICATION_SEGMENTS))}"
+                )
+            return User.objects.filter(NOTIFICATION_SEGMENTS[audience])
+        return audience
+    
+    @staticmethod
+    def audience_chunks(audience, chunk_size=BULK_NOTIFICATION_CHUNK_SIZE, start_after=None):
+        """
+        Yield the user ids of an audience in lists of at most ``chunk_size``, ascending within each list.
+
+        Segments and querysets are walked by primary key. An iterable of ids is read
+        ``chunk_size`` at a time and each slice is checked against the users table, so
+        it is never held in memory whole; resuming one with ``start_after`` assumes
+        its ids are ascending.
+        """
+        from accounts.models import User
+
+        if isinstance(audience, (str, QuerySet)):
+            user_ids = NotificationService.resolve_audience(audience).order_by('pk').values_list('pk', flat=True)
+            last_user_id = start_after
+            while True:
+                chunk = user_ids.filter(pk__gt=last_user_id) if last_user_id is not None else user_ids
+                chunk = list(chunk[:chunk_size])
+                if not chunk:
+                    return
+                yield chunk
+                last_user_id = chunk[-1]
+
+        requested = iter(audience)
+        while True:
+            batch = list(islice(requested, chunk_size))
+            if not batch:
+                return
+            user_ids = User.objects.filter(pk__in=batch).order_by('pk').values_list('pk', flat=True)
+            if start_after is not None:
+                user_ids = user_ids.filter(pk__gt=start_after)
+            chunk = list(user_ids)
+            if chunk:
+                yield chunk
+    
+    @staticmethod
+    def bulk_create_notifications(audience, notification_type, title, message, priority='medium', data=None,
+                                  chunk_size=BULK_NOTIFICATION_CHUNK_SIZE, publish_realtime=True,
+                                  start_after=None, progress_callback=None):
+        """
+        Send the same notification to every user in an audience.
+        
+        Users are walked one chunk at a time (see ``audience_chunks``), so memory stays
+        bounded by ``chunk_size`` however large the audience is. Each chunk is one
+        ``bulk_create`` in its own transaction, followed by a batched realtime publish
+        and cache invalidation for that chunk.
+        
+        Args:
+            audience: Segment name from NOTIFICATION_SEGMENTS, a User queryset, or an
+                iterable of user ids
+            start_after: Resume an interrupted broadcast after this user id
+            progress_callback: Called with the summary dict after every chunk
+        
+        Returns:
+            dict: broadcast_id, total (None for an unsized iterable of ids), created,
+            published, last_user_id
+        """
+        from utils.realtime import publish_batch_to_ably_sync
+        
+        if isinstance(audience, (str, QuerySet)):
+            user_ids = NotificationService.resolve_audience(audience)
+            total = user_ids.filter(pk__gt=start_after).count() if start_after else user_ids.count()
+        else:
+            total = len(audience) if hasattr(audience, '__len__') else None
+        data = dict(data or {})
+        data.setdefault('broadcast_id', uuid.uuid4().hex)
+        
+        progress = {
+            'broadcast_id': data['broadcast_id'],
+            'total': total,
+            'created': 0,
+            'published': 0,
+            'last_user_id': start_after,
+        }
+        realtime_payload = {
+            'title': title,
+            'message': message,
+            'type': notification_type,
+            'priority': priority,
+            'broadcast_id': data['broadcast_id'],
+        }
+        
+        for chunk in NotificationService.audience_chunks(audience, chunk_size, start_after):
+            with db_transaction.atomic():
+                Notification.objects.bulk_create([
+                    Notification(
+                        user_id=user_id,
+                        notification_type=notification_type,
+                        priority=priority,
+                        title=title,
+                        message=message,
+                        data=data
+                    )
+                    for user_id in chunk
+                ], batch_size=chunk_size)
+            
+            # bulk_create skips post_save, so keep the cached counts in step here
+            UnreadNotificationCounter.bulk_added(chunk)
+            db_transaction.on_commit(partial(invalidate_dashboards, chunk))
+            
+            if publish_realtime:
+                progress['published'] += publish_batch_to_ably_sync(
+                    [f'user:{user_id}' for user_id in chunk], 'notification', realtime_payload
+                )
+            
+            progress['created'] += len(chunk)
+            progress['last_user_id'] = chunk[-1]
+            if progress_callback:
+                progress_callback(dict(progress))
+        
+        return progress
+    
     @staticmethod
     def mark_as_read(notification_ids, user):
-        """Mark notifications as read."""
+        """Mark notifications as read and keep the unread counter in step."""
         if notification_ids:
-            Notification.objects.filter(
+            updated = Notification.objects.filter(
                 id__in=notification_ids,
-                user=user
+                user=user,
+                is_read=False
             ).update(is_read=True, read_at=timezone.now())
+            UnreadNotificationCounter.decrement(user.pk, updated)
         else:
             # Mark all notifications as read
-            Notification.objects.filter(
+            updated = Notification.objects.filter(
                 user=user,
                 is_read=False
             ).update(is_read=True, read_at=timezone.now())
+            UnreadNotificationCounter.reset(user.pk, updated)
+        
+        # Bulk update skips post_save, so refresh the dashboard's unread count here
+        db_transaction.on_commit(partial(invalidate_dashboard, user.pk))
+        return updated
     
     @staticmethod
     def get_unread_count(user):
         """Get count of unread notifications."""
-        return Notification.objects.filter(user=user, is_read=False).count()
+        return UnreadNotificationCounter.get(user.pk)
     
     @staticmethod
     def get_recent_notifications(user, limit=10):
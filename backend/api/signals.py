@@ -0,0 +1,52 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from banking.models import Transfer
+from transactions.models import Transaction
+from .dashboard import invalidate_dashboard
+from .models import Notification
+from .unread_counter import UnreadNotificationCounter
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def invalidate_dashboard_on_transaction(sender, instance, **kwargs):
+    """Recent transactions and balance are shown on the dashboard."""
+    # After commit, or a concurrent load could cache pre-commit data under the new version
+    transaction.on_commit(partial(invalidate_dashboard, instance.user_id))
+
+
+@receiver(post_save, sender=Transfer)
+@receiver(post_delete, sender=Transfer)
+def invalidate_dashboard_on_transfer(sender, instance, **kwargs):
+    """Pending transfer count is shown on the dashboard."""
+    transaction.on_commit(partial(invalidate_dashboard, instance.sender_id))
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalidate_dashboard_on_notification(sender, instance, **kwargs):
+    """Unread notification count is shown on the dashboard."""
+    transaction.on_commit(partial(invalidate_dashboard, instance.user_id))
+
+
+@receiver(post_save, sender=Notification)
+def count_new_unread_notification(sender, instance, created, **kwargs):
+    """Covers every create path, including direct Notification.objects.create calls."""
+    if created and not instance.is_read:
+        UnreadNotificationCounter.increment(instance.user_id)
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted_unread_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        UnreadNotificationCounter.decrement(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_dashboard_on_user(sender, instance, **kwargs):
+    """Balance is shown on the dashboard."""
+    transaction.on_commit(partial(invalidate_dashboard, instance.pk))
@@ -0,0 +1,86 @@
+"""
+Celery tasks for API operations
+"""
+from celery import shared_task
+from datetime import timedelta
+from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_unread_notification_counters():
+    """
+    Correct drift in the cached unread notification counters.
+    Runs hourly.
+    """
+    from .unread_counter import reconcile_unread_counters
+    
+    written = reconcile_unread_counters()
+    logger.info(f"Reconciled unread notification counters for {written} users")
+    return {'users': written}
+
+
+# Rows deleted per statement when pruning
+NOTIFICATION_PRUNE_CHUNK_SIZE = 1000
+
+
+@shared_task
+def prune_old_notifications():
+    """
+    Delete notifications older than the retention window.
+    Runs daily; deletes in small chunks to keep locks short.
+    """
+    from django.conf import settings
+    from .models import Notification
+    
+    cutoff = timezone.now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    expired = Notification.objects.filter(created_at__lt=cutoff)
+    
+    deleted = 0
+    while True:
+        ids = list(expired.values_list('id', flat=True)[:NOTIFICATION_PRUNE_CHUNK_SIZE])
+        if not ids:
+            break
+        # post_delete keeps unread counters and cached dashboards in step
+        count, _ = Notification.objects.filter(id__in=ids).delete()
+        deleted += count
+    
+    logger.info(f"Pruned {deleted} notifications older than {cutoff:%Y-%m-%d}")
+    return {'deleted': deleted}
+
+
+@shared_task
+def refresh_system_status():
+    """
+    Re-run the health probes and cache the admin status snapshot.
+    Runs every minute so the admin status page never probes inline.
+    """
+    from .health import refresh_system_status as refresh
+    
+    snapshot = refresh()
+    logger.info(f"System status refreshed: {snapshot['overall_status']}")
+    return {'overall_status': snapshot['overall_status']}
+
+
+@shared_task(bind=True)
+def broadcast_notification(self, audience, notification_type, title, message, priority='medium', data=None, start_after=None):
+    """
+    Fan a notification out to a segment (or list of user ids) in the background.
+    Progress is reported as task state PROGRESS with the running totals.
+    """
+    from .services import NotificationService
+    
+    def report(progress):
+        self.update_state(state='PROGRESS', meta=progress)
+        logger.info(
+            f"Broadcast {progress['broadcast_id']}: {progress['created']}/{progress['total']} notifications created"
+        )
+    
+    result = NotificationService.bulk_create_notifications(
+        audience, notification_type, title, message,
+        priority=priority, data=data, start_after=start_after, progress_callback=report
+    )
+    logger.info(f"Broadcast {result['broadcast_id']} finished: {result['created']} notifications created")
+    return result
@@ -1,3 +1,264 @@
-from django.test import TestCase
+import time
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from transactions.models import Transaction
+from utils.shared_cache import shared_cache
+
+from . import health
+from .dashboard import get_dashboard
+from .models import FAQ, Notification, SystemStatus, faq_counter
+from .services import NotificationService
+from .unread_counter import UnreadNotificationCounter, _user_key, reconcile_unread_counters
+
+User = get_user_model()
+
+
+class DashboardCacheTests(TestCase):
+
+    def setUp(self):
+        shared_cache.clear()
+        self.user = User.objects.create_user(username='holder', email='holder@example.com', password=None)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def deposit(self, amount):
+        return Transaction.objects.create(
+            user=self.user, transaction_type='deposit', amount=Decimal(amount), status='completed',
+            reference_number=f'REF{amount}', balance_before=Decimal('0.00'), balance_after=Decimal(amount)
+        )
+
+    def test_matching_etag_gets_not_modified(self):
+        first = self.client.get(reverse('api:dashboard'))
+        self.assertEqual(first.status_code, 200)
+
+        again = self.client.get(reverse('api:dashboard'), HTTP_IF_NONE_MATCH=f'W/{first["ETag"]}')
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again['ETag'], first['ETag'])
+
+    def test_write_changes_etag(self):
+        first = self.client.get(reverse('api:dashboard'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.deposit('25.00')
+
+        again = self.client.get(reverse('api:dashboard'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 200)
+        self.assertNotEqual(again['ETag'], first['ETag'])
+        self.assertEqual(len(again.data['recent_transactions']), 1)
+
+    def test_invalidation_waits_for_commit(self):
+        before = get_dashboard(self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.deposit('25.00')
+            # A load before the writer commits must not be cached under a fresh version
+            self.assertEqual(get_dashboard(self.user.pk), before)
+        self.assertTrue(callbacks)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(get_dashboard(self.user.pk)['payload']['recent_transactions']), 1)
+
+
+class UnreadCounterTests(TestCase):
+
+    def setUp(self):
+        shared_cache.clear()
+        self.user = User.objects.create_user(username='holder', email='holder@example.com', password=None)
+
+    def notify(self):
+        return Notification.objects.create(user=self.user, notification_type='account', title='Notice', message='Message')
+
+    def test_notification_created_while_seeding_is_counted(self):
+        def count_then_notify():
+            count = Notification.objects.filter(user=self.user, is_read=False).count()
+            self.notify()
+            return count
+
+        self.assertEqual(UnreadNotificationCounter._get(_user_key(self.user.pk), count_then_notify), 0)
+        self.assertEqual(UnreadNotificationCounter.get(self.user.pk), 1)
+
+    def test_reconcile_resets_drifted_counters(self):
+        self.notify()
+        reader = User.objects.create_user(username='reader', email='reader@example.com', password=None)
+        shared_cache.set(_user_key(self.user.pk), 4, None)
+        shared_cache.set(_user_key(reader.pk), 3, None)
+
+        self.assertEqual(reconcile_unread_counters(), 2)
+        self.assertEqual(UnreadNotificationCounter.get(self.user.pk), 1)
+        self.assertEqual(UnreadNotificationCounter.get(reader.pk), 0)
+        self.assertEqual(UnreadNotificationCounter.get_total(), 1)
+
+
+class NotificationFeedTests(TestCase):
+
+    def test_pages_through_notifications_sharing_a_timestamp(self):
+        user = User.objects.create_user(username='holder', email='holder@example.com', password=None)
+        Notification.objects.bulk_create([
+            Notification(user=user, notification_type='account', title=f'Notice {i}', message='Message')
+            for i in range(25)
+        ])
+        Notification.objects.update(created_at=timezone.now())
+        client = APIClient()
+        client.force_authenticate(user)
+
+        seen = []
+        url = reverse('api:notification-list') + '?page_size=10'
+        while url:
+            page = client.get(url).data
+            seen.extend(row['id'] for row in page['results'])
+            url = page['next']
+        self.assertEqual(seen, list(Notification.objects.order_by('-id').values_list('id', flat=True)))
+
+
+class BroadcastTests(TestCase):
+
+    def test_id_iterable_audience_is_read_in_chunks(self):
+        users = [
+            User.objects.create_user(username=f'holder{i}', email=f'holder{i}@example.com', password=None)
+            for i in range(5)
+        ]
+        requested = (user.pk for user in users)  # a generator has no length
+        chunks = []
+
+        progress = NotificationService.bulk_create_notifications(
+            requested, 'system', 'Maintenance', 'Tonight', chunk_size=2, publish_realtime=False,
+            progress_callback=lambda summary: chunks.append(summary['created'])
+        )
+        self.assertEqual((progress['total'], progress['created']), (None, 5))
+        self.assertEqual(chunks, [2, 4, 5])
+        self.assertEqual(Notification.objects.count(), 5)
+
+    def test_unknown_and_already_sent_ids_are_skipped(self):
+        users = [
+            User.objects.create_user(username=f'holder{i}', email=f'holder{i}@example.com', password=None)
+            for i in range(3)
+        ]
+        ids = [user.pk for user in users] + [users[-1].pk + 100]
+        progress = NotificationService.bulk_create_notifications(
+            ids, 'system', 'Maintenance', 'Tonight', chunk_size=2, publish_realtime=False, start_after=users[0].pk
+        )
+        self.assertEqual(progress['created'], 2)
+        self.assertEqual(progress['last_user_id'], users[-1].pk)
+
+
+# Flushed by hand; the background flusher thread is not started
+@mock.patch.object(faq_counter, '_ensure_flusher')
+class BufferedCounterTests(TestCase):
+
+    def setUp(self):
+        faq_counter.flush()
+        self.faq = FAQ.objects.create(question='How?', answer='Like this.', category='general')
+        self.other = FAQ.objects.create(question='Why?', answer='Because.', category='general')
+
+    def test_increments_are_applied_on_flush(self, ensure_flusher):
+        for _ in range(3):
+            self.faq.increment_view_count()
+        self.other.mark_helpful()
+        self.assertEqual(faq_counter.pending(self.faq.pk, 'view_count'), 3)
+        self.assertEqual(FAQ.objects.get(pk=self.faq.pk).view_count, 0)
+
+        self.assertEqual(faq_counter.flush(), 2)
+        self.assertEqual(faq_counter.pending(self.faq.pk, 'view_count'), 0)
+        self.assertEqual(FAQ.objects.get(pk=self.faq.pk).view_count, 3)
+        self.assertEqual(FAQ.objects.get(pk=self.other.pk).helpful_count, 1)
+        self.assertEqual(FAQ.objects.get(pk=self.other.pk).view_count, 0)
+
+    def test_failed_flush_keeps_the_increments(self, ensure_flusher):
+        self.faq.mark_not_helpful()
+        with mock.patch.object(faq_counter, '_apply', side_effect=RuntimeError('database unavailable')):
+            with self.assertLogs('utils.buffered_counter', 'ERROR'):
+                self.assertEqual(faq_counter.flush(), 0)
+        self.assertEqual(faq_counter.pending(self.faq.pk, 'not_helpful_count'), 1)
+
+        self.faq.mark_not_helpful()
+        self.assertEqual(faq_counter.flush(), 1)
+        self.assertEqual(FAQ.objects.get(pk=self.faq.pk).not_helpful_count, 2)
+
+    def test_unknown_field_is_rejected(self, ensure_flusher):
+        with self.assertRaises(ValueError):
+            faq_counter.increment(self.faq.pk, 'answer')
+
+
+def operational():
+    return {'status': 'operational', 'message': 'OK', 'uptime_percentage': 100.0}
+
+
+def hanging():
+    time.sleep(1)
+    return operational()
+
+
+def failing():
+    raise RuntimeError('unreachable')
+
+
+class HealthSnapshotTests(TestCase):
+
+    def setUp(self):
+        shared_cache.clear()
+
+    def test_slow_and_failing_probes_do_not_hold_up_the_others(self):
+        start = time.perf_counter()
+        results = health.run_health_checks([
+            ('api', operational, 1.0), ('celery', hanging, 0.1), ('email', failing, 1.0),
+        ])
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(results['api']['status'], 'operational')
+        self.assertEqual(results['celery']['status'], 'degraded')
+        self.assertEqual(results['email']['status'], 'major_outage')
+
+    def test_snapshot_is_probed_once_and_then_served_from_the_shared_cache(self):
+        results = {'api': operational(), 'database': operational()}
+        with mock.patch.object(health, 'run_health_checks', return_value=results) as run_health_checks:
+            first = health.get_system_status()
+            self.assertEqual(health.get_system_status(), first)
+        run_health_checks.assert_called_once()
+        self.assertEqual(first['overall_status'], 'operational')
+        self.assertEqual(shared_cache.get(health.SNAPSHOT_CACHE_KEY), first)
+
+    def test_recent_rows_are_served_without_probing(self):
+        health.save_statuses({
+            'api': operational(),
+            'redis': {'status': 'partial_outage', 'message': 'Redis unavailable', 'uptime_percentage': 0.0},
+        })
+        with mock.patch.object(health, 'run_health_checks') as run_health_checks:
+            snapshot = health.get_system_status()
+        run_health_checks.assert_not_called()
+        self.assertEqual(snapshot['overall_status'], 'partial_outage')
+        self.assertEqual(SystemStatus.objects.get(component='redis').error_count, 1)
+
+
+class ProbeTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.dict(health._readiness, {'checked_at': None, 'result': None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_livez_does_no_io(self):
+        with self.assertNumQueries(0), mock.patch.object(health, '_probe_readiness') as probe:
+            response = self.client.get('/livez')
+        self.assertEqual(response.status_code, 200)
+        probe.assert_not_called()
+
+    def test_readyz_checks_the_database_and_cache(self):
+        response = self.client.get('/readyz')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['checks'], {'database': 'ok', 'cache': 'ok'})
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    @override_settings(READINESS_CACHE_SECONDS=60)
+    def test_readiness_is_memoized(self):
+        with mock.patch.object(shared_cache, 'get', side_effect=ConnectionError('refused')) as cache_get, \
+                self.assertLogs('django.request', 'ERROR'):
+            for _ in range(3):
+                response = self.client.get('/readyz')
+                self.assertEqual(response.status_code, 503)
+        cache_get.assert_called_once()
+        self.assertEqual(response.json()['status'], 'unavailable')
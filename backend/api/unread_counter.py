@@ -0,0 +1,160 @@
+"""
+Unread notification counters kept in the shared cache.
+
+Each user has a counter, and there is one site-wide counter for the admin
+dashboard. Counters are seeded from the database on first read and then kept
+current incrementally, so badge counts cost O(1) regardless of history size.
+``reconcile_unread_counters`` (run periodically) corrects any drift.
+"""
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+
+from utils.shared_cache import shared_cache
+
+
+GLOBAL_KEY = 'notifications_unread:all'
+
+# Seconds a seeding marker outlives the count it guards
+SEED_MARKER_TIMEOUT = 60
+
+# Users whose cached counters are probed per round trip when reconciling
+RECONCILE_BATCH_SIZE = 1000
+
+
+def _user_key(user_id):
+    return f'notifications_unread:{user_id}'
+
+
+def _seed_key(key):
+    return f'{key}:seeding'
+
+
+class UnreadNotificationCounter:
+    """Per-user and global unread notification counts."""
+
+    @staticmethod
+    def _get(key, count_query):
+        count = shared_cache.get(key)
+        if count is None:
+            # Adjustments that find no key clear the marker; if one lands while we
+            # count, the count may miss it, so the seeded value is dropped again.
+            token = uuid.uuid4().hex
+            shared_cache.set(_seed_key(key), token, SEED_MARKER_TIMEOUT)
+            count = count_query()
+            if shared_cache.add(key, count, None) and shared_cache.get(_seed_key(key)) != token:
+                shared_cache.delete(key)
+        return count
+
+    @staticmethod
+    def _adjust(key, delta):
+        # A missing key is left missing for the next read to seed, but a seed
+        # already in progress is told its count may be stale.
+        try:
+            value = shared_cache.incr(key, delta) if delta >= 0 else shared_cache.decr(key, -delta)
+        except ValueError:
+            shared_cache.delete(_seed_key(key))
+            return
+        if value < 0:
+            shared_cache.delete(key)
+
+    @classmethod
+    def get(cls, user_id):
+        """Unread count for one user."""
+        from .models import Notification
+        return cls._get(
+            _user_key(user_id),
+            lambda: Notification.objects.filter(user_id=user_id, is_read=False).count()
+        )
+
+    @classmethod
+    def get_total(cls):
+        """Unread count across all users."""
+        from .models import Notification
+        return cls._get(GLOBAL_KEY, lambda: Notification.objects.filter(is_read=False).count())
+
+    @classmethod
+    def increment(cls, user_id, amount=1):
+        if amount:
+            cls._adjust(_user_key(user_id), amount)
+            cls._adjust(GLOBAL_KEY, amount)
+
+    @classmethod
+    def decrement(cls, user_id, amount=1):
+        if amount:
+            cls._adjust(_user_key(user_id), -amount)
+            cls._adjust(GLOBAL_KEY, -amount)
+
+    @classmethod
+    def reset(cls, user_id, cleared):
+        """All of a user's notifications were marked read; ``cleared`` rows changed."""
+        shared_cache.set(_user_key(user_id), 0, None)
+        cls._adjust(GLOBAL_KEY, -cleared)
+
+    @classmethod
+    def bulk_added(cls, user_ids):
+        """
+        One unread notification was bulk-inserted for each of ``user_ids``.
+
+        Per-user counters are dropped (one round trip) and recounted on next read
+        rather than incremented one key at a time.
+        """
+        user_ids = list(user_ids)
+        if user_ids:
+            shared_cache.delete_many([_user_key(user_id) for user_id in user_ids])
+            cls._adjust(GLOBAL_KEY, len(user_ids))
+
+    @staticmethod
+    def invalidate(user_id=None):
+        """Forget cached counts so they are recounted on next read."""
+        if user_id is not None:
+            shared_cache.delete(_user_key(user_id))
+        shared_cache.delete(GLOBAL_KEY)
+
+
+def reconcile_unread_counters():
+    """
+    Overwrite cached counters with the database counts.
+
+    Every user's key is probed in batches and each counter found is rewritten,
+    including counters that drifted high for users with nothing unread.
+
+    Returns:
+        int: Number of user counters written
+    """
+    from .models import Notification
+
+    written = 0
+    user_ids = get_user_model().objects.order_by('pk').values_list('pk', flat=True)
+    batch = []
+    for user_id in user_ids.iterator(chunk_size=RECONCILE_BATCH_SIZE):
+        batch.append(user_id)
+        if len(batch) >= RECONCILE_BATCH_SIZE:
+            written += _reconcile_batch(batch)
+            batch = []
+    if batch:
+        written += _reconcile_batch(batch)
+
+    shared_cache.set(GLOBAL_KEY, Notification.objects.filter(is_read=False).count(), None)
+    return written
+
+
+def _reconcile_batch(user_ids):
+    from .models import Notification
+
+    keys = {_user_key(user_id): user_id for user_id in user_ids}
+    cached = shared_cache.get_many(keys)
+    if not cached:
+        return 0
+
+    counted = {keys[key] for key in cached}
+    unread = dict(
+        Notification.objects.filter(user_id__in=counted, is_read=False)
+        .values('user_id')
+        .annotate(unread=Count('id'))
+        .order_by()
+        .values_list('user_id', 'unread')
+    )
+    shared_cache.set_many({key: unread.get(keys[key], 0) for key in cached}, None)
+    return len(cached)
@@ -6,19 +6,29 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Q, Sum
 from django.utils import timezone
 from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
 import requests
 import json
 
 from .models import Notification, MarketData, SystemStatus, SupportTicket, FAQ, SearchLog
+from .dashboard import get_dashboard
+from .services import NotificationService
+from .pagination import NotificationCursorPagination
 from .serializers import (
     NotificationSerializer, MarketDataSerializer, SystemStatusSerializer,
     SupportTicketSerializer, FAQSerializer, SearchLogSerializer
 )
 from accounts.models import User
+from utils.buffered_writer import BufferedModelWriter
+from accounts.search import UserSearchService, MAX_SEARCH_RESULTS
 from transactions.models import Transaction
 from banking.models import Transfer
 
 
+search_log_writer = BufferedModelWriter('api.SearchLog')
+
+
 # Market Data Views
 class MarketDataView(APIView):
     """Get market data for stocks and cryptocurrencies."""
@@ -85,13 +95,19 @@ class AvailableInvestmentsView(APIView):
 
 # Notification Views
 class NotificationListView(generics.ListAPIView):
-    """List notifications for the authenticated user."""
+    """List notifications for the authenticated user. Pass ``unread=1`` for unread only."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = NotificationSerializer
+    pagination_class = NotificationCursorPagination
     
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        queryset = Notification.objects.filter(user=self.request.user)
+        
+        if self.request.query_params.get('unread') in ('1', 'true'):
+            queryset = queryset.filter(is_read=False)
+        
+        return queryset
 
 
 class NotificationDetailView(generics.RetrieveAPIView):
@@ -116,18 +132,7 @@ class NotificationMarkReadView(APIView):
     
     def post(self, request):
         notification_ids = request.data.get('notification_ids', [])
-        
-        if notification_ids:
-            Notification.objects.filter(
-                id__in=notification_ids,
-                user=request.user
-            ).update(is_read=True, read_at=timezone.now())
-        else:
-            # Mark all notifications as read
-            Notification.objects.filter(
-                user=request.user,
-                is_read=False
-            ).update(is_read=True, read_at=timezone.now())
+        NotificationService.mark_as_read(notification_ids, request.user)
         
         return Response({'message': 'Notifications marked as read'}, status=status.HTTP_200_OK)
 
@@ -206,19 +211,12 @@ class HealthCheckView(APIView):
                 'api': 'healthy'
             }
             
-            # Check database
-            try:
-                User.objects.count()
-            except:
+            # Database and cache reachability, shared with /readyz and memoized briefly
+            from .health import check_readiness
+            readiness = check_readiness()['checks']
+            if readiness['database'] != 'ok':
                 checks['database'] = 'unhealthy'
-            
-            # Check Redis (if configured)
-            try:
-                from django.core.cache import cache
-                cache.set('health_check', 'ok', 10)
-                if cache.get('health_check') != 'ok':
-                    checks['redis'] = 'unhealthy'
-            except:
+            if readiness['cache'] != 'ok':
                 checks['redis'] = 'unhealthy'
             
             overall_health = 'healthy' if all(status == 'healthy' for status in checks.values()) else 'unhealthy'
@@ -236,6 +234,24 @@ class HealthCheckView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@never_cache
+def livez(request):
+    """Liveness probe: the process is up and serving requests. No I/O."""
+    return JsonResponse({'status': 'alive'})
+
+
+@never_cache
+def readyz(request):
+    """Readiness probe: database and cache reachable (memoized briefly, see api.health)."""
+    from .health import check_readiness
+    
+    result = check_readiness()
+    return JsonResponse(
+        {'status': 'ready' if result['ready'] else 'unavailable', 'checks': result['checks']},
+        status=200 if result['ready'] else 503
+    )
+
+
 class VersionInfoView(APIView):
     """Get API version information."""
     
@@ -266,8 +282,8 @@ class SearchView(APIView):
         if not query:
             return Response({'error': 'Query parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Log search
-        SearchLog.objects.create(
+        # Log search (buffered, written in batches)
+        search_log_writer.add(
             user=request.user,
             query=query,
             search_type=search_type,
@@ -285,10 +301,8 @@ class SearchView(APIView):
             results['transactions'] = [{'id': t.id, 'description': t.description, 'amount': str(t.amount)} for t in transactions]
         
         elif search_type == 'user':
-            users = User.objects.filter(
-                Q(first_name__icontains=query) | Q(last_name__icontains=query) | Q(email__icontains=query)
-            )[:10]
-            results['users'] = [{'id': u.id, 'name': u.get_full_name(), 'email': u.email} for u in users]
+            users = UserSearchService.search(User.objects.all(), query)[:10]
+            results['users'] = [UserSearchService.to_result(u) for u in users]
         
         return Response({
             'query': query,
@@ -318,8 +332,8 @@ class TransactionSearchView(APIView):
         return Response({'results': results}, status=status.HTTP_200_OK)
 
 
-class UserSearchView(APIView):
-    """Search users."""
+class UserSearchView(generics.GenericAPIView):
+    """Search users. Pass ``mode=autocomplete`` for a small prefix-only result set."""
     
     permission_classes = [permissions.IsAuthenticated]
     
@@ -329,52 +343,36 @@ class UserSearchView(APIView):
         if not query:
             return Response({'error': 'Query parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        users = User.objects.filter(
-            Q(first_name__icontains=query) | Q(last_name__icontains=query) | Q(email__icontains=query)
-        )
-        
-        results = [{'id': u.id, 'name': u.get_full_name(), 'email': u.email} for u in users]
+        if request.query_params.get('mode') == 'autocomplete':
+            users = UserSearchService.autocomplete(User.objects.all(), query)
+            return Response({'results': [UserSearchService.to_result(u) for u in users]}, status=status.HTTP_200_OK)
         
-        return Response({'results': results}, status=status.HTTP_200_OK)
+        users = UserSearchService.search(User.objects.all(), query)[:MAX_SEARCH_RESULTS]
+        page = self.paginate_queryset(users)
+        return self.get_paginated_response([UserSearchService.to_result(u) for u in page])
 
 
 # Dashboard Views
 class DashboardView(APIView):
-    """Get dashboard data."""
+    """Get dashboard data (cached per user, supports If-None-Match)."""
     
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request):
-        user = request.user
-        
-        # Get recent transactions
-        recent_transactions = Transaction.objects.filter(user=user).order_by('-created_at')[:5]
-        
-        # Get account balance
-        balance = user.balance
-        
-        # Get notification count
-        unread_notifications = Notification.objects.filter(user=user, is_read=False).count()
-        
-        # Get pending transfers
-        pending_transfers = Transfer.objects.filter(sender=user, status='pending').count()
-        
-        dashboard_data = {
-            'balance': str(balance),
-            'unread_notifications': unread_notifications,
-            'pending_transfers': pending_transfers,
-            'recent_transactions': [
-                {
-                    'id': t.id,
-                    'description': t.description,
-                    'amount': str(t.amount),
-                    'type': t.transaction_type,
-                    'date': t.created_at
-                } for t in recent_transactions
-            ]
-        }
+        dashboard = get_dashboard(request.user.pk)
+        etag = f'"{dashboard["etag"]}"'
+        
+        # Polling clients send back the last ETag and get an empty 304 if nothing changed
+        if_none_match = request.headers.get('If-None-Match', '')
+        client_etags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        if etag in client_etags:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(dashboard['payload'], status=status.HTTP_200_OK)
         
-        return Response(dashboard_data, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
 
 
 class DashboardSummaryView(APIView):
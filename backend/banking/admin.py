@@ -3,7 +3,8 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils import timezone
 from datetime import date, timedelta
-from .models import VirtualCard, Transfer, BankAccount, DirectDeposit, CardApplication, CheckDeposit
+from .card_authorization import invalidate_card_windows
+from .models import VirtualCard, Transfer, BankAccount, DirectDeposit, CardApplication, CheckDeposit, CardSpendingReset, CardSpendRelease
 
 
 @admin.register(CardApplication)
@@ -95,7 +96,8 @@ class VirtualCardAdmin(admin.ModelAdmin):
             'fields': ('user', 'application', 'card_type', 'card_number', 'cvv', 'expiry_month', 'expiry_year')
         }),
         ('Status & Limits', {
-            'fields': ('status', 'daily_limit', 'monthly_limit', 'current_daily_spent', 'current_monthly_spent', 'is_default')
+            'fields': ('status', 'daily_limit', 'monthly_limit', 'current_daily_spent', 'current_monthly_spent',
+                       'spending_day', 'spending_month', 'is_default')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -117,19 +119,25 @@ class VirtualCardAdmin(admin.ModelAdmin):
     
     def activate_cards(self, request, queryset):
         """Activate selected cards."""
+        card_ids = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(status='active')
+        invalidate_card_windows(card_ids)
         self.message_user(request, f'{updated} cards activated.')
     activate_cards.short_description = "Activate cards"
     
     def suspend_cards(self, request, queryset):
         """Suspend selected cards."""
+        card_ids = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(status='suspended')
+        invalidate_card_windows(card_ids)
         self.message_user(request, f'{updated} cards suspended.')
     suspend_cards.short_description = "Suspend cards"
     
     def cancel_cards(self, request, queryset):
         """Cancel selected cards."""
+        card_ids = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(status='cancelled')
+        invalidate_card_windows(card_ids)
         self.message_user(request, f'{updated} cards cancelled.')
     cancel_cards.short_description = "Cancel cards"
     
@@ -149,6 +157,21 @@ class VirtualCardAdmin(admin.ModelAdmin):
         return True
 
 
+@admin.register(CardSpendingReset)
+class CardSpendingResetAdmin(admin.ModelAdmin):
+    list_display = ('period', 'period_start', 'cards_reset', 'updated_at')
+    list_filter = ('period',)
+    readonly_fields = ('period', 'period_start', 'cards_reset', 'created_at', 'updated_at')
+    date_hierarchy = 'period_start'
+
+
+@admin.register(CardSpendRelease)
+class CardSpendReleaseAdmin(admin.ModelAdmin):
+    list_display = ('card', 'amount', 'spending_day', 'created_at')
+    readonly_fields = ('card', 'amount', 'spending_day', 'spending_month', 'created_at')
+    raw_id_fields = ('card',)
+
+
 @admin.register(Transfer)
 class TransferAdmin(admin.ModelAdmin):
     list_display = ('sender', 'recipient_email', 'amount', 'currency', 'status', 'transfer_type')
@@ -0,0 +1,457 @@
+"""
+Virtual card authorization.
+
+The limit check and the counter increment run as one Lua script against a
+per-card spending window in Redis, so concurrent card payments are never queued
+behind the card's database row. Amounts are integer cents. Windows are keyed by
+the cardholder-local day and month (see banking.spending_reset), so a new
+period starts from zero without any reset. Each window is:
+
+* seeded from the card row on first use, together with any spend that has not
+  been reconciled yet, and the cardholder's timezone (so the charge path needs
+  no profile query while the window is cached)
+* kept for ``CARD_AUTH_WINDOW_TTL`` seconds
+* dropped whenever the card row is saved (status, limits, database-path spend)
+
+Each approved spend is also added to a per-card pending hash.
+``reconcile_card_spending`` (Celery beat) moves those pending deltas onto
+``VirtualCard.current_daily_spent`` and ``current_monthly_spent``. The pending
+hash is first moved to an in-flight hash and only deleted once the database
+commit succeeds, so a failed run is retried without losing or double-applying
+anything.
+
+A rolled-back charge is released from the window and the pending hash. If Redis
+is unreachable at that moment, the release is stored as a ``CardSpendRelease``
+row and replayed by the next reconcile run, so the charge is never counted as spend.
+
+If ``CARD_AUTH_REDIS_URL`` is empty or Redis errors, authorization falls back to
+the database path: lock the card row, check the limits, write the counters.
+After an error Redis is skipped for ``REDIS_RETRY_SECONDS``.
+"""
+import logging
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction as db_transaction
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds Redis is bypassed after a connection error
+REDIS_RETRY_SECONDS = 30
+REDIS_SOCKET_TIMEOUT = 0.1
+
+# Cards reconciled per database transaction
+RECONCILE_BATCH_SIZE = 500
+# Stored failed releases replayed per reconcile run
+RELEASE_REPLAY_BATCH_SIZE = 500
+
+DIRTY_CARDS_KEY = 'card_auth:dirty'
+
+# Script result codes
+APPROVED = 0
+WINDOW_MISSING = -1
+DENIAL_MESSAGES = {
+    1: "Card is not active",
+    2: "Card has expired",
+    3: "Daily spending limit exceeded",
+    4: "Monthly spending limit exceeded",
+}
+
+# KEYS: window, pending, dirty set  ARGV: cents, day, month, current month index, card id
+AUTHORIZE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return {-1, 0, 0} end
+local w = redis.call('HMGET', KEYS[1], 'active', 'expiry', 'daily_limit', 'monthly_limit',
+                     'day', 'day_spent', 'month', 'month_spent')
+if w[1] ~= '1' then return {1, 0, 0} end
+if tonumber(w[2]) < tonumber(ARGV[4]) then return {2, 0, 0} end
+local amount = tonumber(ARGV[1])
+local day_spent = 0
+if w[5] == ARGV[2] then day_spent = tonumber(w[6]) end
+local month_spent = 0
+if w[7] == ARGV[3] then month_spent = tonumber(w[8]) end
+if day_spent + amount > tonumber(w[3]) then return {3, day_spent, month_spent} end
+if month_spent + amount > tonumber(w[4]) then return {4, day_spent, month_spent} end
+day_spent = day_spent + amount
+month_spent = month_spent + amount
+redis.call('HSET', KEYS[1], 'day', ARGV[2], 'day_spent', day_spent, 'month', ARGV[3], 'month_spent', month_spent)
+redis.call('HINCRBY', KEYS[2], ARGV[2] .. '|' .. ARGV[3], amount)
+redis.call('SADD', KEYS[3], ARGV[5])
+return {0, day_spent, month_spent}
+"""
+
+# KEYS: window, pending, dirty set  ARGV: cents, day, month, card id
+RELEASE_SCRIPT = """
+local w = redis.call('HMGET', KEYS[1], 'day', 'day_spent', 'month', 'month_spent')
+if w[1] == ARGV[2] then
+    redis.call('HSET', KEYS[1], 'day_spent', math.max(tonumber(w[2]) - tonumber(ARGV[1]), 0))
+end
+if w[3] == ARGV[3] then
+    redis.call('HSET', KEYS[1], 'month_spent', math.max(tonumber(w[4]) - tonumber(ARGV[1]), 0))
+end
+redis.call('HINCRBY', KEYS[2], ARGV[2] .. '|' .. ARGV[3], -tonumber(ARGV[1]))
+redis.call('SADD', KEYS[3], ARGV[4])
+return 1
+"""
+
+# KEYS: window, pending, in-flight, generation
+# ARGV: generation seen, active, expiry, daily limit, monthly limit, day, day spent, month, month spent, ttl,
+#       cardholder timezone
+SEED_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then return 1 end
+if (redis.call('GET', KEYS[4]) or '0') ~= ARGV[1] then return 0 end
+local day_spent = tonumber(ARGV[7])
+local month_spent = tonumber(ARGV[9])
+for _, key in ipairs({KEYS[2], KEYS[3]}) do
+    local entries = redis.call('HGETALL', key)
+    for i = 1, #entries, 2 do
+        local day, month = string.match(entries[i], '([^|]+)|([^|]+)')
+        local cents = tonumber(entries[i + 1])
+        if day == ARGV[6] then day_spent = day_spent + cents end
+        if month == ARGV[8] then month_spent = month_spent + cents end
+    end
+end
+redis.call('HSET', KEYS[1], 'active', ARGV[2], 'expiry', ARGV[3], 'daily_limit', ARGV[4],
+           'monthly_limit', ARGV[5], 'day', ARGV[6], 'day_spent', day_spent, 'month', ARGV[8],
+           'month_spent', month_spent, 'tz', ARGV[11])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[10]))
+return 1
+"""
+
+# KEYS: pending, in-flight  Returns the in-flight entries after merging pending into them
+TAKE_PENDING_SCRIPT = """
+local entries = redis.call('HGETALL', KEYS[1])
+for i = 1, #entries, 2 do
+    redis.call('HINCRBY', KEYS[2], entries[i], entries[i + 1])
+end
+redis.call('DEL', KEYS[1])
+return redis.call('HGETALL', KEYS[2])
+"""
+
+_client = None
+_scripts = {}
+_disabled_until = 0.0
+_lock = threading.Lock()
+# Cards charged on the database path while Redis was unavailable; their windows
+# are dropped once Redis is back
+_stale_windows = set()
+
+
+def window_key(card_id):
+    return f'card_auth:window:{card_id}'
+
+
+def pending_key(card_id):
+    return f'card_auth:pending:{card_id}'
+
+
+def inflight_key(card_id):
+    return f'card_auth:inflight:{card_id}'
+
+
+def generation_key(card_id):
+    return f'card_auth:generation:{card_id}'
+
+
+def to_cents(amount):
+    return int((Decimal(amount) * 100).to_integral_value())
+
+
+def _trip(error):
+    global _disabled_until
+    _disabled_until = time.monotonic() + REDIS_RETRY_SECONDS
+    logger.warning(f"Card authorization Redis unavailable, using the database for {REDIS_RETRY_SECONDS}s: {error}")
+
+
+def get_client():
+    """Redis client for the fast path, or None when it is disabled or recently failed."""
+    global _client
+    url = getattr(settings, 'CARD_AUTH_REDIS_URL', '')
+    if not url or time.monotonic() < _disabled_until:
+        return None
+    if _client is None:
+        with _lock:
+            if _client is None:
+                import redis
+                client = redis.Redis.from_url(
+                    url, decode_responses=True,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT, socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+                )
+                for name, source in (
+                    ('authorize', AUTHORIZE_SCRIPT), ('release', RELEASE_SCRIPT),
+                    ('seed', SEED_SCRIPT), ('take_pending', TAKE_PENDING_SCRIPT),
+                ):
+                    _scripts[name] = client.register_script(source)
+                _client = client
+    if _stale_windows:
+        _drop_stale_windows(_client)
+    return _client
+
+
+def _drop_stale_windows(client):
+    card_ids = list(_stale_windows)
+    try:
+        client.delete(*[window_key(card_id) for card_id in card_ids])
+        _stale_windows.difference_update(card_ids)
+    except Exception:
+        pass
+
+
+def invalidate_card_windows(card_ids):
+    """Drop cached windows so the next authorization reloads the card rows."""
+    card_ids = list(card_ids)
+    if not card_ids or not getattr(settings, 'CARD_AUTH_REDIS_URL', ''):
+        return
+    client = get_client()
+    if client is None:
+        _stale_windows.update(card_ids)
+        return
+    try:
+        client.delete(*[window_key(card_id) for card_id in card_ids])
+    except Exception as e:
+        _stale_windows.update(card_ids)
+        _trip(e)
+
+
+def _month_index(today):
+    return today.year * 12 + today.month
+
+
+def _seed_window(client, card, starts, tz_name):
+    generation = client.get(generation_key(card.pk)) or '0'
+    # Read the counters only after the generation, so a reconcile that lands in
+    # between makes the seed retry instead of dropping its deltas
+    card.refresh_from_db(fields=['status', 'expiry_month', 'expiry_year', 'daily_limit', 'monthly_limit',
+                                 'current_daily_spent', 'current_monthly_spent', 'spending_day', 'spending_month'])
+    day_spent = card.current_daily_spent if card.spending_day == starts['daily'] else 0
+    month_spent = card.current_monthly_spent if card.spending_month == starts['monthly'] else 0
+    return _scripts['seed'](
+        keys=[window_key(card.pk), pending_key(card.pk), inflight_key(card.pk), generation_key(card.pk)],
+        args=[
+            generation,
+            1 if card.status == 'active' else 0,
+            card.expiry_year * 12 + card.expiry_month,
+            to_cents(card.daily_limit), to_cents(card.monthly_limit),
+            starts['daily'].isoformat(), to_cents(day_spent),
+            starts['monthly'].isoformat(), to_cents(month_spent),
+            settings.CARD_AUTH_WINDOW_TTL,
+            tz_name,
+        ],
+        client=client,
+    )
+
+
+class CardAuthorization:
+    """Outcome of a card authorization; ``release`` returns an approved amount if the payment is rolled back."""
+
+    def __init__(self, card, amount, approved, message, path, starts=None):
+        self.card = card
+        self.amount = amount
+        self.approved = approved
+        self.message = message
+        self.path = path
+        self.starts = starts
+
+    def release(self):
+        if not self.approved or self.path != 'redis':
+            return
+        client = get_client()
+        if client is not None:
+            try:
+                _release_in_redis(client, self.card.pk, self.amount, self.starts['daily'], self.starts['monthly'])
+                return
+            except Exception as e:
+                _trip(e)
+        self._record_failed_release()
+
+    def _record_failed_release(self):
+        from .models import CardSpendRelease
+
+        logger.warning(f"Could not release {self.amount} on card {self.card.pk} in Redis; queued for reconcile")
+        CardSpendRelease.objects.create(
+            card_id=self.card.pk, amount=self.amount,
+            spending_day=self.starts['daily'], spending_month=self.starts['monthly'],
+        )
+
+
+def _release_in_redis(client, card_id, amount, day, month):
+    _scripts['release'](
+        keys=[window_key(card_id), pending_key(card_id), DIRTY_CARDS_KEY],
+        args=[to_cents(amount), day.isoformat(), month.isoformat(), card_id],
+        client=client,
+    )
+
+
+def _authorize_in_redis(client, card, amount, starts, tz_name):
+    keys = [window_key(card.pk), pending_key(card.pk), DIRTY_CARDS_KEY]
+    args = [to_cents(amount), starts['daily'].isoformat(), starts['monthly'].isoformat(),
+            _month_index(starts['daily']), card.pk]
+    for _ in range(3):
+        code, _, _ = _scripts['authorize'](keys=keys, args=args, client=client)
+        if code != WINDOW_MISSING:
+            return code
+        _seed_window(client, card, starts, tz_name)
+    raise RuntimeError(f"Could not load the spending window of card {card.pk}")
+
+
+def _authorize_in_database(card, amount):
+    from .models import VirtualCard
+
+    locked = VirtualCard.objects.select_for_update().get(pk=card.pk)
+    locked.roll_spending_periods()
+    allowed, message = locked.can_make_transaction(amount)
+    if not allowed:
+        return CardAuthorization(locked, amount, False, message, 'database')
+
+    locked.current_daily_spent += amount
+    locked.current_monthly_spent += amount
+    locked.save(update_fields=['current_daily_spent', 'current_monthly_spent', 'spending_day', 'spending_month'])
+    return CardAuthorization(locked, amount, True, "Transaction allowed", 'database')
+
+
+def authorize(card, amount):
+    """
+    Check a card's limits for a charge and count it if allowed.
+
+    On the database path this must run inside the caller's transaction (it locks the card row).
+
+    Returns:
+        CardAuthorization
+    """
+    from .spending_reset import cardholder_timezone, period_starts
+
+    amount = Decimal(amount)
+    if amount <= 0:
+        return CardAuthorization(card, amount, False, "Transaction amount must be positive", 'none')
+
+    client = get_client()
+    if client is not None:
+        try:
+            # The cached window carries the timezone; the profile is read only to seed it
+            tz_name = client.hget(window_key(card.pk), 'tz') or cardholder_timezone(card.user_id)
+            starts = period_starts(tz_name)
+            code = _authorize_in_redis(client, card, amount, starts, tz_name)
+            if code == APPROVED:
+                return CardAuthorization(card, amount, True, "Transaction allowed", 'redis', starts)
+            return CardAuthorization(card, amount, False, DENIAL_MESSAGES[code], 'redis', starts)
+        except Exception as e:
+            _trip(e)
+
+    # Saving the row drops any cached window once the caller commits
+    return _authorize_in_database(card, amount)
+
+
+def reconcile_card_spending(batch_size=RECONCILE_BATCH_SIZE):
+    """
+    Move spend counted in Redis onto the card rows.
+
+    Returns:
+        int: Cards updated
+    """
+    from .models import VirtualCard
+
+    client = get_client()
+    if client is None:
+        return 0
+
+    # Releases first, so their negative deltas join this run's pending spend
+    if not _replay_failed_releases(client):
+        return 0
+
+    total = 0
+    while True:
+        try:
+            card_ids = [int(card_id) for card_id in client.spop(DIRTY_CARDS_KEY, batch_size) or []]
+            if not card_ids:
+                break
+            pipe = client.pipeline(transaction=False)
+            for card_id in card_ids:
+                _scripts['take_pending'](keys=[pending_key(card_id), inflight_key(card_id)], client=pipe)
+            taken = dict(zip(card_ids, pipe.execute()))
+        except Exception as e:
+            _trip(e)
+            break
+
+        try:
+            with db_transaction.atomic():
+                cards = list(VirtualCard.objects.select_for_update().filter(pk__in=card_ids))
+                for card in cards:
+                    entries = taken.get(card.pk) or []
+                    for i in range(0, len(entries), 2):
+                        day, month = entries[i].split('|')
+                        _add_spend(card, date.fromisoformat(day), date.fromisoformat(month),
+                                   Decimal(int(entries[i + 1])) / 100)
+                VirtualCard.objects.bulk_update(
+                    cards, ['current_daily_spent', 'current_monthly_spent', 'spending_day', 'spending_month']
+                )
+        except Exception as e:
+            logger.error(f"Reconciling spend for {len(card_ids)} cards failed: {e}")
+            # In-flight deltas stay in Redis and are merged into the next run
+            try:
+                client.sadd(DIRTY_CARDS_KEY, *card_ids)
+            except Exception as redis_error:
+                _trip(redis_error)
+            break
+
+        total += len(cards)
+        try:
+            pipe = client.pipeline(transaction=False)
+            for card_id in card_ids:
+                pipe.delete(inflight_key(card_id))
+                pipe.incr(generation_key(card_id))
+            pipe.execute()
+        except Exception as e:
+            # The rows are committed; leftover in-flight deltas would be applied again
+            logger.error(f"Clearing reconciled spend for cards {card_ids} failed: {e}")
+            _trip(e)
+            break
+
+    if total:
+        logger.info(f"Reconciled card spending for {total} cards")
+    return total
+
+
+def _replay_failed_releases(client, batch_size=RELEASE_REPLAY_BATCH_SIZE):
+    """
+    Apply releases that could not reach Redis when their charge was rolled back.
+
+    Returns:
+        bool: False if Redis failed; the remaining rows wait for the next run
+    """
+    from .models import CardSpendRelease
+
+    while True:
+        with db_transaction.atomic():
+            releases = list(CardSpendRelease.objects.select_for_update(skip_locked=True)[:batch_size])
+            if not releases:
+                return True
+            released = []
+            try:
+                for release in releases:
+                    _release_in_redis(client, release.card_id, release.amount,
+                                      release.spending_day, release.spending_month)
+                    released.append(release.pk)
+            except Exception as e:
+                logger.error(f"Replaying failed card releases failed: {e}")
+                _trip(e)
+            # A crash between the Redis calls and this commit would replay these once more
+            CardSpendRelease.objects.filter(pk__in=released).delete()
+        if len(released) < len(releases):
+            return False
+
+
+def _add_spend(card, day, month, amount):
+    """Add spend from a cardholder-local day and month to a card's counters."""
+    if card.spending_day == day:
+        card.current_daily_spent = max(card.current_daily_spent + amount, Decimal('0'))
+    elif card.spending_day is None or day > card.spending_day:
+        card.current_daily_spent = max(amount, Decimal('0'))
+        card.spending_day = day
+    if card.spending_month == month:
+        card.current_monthly_spent = max(card.current_monthly_spent + amount, Decimal('0'))
+    elif card.spending_month is None or month > card.spending_month:
+        card.current_monthly_spent = max(amount, Decimal('0'))
+        card.spending_month = month
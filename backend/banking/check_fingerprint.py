@@ -0,0 +1,93 @@
+"""
+Perceptual fingerprints for check images.
+
+A difference hash (dHash) survives re-photographing, rescaling and small lighting
+changes, so the same paper check deposited twice yields hashes that differ in only
+a few bits even when the files are byte-for-byte different.
+
+Checks printed from the same template (a payroll run, a bank's counter checks)
+also hash within a bit or two of each other, and a finer hash does not separate
+them: the shared layout dominates, and re-photographing moves a 16x16 hash
+further than the handwriting does. An image match therefore only counts when the
+deposits also agree on the amount or the check number printed in the MICR line.
+"""
+from PIL import Image, ImageOps
+
+
+HASH_SIZE = 8  # 8x8 comparisons -> 64-bit hash, stored as 16 hex chars
+
+# Hashes this close (out of 64 bits) are treated as the same check image
+DUPLICATE_HAMMING_THRESHOLD = 10
+
+# CheckDeposit fields compared by shares_check_details()
+CHECK_DETAIL_FIELDS = ('amount', 'ocr_amount', 'check_number', 'ocr_check_number')
+
+
+def compute_dhash(image_file, hash_size=HASH_SIZE):
+    """
+    Compute the difference hash of an image.
+
+    Args:
+        image_file: Path or file-like object (e.g. an ImageField file)
+        hash_size (int): Hash width/height in bits
+
+    Returns:
+        str: Hex-encoded hash
+    """
+    with Image.open(image_file) as img:
+        img = ImageOps.exif_transpose(img)
+        small = img.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS)
+        pixels = list(small.getdata())
+
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+
+    return f'{bits:0{hash_size * hash_size // 4}x}'
+
+
+def hamming_distance(hash_a, hash_b):
+    """Number of differing bits between two hex hashes."""
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count('1')
+
+
+def is_similar(hash_a, hash_b, threshold=DUPLICATE_HAMMING_THRESHOLD):
+    if not hash_a or not hash_b:
+        return False
+    return hamming_distance(hash_a, hash_b) <= threshold
+
+
+def normalize_check_number(number):
+    """Check number as compared for duplicates: MICR numbers are zero-padded, typed ones usually are not."""
+    return (number or '').strip().lstrip('0')
+
+
+def check_details(deposit):
+    """
+    Amounts and check numbers a deposit claims or OCR read off the image.
+
+    Args:
+        deposit: CheckDeposit, or a dict of CHECK_DETAIL_FIELDS values
+
+    Returns:
+        set: ('amount', Decimal) and ('number', str) pairs
+    """
+    if not isinstance(deposit, dict):
+        deposit = {field: getattr(deposit, field) for field in CHECK_DETAIL_FIELDS}
+
+    details = set()
+    for field in ('amount', 'ocr_amount'):
+        if deposit.get(field) is not None:
+            details.add(('amount', deposit[field]))
+    for field in ('check_number', 'ocr_check_number'):
+        number = normalize_check_number(deposit.get(field))
+        if number:
+            details.add(('number', number))
+    return details
+
+
+def shares_check_details(details_a, details_b):
+    """True when two check_details() sets agree on an amount or a check number."""
+    return bool(details_a & details_b)
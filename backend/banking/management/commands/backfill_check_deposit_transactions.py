@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from banking.models import CheckDeposit
+from transactions.models import Transaction
+
+
+class Command(BaseCommand):
+    help = 'Link existing check deposits to the pending transaction created for them on submission'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Deposits processed per database transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Report matches without saving them')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        linked = 0
+        unmatched = 0
+        last_id = 0
+
+        while True:
+            deposits = list(
+                CheckDeposit.objects.filter(ledger_transaction__isnull=True, id__gt=last_id)
+                .order_by('id')[:batch_size]
+            )
+            if not deposits:
+                break
+            last_id = deposits[-1].id
+
+            with transaction.atomic():
+                for deposit in deposits:
+                    txn = self.find_transaction(deposit)
+                    if txn is None:
+                        unmatched += 1
+                        continue
+
+                    linked += 1
+                    if not dry_run:
+                        CheckDeposit.objects.filter(pk=deposit.pk).update(ledger_transaction=txn)
+
+        prefix = '[dry run] ' if dry_run else ''
+        self.stdout.write(self.style.SUCCESS(f'{prefix}Linked {linked} check deposit(s); {unmatched} without a matching transaction'))
+
+    def find_transaction(self, deposit):
+        """Legacy match used before deposits stored the link: same user, amount and check number."""
+        check_ref = f"Check #{deposit.check_number}" if deposit.check_number else "Check #Pending"
+        candidates = Transaction.objects.filter(
+            user_id=deposit.user_id,
+            transaction_type='deposit',
+            amount=deposit.amount,
+            description__contains=check_ref,
+            check_deposit__isnull=True,  # Not already claimed by another deposit
+        )
+
+        # Repeated amounts are disambiguated by picking the row created closest after the deposit
+        return (
+            candidates.filter(created_at__gte=deposit.created_at).order_by('created_at').first()
+            or candidates.order_by('-created_at').first()
+        )
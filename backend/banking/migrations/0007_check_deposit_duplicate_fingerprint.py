@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0006_alter_checkdeposit_back_image'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkdeposit',
+            name='duplicate_checked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='checkdeposit',
+            name='front_image_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='checkdeposit',
+            index=models.Index(fields=['user', 'check_number', 'created_at'], name='check_dep_user_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='checkdeposit',
+            index=models.Index(condition=models.Q(('duplicate_checked_at__isnull', True), ('status', 'pending')), fields=['created_at'], name='check_dep_unchecked_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0007_check_deposit_duplicate_fingerprint'),
+        ('transactions', '0005_alter_bill_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkdeposit',
+            name='ledger_transaction',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='check_deposit', to='transactions.transaction'),
+        ),
+    ]
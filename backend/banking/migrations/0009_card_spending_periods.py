@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:05
+
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils import timezone
+
+
+def set_current_spending_periods(apps, schema_editor):
+    """
+    Stamp existing counters with the cardholder's current local day and month.
+
+    Without this every card starts with no period, and the first reset run would
+    zero counters that belong to today.
+    """
+    VirtualCard = apps.get_model('banking', 'VirtualCard')
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+
+    now = timezone.now()
+    names = set(UserProfile.objects.filter(user__virtual_cards__isnull=False).values_list('timezone', flat=True))
+    valid = set()
+    for name in names:
+        try:
+            if name and ZoneInfo(name).key == name:
+                valid.add(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+
+    # Cards of users without a profile, or with an unknown zone, use UTC
+    groups = {name: Q(user__profile__timezone=name) for name in valid}
+    groups['UTC'] = groups.get('UTC', Q(pk__in=[])) | ~Q(user__profile__timezone__in=valid)
+    for name, holders in groups.items():
+        today = timezone.localtime(now, ZoneInfo(name)).date()
+        VirtualCard.objects.filter(holders).update(spending_day=today, spending_month=today.replace(day=1))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_bitcoin_activity_indexes'),
+        ('banking', '0008_checkdeposit_ledger_transaction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='virtualcard',
+            name='spending_day',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='virtualcard',
+            name='spending_month',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='CardSpendingReset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('daily', 'Daily'), ('monthly', 'Monthly')], max_length=10)),
+                ('period_start', models.DateField()),
+                ('cards_reset', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'card_spending_resets',
+                'ordering': ['-period_start', 'period'],
+                'constraints': [models.UniqueConstraint(fields=('period', 'period_start'), name='unique_card_spending_reset')],
+            },
+        ),
+        migrations.RunPython(set_current_spending_periods, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0009_card_spending_periods'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardSpendRelease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('spending_day', models.DateField()),
+                ('spending_month', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='failed_releases', to='banking.virtualcard')),
+            ],
+            options={
+                'db_table': 'card_spend_releases',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
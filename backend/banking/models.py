@@ -163,6 +163,9 @@ class VirtualCard(models.Model):
     monthly_limit = models.DecimalField(max_digits=10, decimal_places=2, default=10000.00)
     current_daily_spent = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     current_monthly_spent = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    # Cardholder-local day and month (first day) the spending counters belong to
+    spending_day = models.DateField(null=True, blank=True)
+    spending_month = models.DateField(null=True, blank=True)
     is_default = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -196,6 +199,11 @@ class VirtualCard(models.Model):
             VirtualCard.objects.filter(user=self.user, is_default=True).exclude(pk=self.pk).update(is_default=False)
         
         super().save(*args, **kwargs)
+        
+        # Cached authorization windows hold the status, limits and counters
+        from .card_authorization import invalidate_card_windows
+        card_id = self.pk
+        transaction.on_commit(lambda: invalidate_card_windows([card_id]))
     
     @staticmethod
     def _hash_field(value):
@@ -258,6 +266,23 @@ class VirtualCard(models.Model):
         """Return masked card number for display."""
         return f"**** **** **** {self.card_number[-4:]}"
     
+    def roll_spending_periods(self, now=None):
+        """
+        Zero counters left over from an earlier day or month in the cardholder's timezone.
+        
+        Only changes the instance; returns the fields to save.
+        """
+        from .spending_reset import SPENDING_PERIODS, cardholder_timezone, period_starts
+        
+        starts = period_starts(cardholder_timezone(self.user_id), now)
+        changed = []
+        for period, (counter_field, period_field) in SPENDING_PERIODS.items():
+            if getattr(self, period_field) != starts[period]:
+                setattr(self, counter_field, 0)
+                setattr(self, period_field, starts[period])
+                changed += [counter_field, period_field]
+        return changed
+    
     def reset_daily_spending(self):
         """Reset daily spending counter."""
         self.current_daily_spent = 0
@@ -279,6 +304,54 @@ class VirtualCard(models.Model):
         return self.status == 'active' and not self.is_expired()
 
 
+class CardSpendingReset(models.Model):
+    """Cards whose spending counters were reset for one local day or month (see banking.spending_reset)."""
+    
+    PERIODS = [
+        ('daily', 'Daily'),
+        ('monthly', 'Monthly'),
+    ]
+    
+    period = models.CharField(max_length=10, choices=PERIODS)
+    period_start = models.DateField()  # Local day, or first day of the local month
+    cards_reset = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'card_spending_resets'
+        ordering = ['-period_start', 'period']
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'period_start'], name='unique_card_spending_reset'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_period_display()} card spending reset {self.period_start} ({self.cards_reset} cards)"
+
+
+class CardSpendRelease(models.Model):
+    """
+    A rolled-back card charge whose release could not reach Redis.
+
+    ``reconcile_card_spending`` replays it against the spending window and
+    pending deltas, then deletes the row (see banking.card_authorization).
+    """
+    
+    card = models.ForeignKey(VirtualCard, on_delete=models.CASCADE, related_name='failed_releases')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    # Cardholder-local day and month (first day) the charge was counted against
+    spending_day = models.DateField()
+    spending_month = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'card_spend_releases'
+        ordering = ['created_at']
+    
+    def __str__(self):
+        return f"Release of {self.amount} on card {self.card_id} ({self.spending_day})"
+
+
 class Transfer(models.Model):
     """Model for money transfers between users."""
     
@@ -720,6 +793,19 @@ class CheckDeposit(models.Model):
     ocr_check_number = models.CharField(max_length=50, blank=True)
     ocr_confidence = models.FloatField(default=0.0)
     
+    # Ledger row created on submission and settled on completion/rejection
+    ledger_transaction = models.OneToOneField(
+        'transactions.Transaction',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='check_deposit'
+    )
+    
+    # Duplicate detection
+    front_image_hash = models.CharField(max_length=16, blank=True, db_index=True)  # Perceptual hash (dHash)
+    duplicate_checked_at = models.DateTimeField(null=True, blank=True)
+    
     # Status and approval
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     admin_notes = models.TextField(blank=True)
@@ -746,44 +832,58 @@ class CheckDeposit(models.Model):
     class Meta:
         db_table = 'check_deposits'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'check_number', 'created_at'], name='check_dep_user_number_idx'),
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(status='pending', duplicate_checked_at__isnull=True),
+                name='check_dep_unchecked_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"Check deposit ${self.amount} - {self.user.email} ({self.status})"
     
     def save(self, *args, **kwargs):
         is_new = self.pk is None
-        super().save(*args, **kwargs)
         
-        # Create transaction record when check deposit is first created
-        if is_new:
+        if not is_new:
+            super().save(*args, **kwargs)
+        else:
+            # Create the pending transaction record together with the deposit and link it
             from transactions.models import Transaction
             payer_info = f" from {self.payer_name}" if self.payer_name else ""
-            Transaction.objects.create(
-                user=self.user,
-                transaction_type='deposit',
-                amount=self.amount,
-                status='pending',
-                description=f"Check deposit{payer_info} - Check #{self.check_number or 'Pending'}",
-                balance_before=self.user.balance,
-                balance_after=self.user.balance,
-                merchant_name=self.payer_name or "Check Deposit",
-            )
-            
-            # Trigger async tasks for new deposits
-            try:
-                from .tasks import validate_check_image_quality, detect_duplicate_checks, send_check_deposit_email_notification
-                # Validate image quality
-                validate_check_image_quality.delay(self.id)
-                # Check for duplicates
-                detect_duplicate_checks.delay()
-                # Send email notification
-                send_check_deposit_email_notification.delay(self.id, 'submitted')
-            except Exception:
-                logger.exception(
-                    f"Failed to schedule Celery tasks for check deposit {self.id}. "
-                    "Tasks: validate_check_image_quality, detect_duplicate_checks, send_check_deposit_email_notification. "
-                    "Celery might not be running in development."
+            with transaction.atomic():
+                self.ledger_transaction = Transaction.objects.create(
+                    user=self.user,
+                    transaction_type='deposit',
+                    amount=self.amount,
+                    status='pending',
+                    description=f"Check deposit{payer_info} - Check #{self.check_number or 'Pending'}",
+                    balance_before=self.user.balance,
+                    balance_after=self.user.balance,
+                    merchant_name=self.payer_name or "Check Deposit",
                 )
+                super().save(*args, **kwargs)
+            
+            # Trigger async tasks for new deposits once the row is visible to workers
+            transaction.on_commit(self._schedule_submission_tasks)
+    
+    def _schedule_submission_tasks(self):
+        try:
+            from .tasks import validate_check_image_quality, check_deposit_for_duplicates, send_check_deposit_email_notification
+            # Validate image quality
+            validate_check_image_quality.delay(self.id)
+            # Check this deposit for duplicates
+            check_deposit_for_duplicates.delay(self.id)
+            # Send email notification
+            send_check_deposit_email_notification.delay(self.id, 'submitted')
+        except Exception:
+            logger.exception(
+                f"Failed to schedule Celery tasks for check deposit {self.id}. "
+                "Tasks: validate_check_image_quality, check_deposit_for_duplicates, send_check_deposit_email_notification. "
+                "Celery might not be running in development."
+            )
     
     def approve(self, admin_user, hold_days=1, notes=""):
         """Approve check deposit and set hold period."""
@@ -824,17 +924,13 @@ class CheckDeposit(models.Model):
         
         # Update transaction status to failed
         from transactions.models import Transaction
-        transaction = Transaction.objects.filter(
-            user=self.user,
-            transaction_type='deposit',
-            description__contains=f"Check #{self.check_number}" if self.check_number else "Check #Pending",
-            amount=self.amount,
-            status='pending'
-        ).first()
-        
-        if transaction:
-            transaction.status = 'failed'
-            transaction.save()
+        if self.ledger_transaction_id:
+            Transaction.objects.filter(pk=self.ledger_transaction_id).update(
+                status='failed',
+                updated_at=timezone.now()
+            )
+            from api.dashboard import invalidate_dashboard
+            transaction.on_commit(lambda: invalidate_dashboard(self.user_id))
         
         # Temporarily disable save to avoid recursion
         super(CheckDeposit, self).save(update_fields=['status', 'admin_approved_by', 'admin_approved_at', 'admin_notes'])
@@ -883,32 +979,27 @@ class CheckDeposit(models.Model):
                 user.refresh_from_db()
                 self.user = user
                 
-                # Update existing transaction record
+                # Update the linked transaction record by primary key
                 from transactions.models import Transaction
                 payer_info = f" from {self.payer_name}" if self.payer_name else ""
                 check_desc = f"Check deposit{payer_info} - Check #{self.check_number or 'Pending'}"
+                now = timezone.now()
                 
-                # Try to find the pending transaction (it might have the old description format)
-                txn = Transaction.objects.filter(
-                    user=self.user,
-                    transaction_type='deposit',
-                    status='pending',
-                    amount=self.amount
-                ).filter(
-                    description__contains=f"Check #{self.check_number}" if self.check_number else "Check #Pending"
-                ).first()
+                updated = 0
+                if self.ledger_transaction_id:
+                    updated = Transaction.objects.filter(pk=self.ledger_transaction_id).update(
+                        status='completed',
+                        description=check_desc,  # Update description with payer name
+                        balance_before=balance_before,
+                        balance_after=balance_after,
+                        completed_at=now,
+                        merchant_name=self.payer_name or "Check Deposit",
+                        updated_at=now
+                    )
                 
-                if txn:
-                    txn.status = 'completed'
-                    txn.description = check_desc  # Update description with payer name
-                    txn.balance_before = balance_before
-                    txn.balance_after = balance_after
-                    txn.completed_at = timezone.now()
-                    txn.merchant_name = self.payer_name or "Check Deposit"
-                    txn.save()
-                else:
-                    # Fallback: create new transaction if not found
-                    Transaction.objects.create(
+                if not updated:
+                    # Fallback: create new transaction if none is linked
+                    self.ledger_transaction = Transaction.objects.create(
                         user=self.user,
                         transaction_type='deposit',
                         amount=self.amount,
@@ -916,20 +1007,24 @@ class CheckDeposit(models.Model):
                         description=check_desc,
                         balance_before=balance_before,
                         balance_after=balance_after,
-                        completed_at=timezone.now(),
+                        completed_at=now,
                         merchant_name=self.payer_name or "Check Deposit",
                     )
                 
                 self.status = 'completed'
-                self.completed_at = timezone.now()
+                self.completed_at = now
                 
                 # Temporarily disable save to avoid recursion
-                super(CheckDeposit, self).save(update_fields=['status', 'completed_at'])
+                super(CheckDeposit, self).save(update_fields=['status', 'completed_at', 'ledger_transaction'])
                 
         except Exception as e:
             logger.exception(f"Failed to complete check deposit {self.id}: {str(e)}")
             return False, f"Failed to complete deposit: {str(e)}"
         
+        # Balance and ledger were changed with update(), which skips post_save
+        from api.dashboard import invalidate_dashboard
+        transaction.on_commit(lambda: invalidate_dashboard(self.user_id))
+        
         # Send real-time notifications
         from utils.realtime import notify_check_deposit_update, notify_balance_update, send_notification
         notify_check_deposit_update(self.user.id, self.id, self.status, self.amount)
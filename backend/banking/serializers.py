@@ -56,6 +56,7 @@ class TransferSerializer(serializers.ModelSerializer):
     class Meta:
         model = Transfer
         fields = '__all__'
+        select_related = ['sender', 'recipient']
         
     def get_sender_name(self, obj):
         return f"{obj.sender.first_name or ''} {obj.sender.last_name or ''}".strip()
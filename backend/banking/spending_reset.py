@@ -0,0 +1,110 @@
+"""
+Rollover of virtual card spending counters.
+
+``current_daily_spent`` and ``current_monthly_spent`` belong to a day and a month
+in the cardholder's timezone (``UserProfile.timezone``, UTC when unset). Each card
+stores the period its counters belong to in ``spending_day`` and
+``spending_month``.
+
+``reset_spending_counters`` runs from Celery beat. At any instant every timezone
+falls on one of at most three local dates, so each period needs at most three
+set-based UPDATEs:
+
+    UPDATE virtual_cards SET current_daily_spent = 0, spending_day = <local date>
+    WHERE <cardholder timezone on that date> AND spending_day IS DISTINCT FROM <local date>
+
+The ``spending_day`` guard makes reruns and retries no-ops. The per-day totals
+are recorded in ``CardSpendingReset``. The charge path rolls a card over itself
+(``VirtualCard.roll_spending_periods``), so a charge made just after local
+midnight, before the job runs, is never counted against the previous day.
+"""
+import logging
+from collections import defaultdict
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db import transaction as db_transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+# Period -> (counter field, period field)
+SPENDING_PERIODS = {
+    'daily': ('current_daily_spent', 'spending_day'),
+    'monthly': ('current_monthly_spent', 'spending_month'),
+}
+
+DEFAULT_TIMEZONE = 'UTC'
+
+
+def get_zone(name):
+    try:
+        return ZoneInfo(name or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+
+def period_starts(tz_name, now=None):
+    """Current local day and first day of the local month for a timezone."""
+    today = timezone.localtime(now or timezone.now(), get_zone(tz_name)).date()
+    return {'daily': today, 'monthly': today.replace(day=1)}
+
+
+def cardholder_timezone(user_id):
+    from accounts.models import UserProfile
+    return UserProfile.objects.filter(user_id=user_id).values_list('timezone', flat=True).first() or DEFAULT_TIMEZONE
+
+
+def _timezone_groups(now):
+    """Map each period's current local start date to the cardholder filter for it."""
+    from accounts.models import UserProfile
+
+    names = set(
+        UserProfile.objects.filter(user__virtual_cards__isnull=False)
+        .values_list('timezone', flat=True).distinct()
+    )
+    names.add(DEFAULT_TIMEZONE)
+
+    # Cards of users without a profile, or with an unknown zone, use UTC
+    valid = {name for name in names if name and get_zone(name).key == name}
+    groups = {period: defaultdict(Q) for period in SPENDING_PERIODS}
+    for name in valid:
+        holders = Q(user__profile__timezone=name)
+        if name == DEFAULT_TIMEZONE:
+            holders |= ~Q(user__profile__timezone__in=valid)
+        for period, start in period_starts(name, now).items():
+            groups[period][start] |= holders
+    return groups
+
+
+def reset_spending_counters(now=None):
+    """
+    Zero every card counter whose period has ended in the cardholder's timezone.
+
+    Safe to run any number of times; cards already on the current period are not touched.
+
+    Returns:
+        dict: Cards reset per period
+    """
+    from .models import CardSpendingReset, VirtualCard
+
+    now = now or timezone.now()
+    groups = _timezone_groups(now)
+
+    touched = {}
+    for period, (counter_field, period_field) in SPENDING_PERIODS.items():
+        touched[period] = 0
+        for start, holders in groups[period].items():
+            with db_transaction.atomic():
+                count = VirtualCard.objects.filter(holders).filter(
+                    Q(**{f'{period_field}__isnull': True}) | ~Q(**{period_field: start})
+                ).update(**{counter_field: 0, period_field: start})
+                if count:
+                    record, _ = CardSpendingReset.objects.get_or_create(period=period, period_start=start)
+                    CardSpendingReset.objects.filter(pk=record.pk).update(cards_reset=F('cards_reset') + count)
+            touched[period] += count
+
+    if any(touched.values()):
+        logger.info(f"Reset card spending counters: {touched}")
+    return touched
@@ -48,55 +48,132 @@ def process_expired_check_holds():
     }
 
 
+# Deposits from the same user within this many days are compared
+DUPLICATE_WINDOW_DAYS = 30
+# Upper bound on deposits re-checked per sweep run
+DUPLICATE_SWEEP_BATCH_SIZE = 500
+
+
 @shared_task
-def detect_duplicate_checks():
+def check_deposit_for_duplicates(deposit_id):
     """
-    Detect potential duplicate check deposits.
-    Checks for deposits with same check number from same user within 30 days.
+    Check a single deposit for duplicates.
+    Matches the same check number from the same user within 30 days, and front images
+    whose perceptual hash is close to one of the user's recent deposits or identical
+    to another user's deposit. Image matches must also share the amount or check
+    number, so different checks printed from the same template are not flagged.
     """
     from datetime import timedelta
+    from .check_fingerprint import (
+        CHECK_DETAIL_FIELDS, check_details, compute_dhash, is_similar, normalize_check_number, shares_check_details,
+    )
+    
+    try:
+        deposit = CheckDeposit.objects.get(id=deposit_id)
+    except CheckDeposit.DoesNotExist:
+        logger.error(f"Deposit {deposit_id} not found for duplicate check")
+        return {'error': 'Deposit not found'}
     
-    thirty_days_ago = timezone.now() - timedelta(days=30)
+    update_fields = ['duplicate_checked_at']
     
-    # Get all pending deposits
-    pending_deposits = CheckDeposit.objects.filter(
-        status='pending',
-        check_number__isnull=False
-    ).exclude(check_number='')
+    # Fingerprint the front image once; stored for future comparisons
+    if not deposit.front_image_hash and deposit.front_image:
+        try:
+            deposit.front_image_hash = compute_dhash(deposit.front_image)
+            update_fields.append('front_image_hash')
+        except Exception as e:
+            logger.warning(f"Could not fingerprint front image for deposit {deposit_id}: {str(e)}")
     
-    duplicates_found = []
+    candidates = CheckDeposit.objects.filter(
+        user_id=deposit.user_id,
+        created_at__gte=deposit.created_at - timedelta(days=DUPLICATE_WINDOW_DAYS)
+    ).exclude(id=deposit.id).exclude(status='rejected')
+    
+    findings = []
     
-    for deposit in pending_deposits:
-        # Look for other deposits with same check number from same user
-        potential_duplicates = CheckDeposit.objects.filter(
-            user=deposit.user,
-            check_number=deposit.check_number,
-            created_at__gte=thirty_days_ago
-        ).exclude(id=deposit.id).exclude(status='rejected')
+    check_number = normalize_check_number(deposit.check_number)
+    if check_number:
+        same_number_count = sum(
+            1 for other in candidates.exclude(check_number='').values_list('check_number', flat=True)
+            if normalize_check_number(other) == check_number
+        )
+        if same_number_count:
+            findings.append(
+                f"Found {same_number_count} other deposit(s) with same check number from this user in last {DUPLICATE_WINDOW_DAYS} days."
+            )
+    
+    if deposit.front_image_hash:
+        details = check_details(deposit)
+        similar_ids = [
+            other['id'] for other in candidates.exclude(front_image_hash='').values('id', 'front_image_hash', *CHECK_DETAIL_FIELDS)
+            if is_similar(deposit.front_image_hash, other['front_image_hash'])
+            and shares_check_details(details, check_details(other))
+        ]
+        if similar_ids:
+            findings.append(
+                f"Front image closely matches this user's deposit(s) {', '.join(f'#{pk}' for pk in similar_ids)}."
+            )
         
-        if potential_duplicates.exists():
-            duplicates_found.append({
-                'deposit_id': deposit.id,
-                'user_email': deposit.user.email,
-                'check_number': deposit.check_number,
-                'amount': str(deposit.amount),
-                'duplicate_count': potential_duplicates.count()
-            })
-            
-            # Add admin note (preserve existing notes)
-            existing_notes = deposit.admin_notes or ""
-            duplicate_note = f"⚠️ POTENTIAL DUPLICATE: Found {potential_duplicates.count()} other deposit(s) with same check number from this user in last 30 days."
-            
-            if existing_notes:
-                deposit.admin_notes = f"{existing_notes}\n\n{duplicate_note}"
-            else:
-                deposit.admin_notes = duplicate_note
-            
-            deposit.save(update_fields=['admin_notes'])
-            
-            logger.warning(f"Duplicate check detected: Deposit {deposit.id}, Check #{deposit.check_number}")
+        # Same image submitted from a different account (indexed exact-hash lookup)
+        other_user_ids = [
+            other['id'] for other in
+            CheckDeposit.objects.filter(front_image_hash=deposit.front_image_hash)
+            .exclude(user_id=deposit.user_id)
+            .exclude(status='rejected')
+            .order_by('-created_at')
+            .values('id', *CHECK_DETAIL_FIELDS)[:200]
+            if shares_check_details(details, check_details(other))
+        ][:10]
+        if other_user_ids:
+            findings.append(
+                f"Front image is identical to deposit(s) {', '.join(f'#{pk}' for pk in other_user_ids)} from another account."
+            )
+    
+    if findings:
+        # Add admin note (preserve existing notes)
+        duplicate_note = "⚠️ POTENTIAL DUPLICATE: " + " ".join(findings)
+        if deposit.admin_notes:
+            deposit.admin_notes = f"{deposit.admin_notes}\n\n{duplicate_note}"
+        else:
+            deposit.admin_notes = duplicate_note
+        update_fields.append('admin_notes')
+        
+        logger.warning(f"Duplicate check detected: Deposit {deposit.id}, Check #{deposit.check_number}")
+    
+    deposit.duplicate_checked_at = timezone.now()
+    deposit.save(update_fields=update_fields)
+    
+    return {
+        'deposit_id': deposit.id,
+        'duplicate': bool(findings),
+        'check_number': deposit.check_number,
+        'amount': str(deposit.amount),
+        'findings': findings
+    }
+
+
+@shared_task
+def detect_duplicate_checks():
+    """
+    Safety net for the per-deposit duplicate check.
+    Only picks up pending deposits that were never checked (e.g. Celery was down
+    when they were submitted), so each run is cheap.
+    """
+    unchecked_ids = list(
+        CheckDeposit.objects.filter(
+            status='pending',
+            duplicate_checked_at__isnull=True
+        ).order_by('created_at').values_list('id', flat=True)[:DUPLICATE_SWEEP_BATCH_SIZE]
+    )
+    
+    duplicates_found = []
+    for deposit_id in unchecked_ids:
+        result = check_deposit_for_duplicates(deposit_id)
+        if result.get('duplicate'):
+            duplicates_found.append(result)
     
     return {
+        'checked': len(unchecked_ids),
         'duplicates_found': len(duplicates_found),
         'details': duplicates_found
     }
@@ -286,3 +363,25 @@ def auto_approve_pending_transfers():
             logger.error(f"Exception during auto-approval of transfer {transfer.id}: {str(e)}")
             
     return f"Auto-approved {count} transfers"
+
+
+@shared_task
+def reset_card_spending_counters():
+    """
+    Zero virtual card daily/monthly spending counters whose period has ended in the cardholder's timezone.
+    Runs every 15 minutes so every UTC offset is picked up shortly after local midnight.
+    """
+    from .spending_reset import reset_spending_counters
+    
+    return reset_spending_counters()
+
+
+@shared_task
+def reconcile_card_spending():
+    """
+    Write card spend authorized in Redis to the virtual card counters.
+    Runs every minute; does nothing when the Redis fast path is off.
+    """
+    from .card_authorization import reconcile_card_spending as reconcile
+    
+    return {'cards': reconcile()}
@@ -1,3 +1,185 @@
-from django.test import TestCase
+import io
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest.mock import patch
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from PIL import Image, ImageDraw, ImageEnhance
+
+from accounts.models import UserProfile
+from transactions.models import Transaction
+
+from .card_authorization import CardAuthorization
+from .models import CardSpendingReset, CardSpendRelease, CheckDeposit, VirtualCard
+from .spending_reset import reset_spending_counters
+from .tasks import check_deposit_for_duplicates
+
+User = get_user_model()
+
+
+@override_settings(CARD_AUTH_REDIS_URL='')
+class CardReleaseTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='holder', email='holder@example.com', password=None)
+        self.card = VirtualCard.objects.create(user=user, expiry_month=12, expiry_year=2031)
+        self.starts = {'daily': date(2026, 10, 19), 'monthly': date(2026, 10, 1)}
+
+    def test_release_without_redis_is_queued_for_reconcile(self):
+        authorization = CardAuthorization(self.card, Decimal('42.50'), True, "Transaction allowed", 'redis', self.starts)
+        authorization.release()
+
+        release = CardSpendRelease.objects.get()
+        self.assertEqual((release.card_id, release.amount), (self.card.pk, Decimal('42.50')))
+        self.assertEqual((release.spending_day, release.spending_month), (self.starts['daily'], self.starts['monthly']))
+
+    def test_denied_and_database_path_charges_are_not_queued(self):
+        CardAuthorization(self.card, Decimal('10'), False, "Daily spending limit exceeded", 'redis', self.starts).release()
+        CardAuthorization(self.card, Decimal('10'), True, "Transaction allowed", 'database').release()
+        self.assertFalse(CardSpendRelease.objects.exists())
+
+
+
+class SpendingResetTests(TestCase):
+
+    def setUp(self):
+        self.cards = {}
+        for name, tz in (('tokyo', 'Asia/Tokyo'), ('new_york', 'America/New_York'), ('utc', None)):
+            user = User.objects.create_user(username=name, email=f'{name}@example.com', password=None)
+            if tz:
+                UserProfile.objects.create(user=user, timezone=tz)
+            self.cards[name] = VirtualCard.objects.create(
+                user=user, expiry_month=12, expiry_year=2031, current_daily_spent=Decimal('50.00'),
+                current_monthly_spent=Decimal('400.00'), spending_day=date(2026, 10, 31), spending_month=date(2026, 10, 1)
+            )
+
+    def daily_spent(self):
+        return {name: VirtualCard.objects.get(pk=card.pk).current_daily_spent for name, card in self.cards.items()}
+
+    def test_each_card_resets_once_after_its_local_midnight(self):
+        # 16:00 UTC on Oct 31 is already Nov 1 in Tokyo, and still Oct 31 in New York
+        now = datetime(2026, 10, 31, 16, 0, tzinfo=dt_timezone.utc)
+        self.assertEqual(reset_spending_counters(now), {'daily': 1, 'monthly': 1})
+        self.assertEqual(self.daily_spent(), {'tokyo': 0, 'new_york': Decimal('50.00'), 'utc': Decimal('50.00')})
+        self.assertEqual(reset_spending_counters(now), {'daily': 0, 'monthly': 0})
+
+        # 05:00 UTC on Nov 1: midnight has passed in New York (01:00) and UTC too
+        later = datetime(2026, 11, 1, 5, 0, tzinfo=dt_timezone.utc)
+        self.assertEqual(reset_spending_counters(later), {'daily': 2, 'monthly': 2})
+        self.assertEqual(reset_spending_counters(later), {'daily': 0, 'monthly': 0})
+        self.assertEqual(set(self.daily_spent().values()), {0})
+
+        tokyo = VirtualCard.objects.get(pk=self.cards['tokyo'].pk)
+        self.assertEqual((tokyo.spending_day, tokyo.spending_month), (date(2026, 11, 1), date(2026, 11, 1)))
+        self.assertEqual(CardSpendingReset.objects.get(period='daily', period_start=date(2026, 11, 1)).cards_reset, 3)
+
+
+def check_image(payee, amount, number):
+    """A check printed from one fixed payroll template."""
+    img = Image.new('RGB', (1200, 540), (236, 242, 230))
+    draw = ImageDraw.Draw(img)
+    for x in range(0, 1200, 24):
+        draw.line([(x, 0), (x + 300, 540)], fill=(222, 232, 216), width=3)
+    draw.rectangle([20, 20, 1180, 520], outline=(60, 90, 60), width=6)
+    draw.rectangle([40, 40, 420, 130], fill=(60, 90, 60))
+    draw.text((60, 70), 'ACME PAYROLL SERVICES', fill=(255, 255, 255))
+    draw.line([(150, 250), (900, 250)], fill=(40, 40, 40), width=2)
+    draw.rectangle([930, 210, 1140, 270], outline=(40, 40, 40), width=2)
+    draw.line([(60, 340), (900, 340)], fill=(40, 40, 40), width=2)
+    draw.text((160, 228), payee, fill=(10, 10, 80))
+    draw.text((950, 232), amount, fill=(10, 10, 80))
+    draw.text((1040, 60), f'No. {number}', fill=(20, 20, 20))
+    draw.text((80, 470), f'A021000021A 000123456789C {number:06d}', fill=(20, 20, 20))
+    return img
+
+
+def rephotographed(img):
+    return ImageEnhance.Brightness(img.resize((900, 405))).enhance(1.08)
+
+
+@override_settings(STORAGES={**settings.STORAGES, 'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'}})
+class CheckDuplicateTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='holder', email='holder@example.com', password=None)
+        self.first = self.deposit(check_image('Jane Doe', '1,250.00', 1001), Decimal('1250.00'), '1001')
+
+    def deposit(self, img, amount, check_number, user=None, ocr_check_number=None):
+        buf = io.BytesIO()
+        img.save(buf, 'JPEG', quality=85)
+        name = default_storage.save('check_deposits/front/check.jpg', ContentFile(buf.getvalue()))
+        # bulk_create skips save(), which would queue the real tasks
+        deposit, = CheckDeposit.objects.bulk_create([CheckDeposit(
+            user=user or self.user, amount=amount, check_number=check_number, front_image=name,
+            ocr_check_number=f'{int(check_number):06d}' if ocr_check_number is None else ocr_check_number
+        )])
+        check_deposit_for_duplicates(deposit.pk)
+        deposit.refresh_from_db()
+        return deposit
+
+    def test_different_checks_on_the_same_template_are_not_flagged(self):
+        second = self.deposit(check_image('Jane Doe', '980.40', 1002), Decimal('980.40'), '1002')
+        self.assertTrue(second.front_image_hash)
+        self.assertNotIn('POTENTIAL DUPLICATE', second.admin_notes)
+
+        coworker = User.objects.create_user(username='coworker', email='coworker@example.com', password=None)
+        third = self.deposit(check_image('John Smith', '1,250.00', 1003), Decimal('1250.00'), '1003', coworker)
+        self.assertNotIn('POTENTIAL DUPLICATE', third.admin_notes)
+
+    def test_rephotographed_check_is_flagged(self):
+        # No check number typed or read, so only the image and amount tie it to the first deposit
+        again = self.deposit(
+            rephotographed(check_image('Jane Doe', '1,250.00', 1001)), Decimal('1250.00'), '', ocr_check_number=''
+        )
+        self.assertIn(f'#{self.first.pk}', again.admin_notes)
+
+    def test_zero_padded_check_number_matches(self):
+        again = self.deposit(check_image('Jane Doe', '75.00', 9), Decimal('75.00'), '0001001', ocr_check_number='')
+        self.assertIn('same check number', again.admin_notes)
+
+    def test_tasks_are_queued_after_commit(self):
+        with patch('banking.tasks.check_deposit_for_duplicates.delay') as check_duplicates, \
+                patch('banking.tasks.validate_check_image_quality.delay'), \
+                patch('banking.tasks.send_check_deposit_email_notification.delay'):
+            with self.captureOnCommitCallbacks(execute=True):
+                deposit = CheckDeposit.objects.create(user=self.user, amount=Decimal('40.00'), front_image='checks/front.jpg')
+                check_duplicates.assert_not_called()
+        check_duplicates.assert_called_once_with(deposit.pk)
+
+
+@patch('banking.tasks.send_check_deposit_email_notification.delay')
+class CheckLedgerTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='holder', email='holder@example.com', password=None)
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password=None, is_staff=True)
+
+    def deposit(self, check_number):
+        # Same amount and payer, so only the link tells the ledger rows apart
+        deposit = CheckDeposit.objects.create(
+            user=self.user, amount=Decimal('300.00'), check_number=check_number,
+            payer_name='Acme Payroll', front_image='checks/front.jpg'
+        )
+        deposit.approve(self.admin, hold_days=0)
+        return deposit
+
+    def test_deposit_is_linked_to_a_pending_transaction(self, send_email):
+        deposit = self.deposit('501')
+        self.assertEqual(deposit.ledger_transaction.status, 'pending')
+        self.assertEqual(deposit.ledger_transaction.amount, Decimal('300.00'))
+
+    def test_complete_and_reject_settle_their_own_transaction(self, send_email):
+        first, second = self.deposit('501'), self.deposit('502')
+
+        second.reject(self.admin, 'Unreadable')
+        self.assertEqual(first.complete(bypass_hold=True), (True, 'Check deposit completed'))
+
+        self.assertEqual(Transaction.objects.get(pk=first.ledger_transaction_id).status, 'completed')
+        self.assertEqual(Transaction.objects.get(pk=second.ledger_transaction_id).status, 'failed')
+        self.assertEqual(Transaction.objects.count(), 2)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.balance, Decimal('300.00'))
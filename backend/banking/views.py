@@ -23,6 +23,7 @@ from admin_api.serializers import (
 )
 
 from .transfer_services import ACHTransferService, WireTransferService, TransferFeeService
+from utils.query_planning import QueryPlanMixin
 from utils.realtime import notify_transfer_update, notify_balance_update, send_notification
 
 logger = logging.getLogger(__name__)
@@ -262,7 +263,7 @@ class AdminCardApplicationViewSet(ModelViewSet):
 
 
 # Keep existing Transfer, BankAccount, and DirectDeposit views
-class TransferListView(generics.ListCreateAPIView):
+class TransferListView(QueryPlanMixin, generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = TransferSerializer
     
@@ -360,7 +361,7 @@ class TransferListView(generics.ListCreateAPIView):
             logger.error(f"Failed to create failed transfer audit record: {str(e)}")
 
 
-class TransferDetailView(generics.RetrieveAPIView):
+class TransferDetailView(QueryPlanMixin, generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = TransferSerializer
     
@@ -0,0 +1,185 @@
+"""
+Unified Bitcoin activity feed.
+
+Merges the user's incoming and outgoing wallet transactions, currency swaps and
+account-level Bitcoin transactions with a single ``UNION ALL`` query, so the
+database sorts and limits the combined history. Each branch is served by a
+(user, created_at) or (user, updated_at) index.
+
+Two keyset modes:
+
+* history: newest first, paged with an opaque ``cursor``
+* polling: rows created or changed after a ``since`` token, oldest change first,
+  so the wallet screen only fetches deltas
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Case, CharField, DecimalField, F, Q, Value, When
+from django.utils.dateparse import parse_datetime
+
+from accounts.models import BitcoinTransaction
+from .models import IncomingBitcoinTransaction, OutgoingBitcoinTransaction, CurrencySwap
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Output column -> annotation alias; every branch annotates the same aliases in
+# the same order so the UNION columns line up.
+COLUMNS = (
+    ('id', 'activity_id'),
+    ('kind', 'activity_kind'),
+    ('direction', 'activity_direction'),
+    ('amount_btc', 'activity_btc'),
+    ('amount_usd', 'activity_usd'),
+    ('status', 'activity_status'),
+    ('counterparty', 'activity_counterparty'),
+    ('reference', 'activity_reference'),
+    ('created_at', 'activity_created'),
+    ('updated_at', 'activity_updated'),
+)
+
+_text = CharField()
+_amount = DecimalField(max_digits=20, decimal_places=8)
+
+
+def _branches(user):
+    """(kind, queryset annotated with the activity columns) per source table."""
+    swap_in = Q(swap_type='usd_to_btc')
+    return [
+        ('incoming', IncomingBitcoinTransaction.objects.filter(user=user).annotate(
+            activity_id=F('id'),
+            activity_kind=Value('incoming', output_field=_text),
+            activity_direction=Value('in', output_field=_text),
+            activity_btc=F('amount_btc'),
+            activity_usd=F('amount_usd'),
+            activity_status=F('status'),
+            activity_counterparty=F('sender_address'),
+            activity_reference=F('transaction_hash'),
+            activity_created=F('created_at'),
+            activity_updated=F('updated_at'),
+        )),
+        ('outgoing', OutgoingBitcoinTransaction.objects.filter(user=user).annotate(
+            activity_id=F('id'),
+            activity_kind=Value('outgoing', output_field=_text),
+            activity_direction=Value('out', output_field=_text),
+            activity_btc=F('amount_btc'),
+            activity_usd=F('amount_usd'),
+            activity_status=F('status'),
+            activity_counterparty=F('recipient_wallet_address'),
+            activity_reference=F('transaction_hash'),
+            activity_created=F('created_at'),
+            activity_updated=F('updated_at'),
+        )),
+        ('swap', CurrencySwap.objects.filter(user=user).annotate(
+            activity_id=F('id'),
+            activity_kind=Value('swap', output_field=_text),
+            activity_direction=Case(When(swap_in, then=Value('in')), default=Value('out'), output_field=_text),
+            activity_btc=Case(When(swap_in, then=F('amount_to')), default=F('amount_from'), output_field=_amount),
+            activity_usd=Case(When(swap_in, then=F('amount_from')), default=F('amount_to'), output_field=_amount),
+            activity_status=F('status'),
+            activity_counterparty=Value('', output_field=_text),
+            activity_reference=F('transaction_id'),
+            activity_created=F('created_at'),
+            activity_updated=F('updated_at'),
+        )),
+        ('transfer', BitcoinTransaction.objects.filter(user=user).annotate(
+            activity_id=F('id'),
+            activity_kind=Value('transfer', output_field=_text),
+            activity_direction=Case(
+                When(transaction_type='send', then=Value('out')), default=Value('in'), output_field=_text
+            ),
+            activity_btc=F('amount_btc'),
+            activity_usd=F('amount_usd'),
+            activity_status=F('status'),
+            activity_counterparty=F('recipient_wallet_address'),
+            activity_reference=F('blockchain_tx_id'),
+            activity_created=F('created_at'),
+            activity_updated=F('updated_at'),
+        )),
+    ]
+
+
+def encode_position(timestamp, kind, pk):
+    return base64.urlsafe_b64encode(f'{timestamp.isoformat()}|{kind}|{pk}'.encode()).decode()
+
+
+def decode_position(token):
+    """
+    Decode a cursor or since token. A bare ISO timestamp is accepted as a since value.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    timestamp = parse_datetime(token)
+    if timestamp is not None:
+        return timestamp, '', 0
+    try:
+        raw_timestamp, kind, pk = base64.urlsafe_b64decode(token.encode()).decode().split('|')
+        return datetime.fromisoformat(raw_timestamp), kind, int(pk)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+def _after(field, kind, position, descending):
+    """Rows of one branch strictly past ``position`` in (field, kind, id) order."""
+    timestamp, position_kind, position_id = position
+    past, same = (f'{field}__lt', 'id__lt') if descending else (f'{field}__gt', 'id__gt')
+    if kind == position_kind:
+        return Q(**{past: timestamp}) | Q(**{field: timestamp, same: position_id})
+    if (kind < position_kind) == descending:
+        # Every row at the same timestamp sorts past the position
+        return Q(**{past: timestamp}) | Q(**{field: timestamp})
+    return Q(**{past: timestamp})
+
+
+def _row(values):
+    return {name: values[alias] for name, alias in COLUMNS}
+
+
+def get_activity_page(user, cursor=None, since=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    One page of the user's Bitcoin activity.
+
+    Args:
+        cursor (str): ``next_cursor`` from a previous history page
+        since (str): ``next_since`` from a previous response (or an ISO timestamp);
+            switches to polling mode
+        limit (int): Page size, capped at MAX_PAGE_SIZE
+
+    Returns:
+        dict: results, has_more, and next_cursor (history) or next_since (polling)
+
+    Raises:
+        ValueError: If the cursor or since token is malformed
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    polling = since is not None
+    position = decode_position(since if polling else cursor) if (since or cursor) else None
+    field = 'updated_at' if polling else 'created_at'
+
+    queries = []
+    for kind, queryset in _branches(user):
+        if position is not None:
+            queryset = queryset.filter(_after(field, kind, position, descending=not polling))
+        queries.append(queryset.order_by().values(*[alias for _, alias in COLUMNS]))
+
+    sort_alias = 'activity_updated' if polling else 'activity_created'
+    ordering = (sort_alias, 'activity_kind', 'activity_id')
+    if not polling:
+        ordering = tuple(f'-{alias}' for alias in ordering)
+    combined = queries[0].union(*queries[1:], all=True).order_by(*ordering)
+
+    rows = [_row(values) for values in combined[:limit + 1]]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    page = {'results': rows, 'has_more': has_more}
+    if polling:
+        last = rows[-1] if rows else None
+        page['next_since'] = encode_position(last['updated_at'], last['kind'], last['id']) if last else since
+    else:
+        last = rows[-1] if rows and has_more else None
+        page['next_cursor'] = encode_position(last['created_at'], last['kind'], last['id']) if last else None
+    return page
@@ -0,0 +1,230 @@
+"""
+Background confirmation tracking for incoming Bitcoin deposits.
+
+``poll_confirmations`` claims the deposits that are due for a check, looks up all
+their hashes with batched chain-backend calls, stores the new confirmation counts
+and schedules each deposit's next check by how far it is from the threshold:
+
+* not seen on chain yet: exponential backoff from 1 minute up to 1 hour
+* in the mempool (0 confirmations): every 2 minutes
+* confirming: roughly when the remaining blocks could have been mined (5-30 min)
+
+Deposits that reach ``required_confirmations`` are completed automatically when
+``BITCOIN_AUTO_COMPLETE_DEPOSITS`` is on.
+
+The chain backend is set by ``BITCOIN_CHAIN_BACKEND`` (a dotted path); tests can
+point it at ``FakeChainBackend``.
+"""
+import logging
+from collections import namedtuple
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import transaction as db_transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+TxStatus = namedtuple('TxStatus', ['confirmations', 'block_height'])
+
+# Deposits in these states are still tracked
+TRACKED_STATUSES = ('pending', 'confirmed')
+
+BLOCK_INTERVAL_SECONDS = 600
+MEMPOOL_CHECK_SECONDS = 120
+MIN_CONFIRMING_CHECK_SECONDS = 300
+MAX_CONFIRMING_CHECK_SECONDS = 1800
+NOT_FOUND_BASE_SECONDS = 60
+NOT_FOUND_MAX_SECONDS = 3600
+
+# Columns poll_confirmations writes back from its claimed rows
+POLLER_FIELDS = ['confirmation_count', 'block_height', 'next_confirmation_check_at', 'confirmation_checks']
+
+# How long a claimed batch is hidden from other pollers while it is being checked
+CLAIM_LEASE_SECONDS = 300
+
+
+class ChainBackend:
+    """Looks up confirmation counts for many transactions at once."""
+
+    def get_statuses(self, tx_hashes):
+        """
+        Returns:
+            dict: tx hash -> TxStatus for every hash the chain knows about
+        """
+        raise NotImplementedError
+
+
+class BlockCypherBackend(ChainBackend):
+    """BlockCypher batch lookups (``/txs/h1;h2;...``)."""
+
+    API_URL = 'https://api.blockcypher.com/v1/btc/main'
+    BATCH_SIZE = 25
+
+    def __init__(self, token=None, timeout=10):
+        from accounts.services import BitcoinService
+        self.token = token if token is not None else BitcoinService.BLOCKCYPHER_TOKEN
+        self.timeout = timeout
+
+    def get_statuses(self, tx_hashes):
+        tx_hashes = list(tx_hashes)
+        statuses = {}
+        for start in range(0, len(tx_hashes), self.BATCH_SIZE):
+            batch = tx_hashes[start:start + self.BATCH_SIZE]
+            params = {'limit': 1}
+            if self.token:
+                params['token'] = self.token
+            try:
+                response = requests.get(f"{self.API_URL}/txs/{';'.join(batch)}", params=params, timeout=self.timeout)
+                response.raise_for_status()
+            except Exception as e:
+                logger.error(f"BlockCypher batch lookup of {len(batch)} transactions failed: {e}")
+                continue
+
+            results = response.json()
+            if isinstance(results, dict):
+                results = [results]
+            for tx in results:
+                if 'hash' in tx and 'error' not in tx:
+                    statuses[tx['hash']] = TxStatus(tx.get('confirmations', 0), tx.get('block_height'))
+        return statuses
+
+
+class FakeChainBackend(ChainBackend):
+    """
+    In-memory chain for tests and local development.
+
+    Shared across instances so a test can drive the same chain the poller reads::
+
+        chain = FakeChainBackend()
+        chain.broadcast('abc')
+        chain.mine(3)
+    """
+
+    _mempool = set()
+    _included = {}  # tx hash -> block height
+    _height = 0
+
+    @classmethod
+    def reset(cls):
+        cls._mempool = set()
+        cls._included = {}
+        cls._height = 0
+
+    @classmethod
+    def broadcast(cls, tx_hash):
+        cls._mempool.add(tx_hash)
+
+    @classmethod
+    def mine(cls, blocks=1):
+        """Mine blocks; the first one includes everything in the mempool."""
+        for _ in range(blocks):
+            cls._height += 1
+            for tx_hash in cls._mempool:
+                cls._included[tx_hash] = cls._height
+            cls._mempool = set()
+
+    def get_statuses(self, tx_hashes):
+        statuses = {}
+        for tx_hash in tx_hashes:
+            if tx_hash in self._included:
+                height = self._included[tx_hash]
+                statuses[tx_hash] = TxStatus(self._height - height + 1, height)
+            elif tx_hash in self._mempool:
+                statuses[tx_hash] = TxStatus(0, None)
+        return statuses
+
+
+def get_chain_backend():
+    return import_string(settings.BITCOIN_CHAIN_BACKEND)()
+
+
+def next_check_delay(deposit, status):
+    """Seconds until a deposit should be checked again."""
+    if status is None:
+        return min(NOT_FOUND_BASE_SECONDS * 2 ** min(deposit.confirmation_checks, 10), NOT_FOUND_MAX_SECONDS)
+    if status.confirmations == 0:
+        return MEMPOOL_CHECK_SECONDS
+    remaining = deposit.required_confirmations - status.confirmations
+    return max(MIN_CONFIRMING_CHECK_SECONDS, min(BLOCK_INTERVAL_SECONDS * (remaining - 1), MAX_CONFIRMING_CHECK_SECONDS))
+
+
+def _claim_due(now, limit):
+    from .models import IncomingBitcoinTransaction
+
+    with db_transaction.atomic():
+        due = list(
+            IncomingBitcoinTransaction.objects.select_for_update(skip_locked=True)
+            .filter(status__in=TRACKED_STATUSES, next_confirmation_check_at__lte=now)
+            .order_by('next_confirmation_check_at')[:limit]
+        )
+        if due:
+            IncomingBitcoinTransaction.objects.filter(pk__in=[deposit.pk for deposit in due]).update(
+                next_confirmation_check_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS)
+            )
+    return due
+
+
+def poll_confirmations(backend=None, now=None, limit=500):
+    """
+    Check every deposit that is due and record the results.
+
+    Returns:
+        dict: checked, updated and completed counts
+    """
+    from .models import IncomingBitcoinTransaction
+
+    now = now or timezone.now()
+    deposits = _claim_due(now, limit)
+    if not deposits:
+        return {'checked': 0, 'updated': 0, 'completed': 0}
+
+    backend = backend or get_chain_backend()
+    statuses = backend.get_statuses([deposit.transaction_hash for deposit in deposits])
+
+    changed = []
+    promoted = []
+    for deposit in deposits:
+        status = statuses.get(deposit.transaction_hash)
+        deposit.next_confirmation_check_at = now + timedelta(seconds=next_check_delay(deposit, status))
+        deposit.confirmation_checks += 1
+
+        if status is not None and status.confirmations != deposit.confirmation_count:
+            deposit.confirmation_count = status.confirmations
+            deposit.block_height = status.block_height
+            changed.append(deposit.pk)
+            if deposit.status == 'pending' and status.confirmations > 0:
+                promoted.append(deposit.pk)
+
+    # Only the poller's own columns are written back. An admin may have completed
+    # or failed a deposit since it was claimed, so status only moves forward from
+    # what the row holds now.
+    with db_transaction.atomic():
+        IncomingBitcoinTransaction.objects.bulk_update(deposits, POLLER_FIELDS, batch_size=500)
+        if changed:
+            IncomingBitcoinTransaction.objects.filter(pk__in=changed).update(updated_at=now)
+        if promoted:
+            IncomingBitcoinTransaction.objects.filter(pk__in=promoted, status='pending').update(status='confirmed')
+
+    completed = 0
+    ready = [deposit for deposit in deposits if deposit.is_confirmed()]
+    if settings.BITCOIN_AUTO_COMPLETE_DEPOSITS and ready:
+        # Complete only what the row, not the claimed copy, says is confirmed
+        confirmed = set(
+            IncomingBitcoinTransaction.objects.filter(pk__in=[deposit.pk for deposit in ready], status='confirmed')
+            .values_list('pk', flat=True)
+        )
+        for deposit in ready:
+            if deposit.pk not in confirmed:
+                continue
+            deposit.status = 'confirmed'
+            try:
+                if deposit.mark_as_completed():
+                    completed += 1
+            except Exception as e:
+                logger.error(f"Auto-completing incoming Bitcoin transaction {deposit.pk} failed: {e}")
+
+    return {'checked': len(deposits), 'updated': len(changed), 'completed': completed}
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bitcoin_wallet', '0004_alter_outgoingbitcointransaction_transaction_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='currencyswap',
+            index=models.Index(fields=['user', '-created_at'], name='btc_swap_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='currencyswap',
+            index=models.Index(fields=['user', 'updated_at'], name='btc_swap_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='incomingbitcointransaction',
+            index=models.Index(fields=['user', '-created_at'], name='btc_in_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='incomingbitcointransaction',
+            index=models.Index(fields=['user', 'updated_at'], name='btc_in_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outgoingbitcointransaction',
+            index=models.Index(fields=['user', '-created_at'], name='btc_out_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outgoingbitcointransaction',
+            index=models.Index(fields=['user', 'updated_at'], name='btc_out_user_updated_idx'),
+        ),
+    ]
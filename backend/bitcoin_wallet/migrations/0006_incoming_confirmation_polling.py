@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:57
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bitcoin_wallet', '0005_bitcoin_activity_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='incomingbitcointransaction',
+            name='confirmation_checks',
+            field=models.PositiveIntegerField(default=0, help_text='Number of times the poller has checked this transaction'),
+        ),
+        migrations.AddField(
+            model_name='incomingbitcointransaction',
+            name='next_confirmation_check_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='When the confirmation poller next checks this transaction'),
+        ),
+        migrations.AddIndex(
+            model_name='incomingbitcointransaction',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'confirmed'])), fields=['next_confirmation_check_at'], name='btc_in_due_check_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from django.core.validators import FileExtensionValidator
 import os
 import uuid
@@ -63,6 +64,10 @@ class IncomingBitcoinTransaction(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     
+    # Confirmation polling (see bitcoin_wallet/confirmations.py)
+    next_confirmation_check_at = models.DateTimeField(default=timezone.now, help_text="When the confirmation poller next checks this transaction")
+    confirmation_checks = models.PositiveIntegerField(default=0, help_text="Number of times the poller has checked this transaction")
+    
     # Admin notes
     admin_notes = models.TextField(blank=True, help_text="Admin notes about this transaction")
     is_manually_approved = models.BooleanField(default=False, help_text="Whether admin manually approved this transaction")
@@ -71,6 +76,15 @@ class IncomingBitcoinTransaction(models.Model):
         verbose_name = "Incoming Bitcoin Transaction"
         verbose_name_plural = "Incoming Bitcoin Transactions"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='btc_in_user_created_idx'),
+            models.Index(fields=['user', 'updated_at'], name='btc_in_user_updated_idx'),
+            models.Index(
+                fields=['next_confirmation_check_at'],
+                name='btc_in_due_check_idx',
+                condition=models.Q(status__in=['pending', 'confirmed'])
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.amount_btc} BTC - {self.status}"
@@ -85,37 +99,42 @@ class IncomingBitcoinTransaction(models.Model):
 
     def mark_as_completed(self):
         """Mark transaction as completed and update user's Bitcoin balance"""
-        if self.can_be_completed():
-            from django.utils import timezone
-            self.status = 'completed'
-            self.completed_at = timezone.now()
-            self.save()
-            
-            # Update user's Bitcoin balance
-            try:
-                bitcoin_balance = self.user.bitcoin_balance
-                bitcoin_balance.balance += self.amount_btc
-                bitcoin_balance.save()
-            except:
-                # Create Bitcoin balance if it doesn't exist
-                from accounts.models import BitcoinBalance
-                BitcoinBalance.objects.create(
-                    user=self.user,
-                    balance=self.amount_btc
-                )
-            
-            # Send real-time notification
-            from utils.realtime import notify_bitcoin_transaction, send_notification
-            notify_bitcoin_transaction(self.user.id, self.id, self.status, 'incoming')
-            send_notification(
-                self.user.id,
-                'Bitcoin Received',
-                f'Received {self.amount_btc} BTC (${self.amount_usd}) from {self.sender_address[:12]}...',
-                'success'
+        if not self.can_be_completed():
+            return False
+        
+        from django.db import transaction as db_transaction
+        from django.db.models import F
+        from django.contrib.auth import get_user_model
+        from api.dashboard import invalidate_dashboard
+        
+        now = timezone.now()
+        with db_transaction.atomic():
+            # Conditional update so a deposit is credited once even if the admin
+            # action and the confirmation poller race
+            claimed = IncomingBitcoinTransaction.objects.filter(pk=self.pk, status='confirmed').update(
+                status='completed', completed_at=now, updated_at=now
             )
-            
-            return True
-        return False
+            if not claimed:
+                return False
+            get_user_model().objects.filter(pk=self.user_id).update(
+                bitcoin_balance=F('bitcoin_balance') + self.amount_btc
+            )
+        self.status = 'completed'
+        self.completed_at = now
+        self.updated_at = now
+        db_transaction.on_commit(lambda: invalidate_dashboard(self.user_id))
+        
+        # Send real-time notification
+        from utils.realtime import notify_bitcoin_transaction, send_notification
+        notify_bitcoin_transaction(self.user_id, self.id, self.status, 'incoming')
+        send_notification(
+            self.user_id,
+            'Bitcoin Received',
+            f'Received {self.amount_btc} BTC (${self.amount_usd}) from {self.sender_address[:12]}...',
+            'success'
+        )
+        
+        return True
 
 class OutgoingBitcoinTransaction(models.Model):
     """Model for tracking outgoing Bitcoin transactions (sending Bitcoin)"""
@@ -151,6 +170,10 @@ class OutgoingBitcoinTransaction(models.Model):
         verbose_name = "Outgoing Bitcoin Transaction"
         verbose_name_plural = "Outgoing Bitcoin Transactions"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='btc_out_user_created_idx'),
+            models.Index(fields=['user', 'updated_at'], name='btc_out_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} -> {self.recipient_wallet_address[:10]}... - {self.amount_btc} BTC - {self.status}"
@@ -273,6 +296,10 @@ class CurrencySwap(models.Model):
         verbose_name_plural = "Currency Swaps"
         db_table = 'wallet_currency_swaps'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='btc_swap_user_created_idx'),
+            models.Index(fields=['user', 'updated_at'], name='btc_swap_user_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.get_swap_type_display()} - {self.status}"
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import BitcoinWallet, IncomingBitcoinTransaction, OutgoingBitcoinTransaction, CurrencySwap
+from utils.bitcoin_address import is_valid_address
 
 
 class BitcoinWalletSerializer(serializers.ModelSerializer):
@@ -15,6 +16,8 @@ class BitcoinWalletSerializer(serializers.ModelSerializer):
             'is_active', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+        # get_qr_code_url falls back to user.bitcoin_qr_code, stored in cold_data
+        select_related = ['user__cold_data']
 
     def get_qr_code_url(self, obj):
         """Get the URL for the QR code image"""
@@ -155,7 +158,7 @@ class OutgoingBitcoinTransactionCreateSerializer(serializers.ModelSerializer):
         
         # Validate recipient address
         recipient_address = data.get('recipient_wallet_address', '')
-        if len(recipient_address) < 26 or len(recipient_address) > 62:
+        if not is_valid_address(recipient_address):
             raise serializers.ValidationError("Invalid Bitcoin address format")
         
         return data
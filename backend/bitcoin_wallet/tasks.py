@@ -0,0 +1,24 @@
+"""
+Celery tasks for Bitcoin wallet operations
+"""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def poll_bitcoin_confirmations():
+    """
+    Update confirmation counts for incoming deposits that are due for a check.
+    Runs every minute; deposits that reach their threshold are auto-completed.
+    """
+    from .confirmations import poll_confirmations
+    
+    result = poll_confirmations()
+    if result['checked']:
+        logger.info(
+            f"Checked {result['checked']} incoming Bitcoin transactions: "
+            f"{result['updated']} updated, {result['completed']} completed"
+        )
+    return result
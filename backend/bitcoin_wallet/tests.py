@@ -0,0 +1,274 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import BitcoinTransaction
+from utils.bitcoin_address import validate_address
+
+from .activity import get_activity_page
+from .confirmations import FakeChainBackend, poll_confirmations
+from .models import BitcoinWallet, CurrencySwap, IncomingBitcoinTransaction, OutgoingBitcoinTransaction
+
+User = get_user_model()
+
+
+class AdminActionDuringLookup(FakeChainBackend):
+    """Runs an admin action on the deposit while the chain lookup is in flight."""
+
+    def __init__(self, action):
+        self.action = action
+
+    def get_statuses(self, tx_hashes):
+        self.action()
+        return super().get_statuses(tx_hashes)
+
+
+@override_settings(BITCOIN_AUTO_COMPLETE_DEPOSITS=True)
+class ConfirmationPollerTests(TestCase):
+
+    def setUp(self):
+        FakeChainBackend.reset()
+        self.chain = FakeChainBackend()
+        self.user = User.objects.create_user(
+            username='holder', email='holder@example.com', password=None, bitcoin_balance=Decimal('0')
+        )
+        self.deposit = IncomingBitcoinTransaction.objects.create(
+            user=self.user, transaction_hash='a' * 64, amount_btc=Decimal('0.50000000'),
+            amount_usd=Decimal('30000.00'), sender_address='bc1qsender'
+        )
+        self.now = timezone.now()
+
+    def poll(self, backend=None):
+        # Every row is due on each poll
+        self.now += timedelta(hours=2)
+        return poll_confirmations(backend=backend or self.chain, now=self.now)
+
+    def balance(self):
+        return User.objects.get(pk=self.user.pk).bitcoin_balance
+
+    def test_deposit_moves_through_mempool_confirmations_and_completion(self):
+        self.poll()
+        self.deposit.refresh_from_db()
+        self.assertEqual(self.deposit.status, 'pending')
+        self.assertEqual(self.deposit.confirmation_checks, 1)
+
+        self.chain.broadcast(self.deposit.transaction_hash)
+        self.poll()
+        self.deposit.refresh_from_db()
+        self.assertEqual((self.deposit.status, self.deposit.confirmation_count), ('pending', 0))
+
+        self.chain.mine(1)
+        self.poll()
+        self.deposit.refresh_from_db()
+        self.assertEqual((self.deposit.status, self.deposit.confirmation_count), ('confirmed', 1))
+
+        self.chain.mine(2)
+        result = self.poll()
+        self.deposit.refresh_from_db()
+        self.assertEqual(result['completed'], 1)
+        self.assertEqual(self.deposit.status, 'completed')
+        self.assertEqual(self.balance(), Decimal('0.50000000'))
+
+        # Further blocks and polls do not credit again
+        self.chain.mine(5)
+        self.poll()
+        self.assertEqual(self.balance(), Decimal('0.50000000'))
+
+    def test_unseen_deposit_backs_off(self):
+        self.poll()
+        self.deposit.refresh_from_db()
+        first_delay = self.deposit.next_confirmation_check_at - self.now
+        self.poll()
+        self.deposit.refresh_from_db()
+        self.assertGreater(self.deposit.next_confirmation_check_at - self.now, first_delay)
+
+    def test_admin_completion_during_lookup_is_credited_once(self):
+        self.chain.broadcast(self.deposit.transaction_hash)
+        self.chain.mine(1)
+        self.poll()
+
+        def admin_completes():
+            deposit = IncomingBitcoinTransaction.objects.get(pk=self.deposit.pk)
+            deposit.confirmation_count = deposit.required_confirmations
+            deposit.save()
+            self.assertTrue(deposit.mark_as_completed())
+
+        self.chain.mine(2)
+        result = self.poll(AdminActionDuringLookup(admin_completes))
+        self.deposit.refresh_from_db()
+        self.assertEqual(result['completed'], 0)
+        self.assertEqual(self.deposit.status, 'completed')
+        self.assertEqual(self.balance(), Decimal('0.50000000'))
+
+    def test_admin_failure_during_lookup_is_not_undone(self):
+        self.chain.broadcast(self.deposit.transaction_hash)
+
+        def admin_fails():
+            IncomingBitcoinTransaction.objects.filter(pk=self.deposit.pk).update(status='failed')
+
+        self.chain.mine(3)
+        result = self.poll(AdminActionDuringLookup(admin_fails))
+        self.deposit.refresh_from_db()
+        self.assertEqual(result['completed'], 0)
+        self.assertEqual(self.deposit.status, 'failed')
+        self.assertEqual(self.deposit.confirmation_count, 3)
+        self.assertEqual(self.balance(), Decimal('0'))
+
+
+class WalletListQueryTests(TestCase):
+
+    def setUp(self):
+        admin = User.objects.create_user(username='admin', email='admin@example.com', password=None, is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def add_wallet(self):
+        n = BitcoinWallet.objects.count()
+        user = User.objects.create_user(username=f'holder{n}', email=f'holder{n}@example.com', password=None)
+        user.bitcoin_qr_code = f'https://example.com/qr/{n}.png'
+        user.save()
+        return BitcoinWallet.objects.create(user=user, wallet_address=f'bc1qwallet{n}')
+
+    def list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin-bitcoin-wallet-list'))
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_qr_codes_from_cold_data_do_not_add_queries_per_wallet(self):
+        self.add_wallet()
+        _, one_wallet = self.list_queries()
+        self.add_wallet()
+        self.add_wallet()
+        response, three_wallets = self.list_queries()
+
+        self.assertEqual(three_wallets, one_wallet)
+        rows = response.data['results'] if isinstance(response.data, dict) else response.data
+        self.assertEqual(sorted(row['qr_code_url'] for row in rows), [f'https://example.com/qr/{n}.png' for n in range(3)])
+
+
+# BIP350 valid test vectors (superseding BIP173 for witness v1+), plus Base58Check
+VALID_ADDRESSES = [
+    ('BC1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T4', 'mainnet', 'p2wpkh'),
+    ('tb1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3q0sl5k7', 'testnet', 'p2wsh'),
+    ('bc1pw508d6qejxtdg4y5r3zarvary0c5xw7kw508d6qejxtdg4y5r3zarvary0c5xw7kt5nd6y', 'mainnet', 'witness_v1'),
+    ('BC1SW50QGDZ25J', 'mainnet', 'witness_v16'),
+    ('bc1zw508d6qejxtdg4y5r3zarvaryvaxxpcs', 'mainnet', 'witness_v2'),
+    ('tb1qqqqqp399et2xygdj5xreqhjjvcmzhxw4aywxecjdzew6hylgvsesrxh6hy', 'testnet', 'p2wsh'),
+    ('tb1pqqqqp399et2xygdj5xreqhjjvcmzhxw4aywxecjdzew6hylgvsesf3hn0c', 'testnet', 'p2tr'),
+    ('bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj0', 'mainnet', 'p2tr'),
+    ('1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN2', 'mainnet', 'p2pkh'),
+    ('1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa', 'mainnet', 'p2pkh'),
+    ('3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy', 'mainnet', 'p2sh'),
+    ('mipcBbFg9gMiCh81Kj8tqqdgoZub1ZJRfn', 'testnet', 'p2pkh'),
+    ('2MzQwSSnBHWHqSAqtTVQ6v47XtaisrJa1Vc', 'testnet', 'p2sh'),
+]
+
+INVALID_ADDRESSES = [
+    'tc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vq5zuyut',  # unknown human-readable part
+    'bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqh2y7hd',  # v1 with a Bech32 checksum
+    'tb1z0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqglt7rf',  # v2 with a Bech32 checksum
+    'BC1S0XLXVLHEMJA6C4DQV22UAPCTQUPFHLXM9H8Z3K2E72Q4K9HCZ7VQ54WELL',  # v16 with a Bech32 checksum
+    'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kemeawh',  # v0 with a Bech32m checksum
+    'tb1q0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vq24jc47',  # v0 with a Bech32m checksum
+    'bc1p38j9r5y49hruaue7wxjce0updqjuyyx0kh56v8s25huc6995vvpql3jow4',  # invalid character
+    'BC130XLXVLHEMJA6C4DQV22UAPCTQUPFHLXM9H8Z3K2E72Q4K9HCZ7VQ7ZWS8R',  # witness version 17
+    'bc1pw5dgrnzv',  # 1-byte program
+    'bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7v8n0nx0muaewav253zgeav',  # 41-byte program
+    'BC1QR508D6QEJXTDG4Y5R3ZARVARYV98GJ9P',  # 16-byte v0 program
+    'tb1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vq47Zagq',  # mixed case
+    'bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7v07qwwzcrf',  # more than 4 padding bits
+    'tb1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vpggkg4j',  # non-zero padding
+    'bc1gmk9yu',  # empty data part
+    '1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN3',  # Base58Check checksum
+    '1BvBMSEYstWetqTFn5Au4m4GFg7xJaNVN0',  # '0' is not in the Base58 alphabet
+    '',
+]
+
+
+class AddressValidationTests(SimpleTestCase):
+
+    def test_valid_addresses(self):
+        for address, network, script_type in VALID_ADDRESSES:
+            with self.subTest(address=address):
+                self.assertEqual(tuple(validate_address(address)), (True, network, script_type))
+
+    def test_invalid_addresses(self):
+        for address in INVALID_ADDRESSES:
+            with self.subTest(address=address):
+                self.assertFalse(validate_address(address).valid)
+
+    def test_network_must_match_when_required(self):
+        self.assertTrue(validate_address('3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy', network='mainnet').valid)
+        self.assertFalse(validate_address('3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy', network='testnet').valid)
+        self.assertFalse(validate_address('tb1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3q0sl5k7', network='mainnet').valid)
+
+
+class ActivityFeedTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='holder', email='holder@example.com', password=None)
+        btc, usd = Decimal('0.01000000'), Decimal('600.00')
+        # Two rows of every kind, all created at the same instant, plus an older deposit
+        for n in range(2):
+            IncomingBitcoinTransaction.objects.bulk_create([IncomingBitcoinTransaction(
+                user=self.user, transaction_hash=f'in{n}', amount_btc=btc, amount_usd=usd, sender_address='bc1qsender'
+            )])
+            OutgoingBitcoinTransaction.objects.bulk_create([OutgoingBitcoinTransaction(
+                user=self.user, recipient_wallet_address='bc1qrecipient', amount_btc=btc, amount_usd=usd,
+                bitcoin_price_at_time=usd, transaction_hash=f'out{n}'
+            )])
+            CurrencySwap.objects.bulk_create([CurrencySwap(
+                user=self.user, swap_type='usd_to_btc', amount_from=usd, amount_to=btc,
+                exchange_rate=usd, transaction_id=f'swap{n}'
+            )])
+            BitcoinTransaction.objects.bulk_create([BitcoinTransaction(
+                user=self.user, transaction_type='send', balance_source='fiat', amount_btc=btc, bitcoin_price_at_time=usd
+            )])
+        self.now = timezone.now()
+        for model in (IncomingBitcoinTransaction, OutgoingBitcoinTransaction, CurrencySwap, BitcoinTransaction):
+            model.objects.update(created_at=self.now, updated_at=self.now)
+        older = IncomingBitcoinTransaction.objects.create(
+            user=self.user, transaction_hash='older', amount_btc=btc, amount_usd=usd, sender_address='bc1qsender'
+        )
+        IncomingBitcoinTransaction.objects.filter(pk=older.pk).update(
+            created_at=self.now - timedelta(hours=1), updated_at=self.now - timedelta(hours=1)
+        )
+
+    def walk(self, limit, **start):
+        rows, page = [], get_activity_page(self.user, limit=limit, **start)
+        while True:
+            rows.extend((row['kind'], row['id']) for row in page['results'])
+            if 'next_since' in page:
+                if not page['results']:
+                    return rows
+                page = get_activity_page(self.user, since=page['next_since'], limit=limit)
+            elif page['next_cursor']:
+                page = get_activity_page(self.user, cursor=page['next_cursor'], limit=limit)
+            else:
+                return rows
+
+    def test_history_pages_split_a_shared_timestamp_without_gaps_or_repeats(self):
+        everything = self.walk(100)
+        self.assertEqual(len(everything), 9)
+        self.assertEqual(everything[-1][0], 'incoming')
+        # (created_at, kind, id) descending: kinds in reverse name order within the shared instant
+        self.assertEqual([kind for kind, _ in everything[:8]], ['transfer'] * 2 + ['swap'] * 2 + ['outgoing'] * 2 + ['incoming'] * 2)
+        for limit in (1, 2, 3):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.walk(limit), everything)
+
+    def test_polling_returns_each_change_once_in_order(self):
+        since = (self.now - timedelta(days=1)).isoformat()
+        everything = self.walk(100, since=since)
+        self.assertEqual(len(everything), 9)
+        for limit in (1, 3):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.walk(limit, since=since), everything)
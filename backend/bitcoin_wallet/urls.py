@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
-    BitcoinWalletViewSet, IncomingBitcoinTransactionViewSet, OutgoingBitcoinTransactionViewSet,
+    BitcoinActivityView, BitcoinWalletViewSet, IncomingBitcoinTransactionViewSet, OutgoingBitcoinTransactionViewSet,
     CurrencySwapViewSet, AdminBitcoinWalletViewSet, AdminIncomingBitcoinTransactionViewSet, 
     AdminCurrencySwapViewSet
 )
@@ -21,6 +21,7 @@ admin_router.register(r'swaps', AdminCurrencySwapViewSet, basename='admin-curren
 
 urlpatterns = [
     # User endpoints
+    path('activity/', BitcoinActivityView.as_view(), name='bitcoin-activity'),
     path('', include(user_router.urls)),
     
     # Admin endpoints
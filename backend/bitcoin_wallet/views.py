@@ -2,12 +2,14 @@ from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.core.cache import cache
 import requests
 import threading
 import time
+from utils.query_planning import QueryPlanMixin
 from .models import BitcoinWallet, IncomingBitcoinTransaction, OutgoingBitcoinTransaction, CurrencySwap
 from .serializers import (
     BitcoinWalletSerializer, BitcoinWalletCreateSerializer,
@@ -16,7 +18,32 @@ from .serializers import (
     OutgoingBitcoinTransactionCreateSerializer, CurrencySwapSerializer, CurrencySwapCreateSerializer
 )
 
-class BitcoinWalletViewSet(viewsets.ReadOnlyModelViewSet):
+class BitcoinActivityView(APIView):
+    """
+    Unified, cursor-paginated Bitcoin activity (incoming, outgoing, swaps, transfers).
+    
+    Query params: ``cursor`` (next page of history), ``since`` (changes after a
+    previous ``next_since``), ``page_size``.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        from .activity import get_activity_page, DEFAULT_PAGE_SIZE
+
+        try:
+            page_size = int(request.query_params.get('page_size', DEFAULT_PAGE_SIZE))
+            page = get_activity_page(
+                request.user,
+                cursor=request.query_params.get('cursor'),
+                since=request.query_params.get('since'),
+                limit=page_size
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(page)
+
+
+class BitcoinWalletViewSet(QueryPlanMixin, viewsets.ReadOnlyModelViewSet):
     queryset = BitcoinWallet.objects.all()
     serializer_class = BitcoinWalletSerializer
     permission_classes = [IsAuthenticated]
@@ -256,8 +283,12 @@ class CurrencySwapViewSet(viewsets.ModelViewSet):
         # Fallback only if absolutely everything fails
         # fallback_price = 95000.00 
         # return Response({'exchange_rate': fallback_price, 'warning': 'Using fallback price'})
+        return Response(
+            {'error': 'Exchange rate is temporarily unavailable'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
 
-class AdminBitcoinWalletViewSet(viewsets.ModelViewSet):
+class AdminBitcoinWalletViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """Admin ViewSet for managing Bitcoin wallets and transactions"""
     serializer_class = BitcoinWalletSerializer
     queryset = BitcoinWallet.objects.all()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Loan, LoanApplication
+from .models import Loan, LoanApplication, LoanPortfolioSnapshot, LoanSchedule
 
 
 @admin.register(Loan)
@@ -12,6 +12,22 @@ class LoanAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
 
 
+@admin.register(LoanSchedule)
+class LoanScheduleAdmin(admin.ModelAdmin):
+    list_display = ('loan', 'annual_rate', 'monthly_payment', 'paid_periods', 'engine', 'computed_at')
+    list_filter = ('engine',)
+    search_fields = ('loan__user__email',)
+    readonly_fields = ('principal_cents', 'interest_cents', 'computed_at')
+    raw_id_fields = ('loan',)
+
+
+@admin.register(LoanPortfolioSnapshot)
+class LoanPortfolioSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('as_of', 'active_loans', 'outstanding_balance', 'outstanding_principal', 'updated_at')
+    readonly_fields = ('by_type', 'delinquency', 'cash_flow', 'created_at', 'updated_at')
+    date_hierarchy = 'as_of'
+
+
 @admin.register(LoanApplication)
 class LoanApplicationAdmin(admin.ModelAdmin):
     list_display = ('user', 'loan_type', 'requested_amount', 'status', 'created_at')
@@ -0,0 +1,188 @@
+"""
+Loan analytics.
+
+Per-user figures come from a single conditional-aggregation query. Admin
+risk screens read ``LoanPortfolioSnapshot`` rows instead of scanning the loans
+table. ``take_portfolio_snapshot`` writes one row per day from the nightly
+task, with:
+
+* outstanding balance and principal by loan type
+* delinquency buckets (days past ``next_payment_date``, which moves a month
+  forward for each installment settled)
+* expected cash flow per month over the next ``CASH_FLOW_HORIZON_MONTHS``,
+  taken from the stored amortization schedules
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .amortization import CENT, from_cents, recompute_schedules, to_cents
+from .models import Loan, LoanPortfolioSnapshot, LoanSchedule
+
+logger = logging.getLogger(__name__)
+
+
+LOAN_TYPE_KEYS = [loan_type for loan_type, _ in Loan.LOAN_TYPES]
+
+# Bucket name -> (min, max) days past due; None is open-ended
+DELINQUENCY_BUCKETS = (
+    ('current', None, 0),
+    ('1_29', 1, 29),
+    ('30_59', 30, 59),
+    ('60_89', 60, 89),
+    ('90_plus', 90, None),
+)
+
+CASH_FLOW_HORIZON_MONTHS = 12
+
+
+def _money(value):
+    return str((value or Decimal('0')).quantize(CENT))
+
+
+def get_user_loan_analytics(user):
+    """Loan totals and per-type counts for one user in one query."""
+    active = Q(status='active')
+    aggregates = {
+        'total_loans': Count('id'),
+        'active_loans': Count('id', filter=active),
+        'total_borrowed': Sum('amount'),
+        'total_remaining': Sum('remaining_balance', filter=active),
+        'total_paid': Sum('total_paid'),
+        'monthly_payments': Sum('monthly_payment', filter=active),
+    }
+    for loan_type in LOAN_TYPE_KEYS:
+        aggregates[f'type_{loan_type}'] = Count('id', filter=Q(loan_type=loan_type))
+
+    totals = Loan.objects.filter(user=user).aggregate(**aggregates)
+    return {
+        'total_loans': totals['total_loans'],
+        'active_loans': totals['active_loans'],
+        'total_borrowed': _money(totals['total_borrowed']),
+        'total_remaining': _money(totals['total_remaining']),
+        'total_paid': _money(totals['total_paid']),
+        'monthly_payments': _money(totals['monthly_payments']),
+        'loan_types': [
+            {'loan_type': loan_type, 'count': totals[f'type_{loan_type}']}
+            for loan_type in LOAN_TYPE_KEYS
+            if totals[f'type_{loan_type}']
+        ],
+    }
+
+
+def _bucket_filter(as_of, min_days, max_days):
+    # Days past due = as_of - next_payment_date
+    conditions = Q()
+    if min_days is not None:
+        conditions &= Q(next_payment_date__lte=as_of - timedelta(days=min_days))
+    if max_days is not None:
+        conditions &= Q(next_payment_date__gte=as_of - timedelta(days=max_days))
+    return conditions
+
+
+def _month_index(day):
+    return day.year * 12 + day.month - 1
+
+
+def _month_label(index):
+    return f'{index // 12:04d}-{index % 12 + 1:02d}'
+
+
+def _aggregate_by_type(active_loans, as_of):
+    aggregates = {
+        'count': Count('id'),
+        'outstanding_balance': Sum('remaining_balance'),
+        'monthly_payments': Sum('monthly_payment'),
+    }
+    for bucket, min_days, max_days in DELINQUENCY_BUCKETS:
+        condition = _bucket_filter(as_of, min_days, max_days)
+        aggregates[f'{bucket}_count'] = Count('id', filter=condition)
+        aggregates[f'{bucket}_balance'] = Sum('remaining_balance', filter=condition)
+    return active_loans.order_by().values('loan_type').annotate(**aggregates)
+
+
+def _schedule_totals(as_of):
+    """Outstanding principal by type and expected cash flow by month, in cents."""
+    principal_by_type = defaultdict(int)
+    cash_flow = defaultdict(lambda: [0, 0])  # month offset -> [principal, interest]
+    start_month = _month_index(as_of)
+
+    rows = LoanSchedule.objects.filter(loan__status='active').values_list(
+        'loan__loan_type', 'loan__next_payment_date', 'opening_balance',
+        'principal_cents', 'interest_cents', 'paid_periods'
+    )
+    for loan_type, next_payment_date, opening_balance, principal, interest, paid in rows.iterator(chunk_size=2000):
+        principal_by_type[loan_type] += to_cents(opening_balance) - sum(principal[:paid])
+
+        # Overdue installments are expected in the current month
+        first_offset = _month_index(next_payment_date) - start_month
+        for period in range(paid, len(principal)):
+            offset = max(first_offset + period - paid, 0)
+            if offset >= CASH_FLOW_HORIZON_MONTHS:
+                break
+            cash_flow[offset][0] += principal[period]
+            cash_flow[offset][1] += interest[period]
+    return principal_by_type, cash_flow, start_month
+
+
+def take_portfolio_snapshot(as_of=None):
+    """
+    Compute the loan book figures for a day and store them (replacing that day's snapshot).
+
+    Returns:
+        LoanPortfolioSnapshot
+    """
+    as_of = as_of or timezone.localdate()
+    active_loans = Loan.objects.filter(status='active')
+
+    # Cash flow comes from stored schedules; build any that are missing first
+    recompute_schedules(active_loans.filter(schedule__isnull=True))
+
+    principal_by_type, cash_flow, start_month = _schedule_totals(as_of)
+
+    by_type = {}
+    delinquency = {bucket: {'count': 0, 'balance': Decimal('0')} for bucket, _, _ in DELINQUENCY_BUCKETS}
+    active_count = 0
+    outstanding_balance = Decimal('0')
+    for row in _aggregate_by_type(active_loans, as_of):
+        balance = row['outstanding_balance'] or Decimal('0')
+        active_count += row['count']
+        outstanding_balance += balance
+        by_type[row['loan_type']] = {
+            'count': row['count'],
+            'outstanding_balance': _money(balance),
+            'outstanding_principal': str(from_cents(principal_by_type.get(row['loan_type'], 0))),
+            'monthly_payments': _money(row['monthly_payments']),
+        }
+        for bucket, _, _ in DELINQUENCY_BUCKETS:
+            delinquency[bucket]['count'] += row[f'{bucket}_count']
+            delinquency[bucket]['balance'] += row[f'{bucket}_balance'] or Decimal('0')
+
+    snapshot, _ = LoanPortfolioSnapshot.objects.update_or_create(
+        as_of=as_of,
+        defaults={
+            'active_loans': active_count,
+            'outstanding_balance': outstanding_balance.quantize(CENT),
+            'outstanding_principal': from_cents(sum(principal_by_type.values())),
+            'by_type': by_type,
+            'delinquency': {
+                bucket: {'count': values['count'], 'balance': _money(values['balance'])}
+                for bucket, values in delinquency.items()
+            },
+            'cash_flow': [
+                {
+                    'month': _month_label(start_month + offset),
+                    'principal': str(from_cents(cash_flow[offset][0])),
+                    'interest': str(from_cents(cash_flow[offset][1])),
+                    'total': str(from_cents(sum(cash_flow[offset]))),
+                }
+                for offset in range(CASH_FLOW_HORIZON_MONTHS)
+            ],
+        }
+    )
+    logger.info(f"Loan portfolio snapshot for {as_of}: {active_count} active loans")
+    return snapshot
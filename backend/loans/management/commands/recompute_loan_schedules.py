@@ -0,0 +1,34 @@
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from loans.models import Loan
+from loans.amortization import ENGINE, recompute_schedules
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored amortization schedules, optionally applying a new interest rate'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rate', type=Decimal, help='New annual interest rate (percent) for the selected loans')
+        parser.add_argument('--loan-type', help='Only loans of this type')
+        parser.add_argument('--status', default='active', help="Only loans in this status (default: active; 'all' for any)")
+        parser.add_argument('--ids', type=int, nargs='+', help='Only these loan IDs')
+        parser.add_argument('--batch-size', type=int, default=500, help='Loans per vectorized batch')
+
+    def handle(self, *args, **options):
+        rate = options['rate']
+        if rate is not None and not Decimal('0') <= rate < Decimal('1000'):
+            raise CommandError('Rate must be between 0 and 999.99')
+
+        loans = Loan.objects.all()
+        if options['status'] != 'all':
+            loans = loans.filter(status=options['status'])
+        if options['loan_type']:
+            loans = loans.filter(loan_type=options['loan_type'])
+        if options['ids']:
+            loans = loans.filter(pk__in=options['ids'])
+
+        counts = recompute_schedules(loans, annual_rate=rate, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Built {counts['built']} and recomputed {counts['recomputed']} schedule(s) "
+            f"({counts['rate_changed']} rate change(s)) with the {ENGINE} engine"
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoanSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('annual_rate', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('opening_balance', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('monthly_payment', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('principal_cents', models.JSONField(default=list)),
+                ('interest_cents', models.JSONField(default=list)),
+                ('paid_periods', models.PositiveIntegerField(default=0)),
+                ('unapplied_cents', models.BigIntegerField(default=0)),
+                ('engine', models.CharField(default='decimal', max_length=10)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('loan', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='schedule', to='loans.loan')),
+            ],
+            options={
+                'db_table': 'loan_app_schedules',
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0002_loan_schedule'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoanPortfolioSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField(unique=True)),
+                ('active_loans', models.PositiveIntegerField(default=0)),
+                ('outstanding_balance', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('outstanding_principal', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('by_type', models.JSONField(default=dict)),
+                ('delinquency', models.JSONField(default=dict)),
+                ('cash_flow', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'loan_app_portfolio_snapshots',
+                'ordering': ['-as_of'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['-created_at'], name='loan_app_lo_created_a274c6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loanapplication',
+            index=models.Index(fields=['-created_at'], name='loan_app_ap_created_ebfb5e_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:45
+
+import calendar
+
+from django.db import migrations
+
+
+def add_months(day, months):
+    year, month = divmod(day.year * 12 + day.month - 1 + months, 12)
+    month += 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def advance_next_payment_dates(apps, schema_editor):
+    """
+    Move next_payment_date past the installments already settled.
+
+    Payments used to leave next_payment_date at the first due date, so every
+    loan that had been paid on looked overdue. Loans without a stored schedule
+    count whole monthly payments made, as build_schedule does.
+    """
+    Loan = apps.get_model('loans', 'Loan')
+    LoanSchedule = apps.get_model('loans', 'LoanSchedule')
+
+    paid_periods = dict(LoanSchedule.objects.values_list('loan_id', 'paid_periods'))
+    loans = Loan.objects.filter(total_paid__gt=0).only('id', 'next_payment_date', 'total_paid', 'monthly_payment')
+    updated = []
+    for loan in loans.iterator(chunk_size=2000):
+        if loan.id in paid_periods:
+            settled = paid_periods[loan.id]
+        elif loan.monthly_payment > 0:
+            settled = int(loan.total_paid // loan.monthly_payment)
+        else:
+            settled = 0
+        if settled:
+            loan.next_payment_date = add_months(loan.next_payment_date, settled)
+            updated.append(loan)
+    Loan.objects.bulk_update(updated, ['next_payment_date'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0003_loan_portfolio_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(advance_next_payment_dates, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,11 @@
 from django.db import models
+from django.db import transaction as db_transaction
 from django.conf import settings
 from django.utils import timezone
 import uuid
 
+from .amortization import add_months, apply_payment, build_schedule, from_cents, level_payment, to_cents
+
 
 class Loan(models.Model):
     """Model for user loans."""
@@ -56,6 +59,7 @@ class Loan(models.Model):
         indexes = [
             models.Index(fields=['user', 'status']),
             models.Index(fields=['loan_type', 'status']),
+            models.Index(fields=['-created_at']),
         ]
     
     def __str__(self):
@@ -75,14 +79,7 @@ class Loan(models.Model):
     def calculate_monthly_payment(self):
         """Calculate monthly payment using loan amortization formula."""
         if self.amount and self.interest_rate and self.term_months:
-            # Convert annual rate to monthly rate
-            monthly_rate = self.interest_rate / 100 / 12
-            
-            if monthly_rate > 0:
-                # Loan amortization formula
-                self.monthly_payment = self.amount * (monthly_rate * (1 + monthly_rate) ** self.term_months) / ((1 + monthly_rate) ** self.term_months - 1)
-            else:
-                self.monthly_payment = self.amount / self.term_months
+            self.monthly_payment = level_payment(self.amount, self.interest_rate, self.term_months)
     
     def make_payment(self, amount):
         """Make a payment on the loan."""
@@ -95,17 +92,36 @@ class Loan(models.Model):
         if amount > self.remaining_balance:
             return False, "Payment amount exceeds remaining balance"
         
-        self.total_paid += amount
-        self.remaining_balance -= amount
-        
-        # Check if loan is paid off
-        if self.remaining_balance <= 0:
-            self.status = 'paid_off'
-            self.end_date = timezone.now()
-        
-        self.save()
+        with db_transaction.atomic():
+            schedule = self.get_schedule(for_update=True)
+            
+            self.total_paid += amount
+            self.remaining_balance -= amount
+            
+            # Check if loan is paid off
+            if self.remaining_balance <= 0:
+                self.status = 'paid_off'
+                self.end_date = timezone.now()
+            
+            # Settles the next installment; extra principal recomputes the open periods
+            settled_before = schedule.paid_periods
+            apply_payment(schedule, amount)
+            settled = schedule.paid_periods - settled_before
+            if settled:
+                # Installments fall due monthly; the next one is a month after the one just settled
+                self.next_payment_date = add_months(self.next_payment_date, settled)
+            
+            self.save()
         return True, "Payment processed successfully"
     
+    def get_schedule(self, for_update=False, save=True):
+        """Stored amortization schedule; a missing one is built, and stored unless ``save`` is False."""
+        schedules = LoanSchedule.objects.select_for_update() if for_update else LoanSchedule.objects
+        schedule = schedules.filter(loan=self).first()
+        if schedule is None:
+            schedule = build_schedule(self, save=save)
+        return schedule
+    
     def get_loan_summary(self):
         """Get loan summary information."""
         return {
@@ -122,6 +138,94 @@ class Loan(models.Model):
         }
 
 
+class LoanSchedule(models.Model):
+    """
+    Precomputed amortization schedule for a loan (see loans.amortization).
+    
+    Stored compactly as per-period principal and interest in integer cents; payments
+    and balances are derived on read.
+    """
+    
+    loan = models.OneToOneField(Loan, on_delete=models.CASCADE, related_name='schedule')
+    annual_rate = models.DecimalField(max_digits=5, decimal_places=2)
+    opening_balance = models.DecimalField(max_digits=15, decimal_places=2)
+    monthly_payment = models.DecimalField(max_digits=10, decimal_places=2)
+    principal_cents = models.JSONField(default=list)
+    interest_cents = models.JSONField(default=list)
+    paid_periods = models.PositiveIntegerField(default=0)
+    # Part of a payment that did not cover a whole installment yet
+    unapplied_cents = models.BigIntegerField(default=0)
+    engine = models.CharField(max_length=10, default='decimal')
+    computed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'loan_app_schedules'
+    
+    def __str__(self):
+        return f"Schedule for loan {self.loan_id} ({len(self.principal_cents)} periods)"
+    
+    def payment_cents(self, index):
+        return self.principal_cents[index] + self.interest_cents[index]
+    
+    def balance_cents(self, periods):
+        """Outstanding principal after the first ``periods`` periods."""
+        return to_cents(self.opening_balance) - sum(self.principal_cents[:periods])
+    
+    @property
+    def total_interest(self):
+        return from_cents(sum(self.interest_cents))
+    
+    def get_rows(self):
+        """Per-period rows with Decimal amounts."""
+        balance = to_cents(self.opening_balance)
+        rows = []
+        for index, (principal, interest) in enumerate(zip(self.principal_cents, self.interest_cents)):
+            balance -= principal
+            rows.append({
+                'period': index + 1,
+                'payment': from_cents(principal + interest),
+                'principal': from_cents(principal),
+                'interest': from_cents(interest),
+                'balance': from_cents(balance),
+                'paid': index < self.paid_periods,
+            })
+        return rows
+
+
+class LoanPortfolioSnapshot(models.Model):
+    """Daily loan book figures for admin risk screens (see loans.analytics)."""
+    
+    as_of = models.DateField(unique=True)
+    active_loans = models.PositiveIntegerField(default=0)
+    outstanding_balance = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    outstanding_principal = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    by_type = models.JSONField(default=dict)
+    delinquency = models.JSONField(default=dict)
+    cash_flow = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'loan_app_portfolio_snapshots'
+        ordering = ['-as_of']
+    
+    def __str__(self):
+        return f"Loan portfolio snapshot {self.as_of}"
+    
+    def get_summary(self):
+        """Snapshot figures for the admin API."""
+        return {
+            'as_of': self.as_of,
+            'active_loans': self.active_loans,
+            'outstanding_balance': str(self.outstanding_balance),
+            'outstanding_principal': str(self.outstanding_principal),
+            'by_type': self.by_type,
+            'delinquency': self.delinquency,
+            'cash_flow': self.cash_flow,
+            'computed_at': self.updated_at,
+        }
+
+
 class LoanApplication(models.Model):
     """Model for loan applications."""
     
@@ -156,6 +260,9 @@ class LoanApplication(models.Model):
     class Meta:
         db_table = 'loan_app_applications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+        ]
     
     def __str__(self):
         return f"Loan application for {self.user.email} - {self.loan_type}"
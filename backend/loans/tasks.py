@@ -0,0 +1,32 @@
+"""
+Celery tasks for loans
+"""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def snapshot_loan_portfolio():
+    """
+    Store today's loan book figures for the admin risk screens.
+    Runs nightly; re-running on the same day replaces that day's snapshot.
+    """
+    from .analytics import take_portfolio_snapshot
+    
+    snapshot = take_portfolio_snapshot()
+    return {'as_of': snapshot.as_of.isoformat(), 'active_loans': snapshot.active_loans}
+
+
+@shared_task
+def build_missing_loan_schedules():
+    """
+    Store schedules for active loans that have none (e.g. created outside the approval flow).
+    Runs nightly before the portfolio snapshot, so schedule reads never have to write.
+    """
+    from .amortization import recompute_schedules
+    from .models import Loan
+    
+    counts = recompute_schedules(Loan.objects.filter(status='active', schedule__isnull=True))
+    return {'built': counts['built']}
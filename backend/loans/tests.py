@@ -0,0 +1,139 @@
+from datetime import date
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .analytics import get_user_loan_analytics, take_portfolio_snapshot
+from .amortization import (
+    ScheduleSpec, compute_schedule, compute_schedules, from_cents, np, recompute_schedules, to_cents,
+)
+from .models import Loan, LoanPortfolioSnapshot, LoanSchedule
+from .tasks import build_missing_loan_schedules
+
+User = get_user_model()
+
+ENGINES = ['decimal'] + (['numpy'] if np is not None else [])
+
+SPECS = [
+    ScheduleSpec(Decimal('25000.00'), Decimal('7.50'), 60, None),
+    ScheduleSpec(Decimal('1234.56'), Decimal('0.00'), 7, None),
+    ScheduleSpec(Decimal('980.00'), Decimal('19.99'), 12, Decimal('250.00')),  # paid off early
+    ScheduleSpec(Decimal('0.01'), Decimal('3.00'), 36, None),
+]
+
+
+class AmortizationEngineTests(TestCase):
+
+    def test_principal_sums_to_opening_balance(self):
+        for engine in ENGINES:
+            for spec, (principal, interest) in zip(SPECS, compute_schedules(SPECS, engine)):
+                with self.subTest(engine=engine, spec=spec):
+                    self.assertEqual(sum(principal), to_cents(spec.opening_balance))
+                    self.assertLessEqual(len(principal), spec.periods)
+                    self.assertEqual(len(principal), len(interest))
+
+    @skipUnless(np is not None, "NumPy is not installed")
+    def test_numpy_matches_decimal(self):
+        self.assertEqual(compute_schedules(SPECS, 'numpy'), compute_schedules(SPECS, 'decimal'))
+
+    def test_settled_specs_have_no_periods(self):
+        settled = [ScheduleSpec(Decimal('0.00'), Decimal('5.00'), 12, None), ScheduleSpec(Decimal('100.00'), Decimal('5.00'), 0, None)]
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                self.assertEqual(compute_schedules(settled, engine), [([], []), ([], [])])
+                self.assertEqual(compute_schedules(settled + SPECS[:1], engine)[2], compute_schedules(SPECS[:1], engine)[0])
+
+
+class LoanScheduleTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='borrower', email='borrower@example.com', password=None)
+        self.loan = Loan.objects.create(
+            user=self.user, loan_type='personal', amount=Decimal('12000.00'), interest_rate=Decimal('6.00'),
+            term_months=24, status='active', next_payment_date=date(2030, 1, 1)
+        )
+        self.loan.refresh_from_db()
+
+    def test_extra_principal_recomputes_the_open_periods(self):
+        payment = self.loan.monthly_payment
+        self.assertTrue(self.loan.make_payment(payment + Decimal('3000.00'))[0])
+
+        schedule = self.loan.get_schedule()
+        self.assertEqual(schedule.paid_periods, 1)
+        self.assertLess(len(schedule.principal_cents), 24)
+        self.assertEqual(sum(schedule.principal_cents), to_cents(self.loan.amount))
+
+        # The tail is the remaining balance amortized at the unchanged level payment
+        balance = from_cents(schedule.balance_cents(1))
+        tail = compute_schedule(balance, schedule.annual_rate, 23, schedule.monthly_payment)
+        self.assertEqual((schedule.principal_cents[1:], schedule.interest_cents[1:]), tail)
+
+    def test_recompute_skips_settled_schedules(self):
+        schedule = self.loan.get_schedule()
+        schedule.paid_periods = len(schedule.principal_cents)
+        schedule.save()
+
+        counts = recompute_schedules(Loan.objects.all(), annual_rate=Decimal('5.00'))
+        self.assertEqual(counts['recomputed'], 1)
+        schedule.refresh_from_db()
+        self.assertEqual(sum(schedule.principal_cents), to_cents(self.loan.amount))
+        self.assertEqual(schedule.monthly_payment, Decimal('0.00'))
+
+    def test_schedule_read_does_not_store_it(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(reverse('loans:loan-schedule', args=[self.loan.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['periods'], 24)
+        self.assertFalse(LoanSchedule.objects.exists())
+
+        self.assertEqual(build_missing_loan_schedules(), {'built': 1})
+        self.assertEqual(LoanSchedule.objects.get().principal_cents, self.loan.get_schedule().principal_cents)
+
+
+class LoanAnalyticsTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='borrower', email='borrower@example.com', password=None)
+        self.as_of = date(2030, 1, 15)
+        self.current = self.loan('auto', '12000.00', next_payment_date=date(2030, 2, 1))
+        self.overdue = self.loan('personal', '3000.00', next_payment_date=date(2029, 12, 1))  # 45 days past due
+        self.loan('personal', '5000.00', status='pending', next_payment_date=date(2030, 2, 1))
+
+    def loan(self, loan_type, amount, next_payment_date, status='active'):
+        return Loan.objects.create(
+            user=self.user, loan_type=loan_type, amount=Decimal(amount), interest_rate=Decimal('6.00'),
+            term_months=24, status=status, next_payment_date=next_payment_date
+        )
+
+    def test_user_analytics_take_one_query(self):
+        with self.assertNumQueries(1):
+            analytics = get_user_loan_analytics(self.user)
+        self.assertEqual((analytics['total_loans'], analytics['active_loans']), (3, 2))
+        self.assertEqual(analytics['total_borrowed'], '20000.00')
+        self.assertEqual(analytics['total_remaining'], '15000.00')
+        self.assertEqual(analytics['loan_types'], [{'loan_type': 'personal', 'count': 2}, {'loan_type': 'auto', 'count': 1}])
+
+    def test_snapshot_buckets_and_cash_flow(self):
+        snapshot = take_portfolio_snapshot(self.as_of)
+        self.assertEqual(snapshot.active_loans, 2)
+        self.assertEqual(snapshot.outstanding_principal, Decimal('15000.00'))
+        self.assertEqual(snapshot.delinquency['current']['count'], 1)
+        self.assertEqual(snapshot.delinquency['30_59'], {'count': 1, 'balance': '3000.00'})
+        self.assertEqual(snapshot.by_type['auto']['outstanding_balance'], '12000.00')
+
+        # The overdue installments fall in the current month, the current loan's first one next month
+        current, overdue = self.current.get_schedule(), self.overdue.get_schedule()
+        january, february = snapshot.cash_flow[:2]
+        self.assertEqual(january['month'], '2030-01')
+        self.assertEqual(Decimal(january['principal']), from_cents(sum(overdue.principal_cents[:2])))
+        self.assertEqual(
+            Decimal(february['principal']), from_cents(current.principal_cents[0] + overdue.principal_cents[2])
+        )
+
+        take_portfolio_snapshot(self.as_of)
+        self.assertEqual(LoanPortfolioSnapshot.objects.count(), 1)
@@ -9,6 +9,7 @@ urlpatterns = [
     path('create/', views.LoanCreateView.as_view(), name='loan-create'),
     path('<int:pk>/', views.LoanDetailView.as_view(), name='loan-detail'),
     path('<int:pk>/pay/', views.LoanPayView.as_view(), name='loan-pay'),
+    path('<int:pk>/schedule/', views.LoanScheduleView.as_view(), name='loan-schedule'),
     
     # Loan application endpoints
     path('apply/', views.LoanApplicationListView.as_view(), name='application-list'),
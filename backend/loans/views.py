@@ -2,11 +2,12 @@ from rest_framework import status, generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Sum
 from django.utils import timezone
 import logging
+from decimal import Decimal
 from typing import Dict, Any
 
+from .analytics import get_user_loan_analytics
 from .models import Loan, LoanApplication
 from .serializers import (
     LoanSerializer, LoanCreateSerializer, LoanApplicationSerializer, LoanPaymentSerializer
@@ -112,6 +113,32 @@ class LoanPayView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class LoanScheduleView(APIView):
+    """Get the amortization schedule of a loan."""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, pk):
+        loan = get_object_or_404(Loan, pk=pk, user=request.user)
+        # Schedules are stored at approval and by the nightly task; reads never write
+        schedule = loan.get_schedule(save=False)
+        
+        return Response({
+            'loan_id': loan.id,
+            'annual_rate': str(schedule.annual_rate),
+            'opening_balance': str(schedule.opening_balance),
+            'monthly_payment': str(schedule.monthly_payment),
+            'total_interest': str(schedule.total_interest),
+            'periods': len(schedule.principal_cents),
+            'paid_periods': schedule.paid_periods,
+            'computed_at': schedule.computed_at,
+            'rows': [
+                {key: str(value) if isinstance(value, Decimal) else value for key, value in row.items()}
+                for row in schedule.get_rows()
+            ],
+        }, status=status.HTTP_200_OK)
+
+
 class LoanApplicationListView(generics.ListCreateAPIView):
     """List and create loan applications."""
     
@@ -176,27 +203,4 @@ class LoanAnalyticsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request):
-        user = request.user
-        loans = Loan.objects.filter(user=user)
-        
-        # Calculate analytics
-        total_loans = loans.count()
-        active_loans = loans.filter(status='active').count()
-        total_borrowed = loans.aggregate(total=Sum('amount'))['total'] or 0
-        total_remaining = loans.filter(status='active').aggregate(total=Sum('remaining_balance'))['total'] or 0
-        total_paid = loans.aggregate(total=Sum('total_paid'))['total'] or 0
-        
-        # Monthly payment total
-        monthly_payments = loans.filter(status='active').aggregate(total=Sum('monthly_payment'))['total'] or 0
-        
-        analytics = {
-            'total_loans': total_loans,
-            'active_loans': active_loans,
-            'total_borrowed': str(total_borrowed),
-            'total_remaining': str(total_remaining),
-            'total_paid': str(total_paid),
-            'monthly_payments': str(monthly_payments),
-            'loan_types': list(loans.values('loan_type').annotate(count=Sum('id')))
-        }
-        
-        return Response(analytics, status=status.HTTP_200_OK) 
\ No newline at end of file
+        return Response(get_user_loan_analytics(request.user), status=status.HTTP_200_OK)
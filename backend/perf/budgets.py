@@ -0,0 +1,80 @@
+"""
+Per-endpoint performance budgets (``perf/budgets.json``).
+
+Each GET endpoint is keyed by its path template, e.g. ``/api/loans/{pk}/``::
+
+    {
+      "queries": 4,       # most SQL queries allowed per request
+      "bytes": 5120,      # largest response body allowed
+      "ms": 120,          # slowest median wall time allowed
+      "kwargs": {"pk": "loan"},   # URL kwarg -> dataset row (see perf/factories.py)
+      "as": "admin",      # "user" (default), "admin" or "anonymous"
+      "query": "q=perf",  # optional query string
+      "status": 200,      # expected response status (default 200)
+      "skip": "reason"    # measured nowhere; must say why
+    }
+
+``pytest --update-budgets`` rewrites the limits from a run's measurements. The
+query count is exact. Size and time get the headroom below, so the file only
+needs regenerating when an endpoint changes on purpose.
+
+Budgets are recorded at ``RECORDED_SCALE``. Query counts must not depend on
+the dataset size, so they are enforced at every ``PERF_SCALE``; size and time
+limits only hold at the recorded scale.
+"""
+import json
+import math
+import os
+
+BUDGETS_PATH = os.path.join(os.path.dirname(__file__), 'budgets.json')
+
+# Headroom applied by --update-budgets
+BYTES_HEADROOM = 1.2
+MS_HEADROOM = 3.0
+MIN_MS = 100
+
+LIMITS = ('queries', 'bytes', 'ms')
+SCALE_INDEPENDENT_LIMITS = ('queries',)
+
+RECORDED_SCALE = 1.0
+
+
+def load_budgets():
+    if not os.path.exists(BUDGETS_PATH):
+        return {}
+    with open(BUDGETS_PATH) as budgets_file:
+        return json.load(budgets_file)
+
+
+def perf_scale():
+    """Dataset size multiplier for this run (``PERF_SCALE``)."""
+    return float(os.environ.get('PERF_SCALE', RECORDED_SCALE))
+
+
+def time_factor():
+    """Multiplier for ``ms`` budgets on runners slower than the one that recorded them."""
+    return float(os.environ.get('PERF_TIME_FACTOR', '1'))
+
+
+def over_budget(measurement, budget):
+    """Messages for every limit the measurement exceeds."""
+    limits = dict(budget)
+    if 'ms' in limits:
+        limits['ms'] = limits['ms'] * time_factor()
+    checked = LIMITS if perf_scale() == RECORDED_SCALE else SCALE_INDEPENDENT_LIMITS
+    return [
+        f"{limit}: {measurement[limit]} > budget {limits[limit]:g}"
+        for limit in checked
+        if limit in limits and measurement[limit] > limits[limit]
+    ]
+
+
+def updated_budgets(budgets, measurements):
+    """Budgets with the limits of every measured endpoint replaced."""
+    budgets = {key: dict(entry) for key, entry in budgets.items()}
+    for key, measurement in measurements.items():
+        entry = budgets.setdefault(key, {})
+        entry['queries'] = measurement['queries']
+        entry['bytes'] = math.ceil(measurement['bytes'] * BYTES_HEADROOM)
+        entry['ms'] = max(math.ceil(measurement['ms'] * MS_HEADROOM), MIN_MS)
+    return budgets
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+import requests
+
+from .budgets import BUDGETS_PATH, RECORDED_SCALE, load_budgets, perf_scale, updated_budgets
+from .factories import seed_dataset
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--update-budgets', action='store_true', default=False,
+        help="Rewrite perf/budgets.json from this run's measurements instead of enforcing it"
+    )
+
+
+def pytest_configure(config):
+    if config.getoption('--update-budgets') and perf_scale() != RECORDED_SCALE:
+        raise pytest.UsageError(f"--update-budgets records budgets at PERF_SCALE={RECORDED_SCALE:g} only")
+    config.perf_measurements = {}
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if config.getoption('--update-budgets') and config.perf_measurements:
+        budgets = updated_budgets(load_budgets(), config.perf_measurements)
+        with open(BUDGETS_PATH, 'w') as budgets_file:
+            json.dump(budgets, budgets_file, indent=2, sort_keys=True)
+            budgets_file.write('\n')
+
+
+@pytest.fixture(scope='session')
+def perf_dataset(django_db_setup, django_db_blocker):
+    """Seed once per session; endpoint tests only read it."""
+    with django_db_blocker.unblock():
+        return seed_dataset(scale=perf_scale())
+
+
+@pytest.fixture(autouse=True)
+def no_network(monkeypatch):
+    """Fail outbound HTTP fast so timings measure this service, not third-party APIs."""
+    def refuse(self, method, url, *args, **kwargs):
+        raise requests.ConnectionError(f"Network access is disabled in the performance suite ({url})")
+
+    monkeypatch.setattr(requests.sessions.Session, 'request', refuse)
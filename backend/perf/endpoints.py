@@ -0,0 +1,58 @@
+"""
+Every GET endpoint in ``primetrust/urls.py``.
+
+The URL tree is walked, not listed by hand, so a new endpoint fails the suite
+until it has a budget. Not measured: the Django admin site, static/media
+serving and DRF format-suffix duplicates. Endpoints without a GET handler are
+also left out, because they change state and cannot be replayed against the
+shared dataset.
+"""
+import re
+from collections import namedtuple
+
+from django.urls import URLPattern, URLResolver, get_resolver
+
+Endpoint = namedtuple('Endpoint', ['path', 'name', 'callback'])
+
+EXCLUDED_PREFIXES = ('/admin/', '/static/', '/media/')
+
+_ROUTE_PARAMETER = re.compile(r'<(?:\w+:)?(\w+)>')
+_REGEX_GROUP = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+
+
+def _path_part(pattern):
+    part = str(pattern)
+    part = _REGEX_GROUP.sub(r'{\1}', part)
+    part = _ROUTE_PARAMETER.sub(r'{\1}', part)
+    return part.lstrip('^').rstrip('$')
+
+
+def _handles_get(callback):
+    actions = getattr(callback, 'actions', None)
+    if actions is not None:
+        return 'get' in actions
+    view_class = getattr(callback, 'view_class', None)
+    if view_class is not None:
+        return hasattr(view_class, 'get')
+    return True
+
+
+def _walk(patterns, prefix, namespace):
+    for pattern in patterns:
+        path = prefix + _path_part(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns, path, pattern.namespace or namespace)
+        elif isinstance(pattern, URLPattern):
+            name = f'{namespace}:{pattern.name}' if namespace and pattern.name else pattern.name
+            yield Endpoint(path, name, pattern.callback)
+
+
+def get_endpoints():
+    """GET endpoints, keyed by path template (``/api/loans/{pk}/``), in URLconf order."""
+    endpoints = {}
+    for endpoint in _walk(get_resolver().url_patterns, '/', None):
+        if endpoint.path.startswith(EXCLUDED_PREFIXES) or '{format}' in endpoint.path:
+            continue
+        if _handles_get(endpoint.callback):
+            endpoints.setdefault(endpoint.path, endpoint)
+    return endpoints
@@ -0,0 +1,258 @@
+"""
+Seeded dataset for the performance suite.
+
+Bulk tables (users, transactions, transfers, notifications) are written with
+``bulk_create``, so save() side effects and signals are skipped. The primary
+``user`` and ``admin`` accounts, and the single rows that detail endpoints look
+up, go through the normal create path.
+
+The dataset is deterministic for a given seed and ``PERF_SCALE``. Sizes are
+multiplied by the scale, so ``PERF_SCALE=0.1`` gives a quick local run.
+"""
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+DEFAULT_SEED = 20240601
+
+# Rows per table at scale 1
+SIZES = {
+    'users': 2000,
+    'transactions': 20000,
+    'transfers': 5000,
+    'notifications': 10000,
+}
+
+# Share of each bulk table that belongs to the primary user
+PRIMARY_USER_SHARE = 0.02
+
+PASSWORD = 'perf-password-123'
+
+BATCH_SIZE = 1000
+
+
+def _money(rng, low, high):
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+def _created_at(rng, now, days=365):
+    return now - timedelta(seconds=rng.randint(0, days * 86400))
+
+
+def _owner(rng, user, users):
+    return user if rng.random() < PRIMARY_USER_SHARE else rng.choice(users)
+
+
+def make_users(count, rng):
+    from accounts.models import User
+
+    password = make_password(PASSWORD)
+    now = timezone.now()
+    users = [
+        User(
+            username=f'perf{i}', email=f'perf{i}@example.com', password=password,
+            first_name=rng.choice(['Ada', 'Grace', 'Alan', 'Edsger', 'Barbara', 'Ken']),
+            last_name=f'Tester{i}', account_number=f'7{i:09d}',
+            balance=_money(rng, 0, 50000), date_joined=_created_at(rng, now, 730),
+        )
+        for i in range(count)
+    ]
+    return User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+
+
+def make_transactions(count, rng, user, users):
+    from transactions.models import Transaction
+
+    now = timezone.now()
+    types = ['transfer', 'deposit', 'withdrawal', 'payment', 'fee']
+    rows = []
+    for i in range(count):
+        amount = _money(rng, 1, 2000)
+        balance_before = _money(rng, 2000, 50000)
+        rows.append(Transaction(
+            user=_owner(rng, user, users), transaction_type=rng.choice(types), amount=amount,
+            status=rng.choice(['completed'] * 8 + ['pending', 'failed']),
+            reference_number=f'PTX{i:012d}', description=f'Seeded transaction {i}',
+            balance_before=balance_before, balance_after=balance_before - amount,
+            created_at=_created_at(rng, now),
+        ))
+    return Transaction.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+
+def make_transfers(count, rng, user, users):
+    from banking.models import Transfer
+
+    now = timezone.now()
+    rows = []
+    for i in range(count):
+        status = rng.choice(['completed'] * 6 + ['pending', 'processing', 'failed'])
+        rows.append(Transfer(
+            sender=_owner(rng, user, users), recipient=rng.choice(users),
+            amount=_money(rng, 1, 5000), reference_number=f'PTR{i:012d}',
+            transfer_type=rng.choice(['internal', 'ach', 'wire_domestic']), status=status,
+            requires_admin_approval=status in ('pending', 'processing'),
+            description=f'Seeded transfer {i}', created_at=_created_at(rng, now),
+        ))
+    return Transfer.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+
+def make_notifications(count, rng, user, users):
+    from api.models import Notification
+
+    now = timezone.now()
+    types = ['transaction', 'security', 'account', 'investment', 'bill']
+    rows = [
+        Notification(
+            user=_owner(rng, user, users), notification_type=rng.choice(types),
+            title=f'Notification {i}', message='Seeded notification body. ' * 4,
+            is_read=rng.random() < 0.6, created_at=_created_at(rng, now, 90),
+        )
+        for i in range(count)
+    ]
+    return Notification.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+
+def make_account_rows(user, other_user, rng):
+    """One row of each per-user model, for the detail endpoints. Returns name -> instance."""
+    from accounts.models import BitcoinTransaction as AccountBitcoinTransaction, SecurityAuditLog
+    from api.models import FAQ, Notification, SystemStatus
+    from banking.models import (
+        BankAccount, CardApplication, CheckDeposit, DirectDeposit, ExternalBankAccount,
+        SavedBeneficiary, Transfer, VirtualCard,
+    )
+    from bitcoin_wallet.models import (
+        BitcoinWallet, CurrencySwap, IncomingBitcoinTransaction, OutgoingBitcoinTransaction,
+    )
+    from location.models import City, State
+    from loans.amortization import build_schedule
+    from loans.analytics import take_portfolio_snapshot
+    from loans.models import Loan, LoanApplication
+    from maintenance.models import MaintenanceMode
+    from transactions.models import Bill, BitcoinTransaction, Investment, Transaction
+
+    today = timezone.localdate()
+    rows = {}
+    rows['card_application'] = CardApplication.objects.create(user=user, reason='Travel')
+    rows['virtual_card'] = VirtualCard.objects.create(
+        user=user, card_number='4111111111111111', cvv='123', expiry_month=12, expiry_year=today.year + 3
+    )
+    rows['external_account'] = ExternalBankAccount.objects.create(
+        user=user, account_holder_name='Perf User', account_number='000123456789',
+        routing_number='021000021', bank_name='Chase'
+    )
+    rows['saved_beneficiary'] = SavedBeneficiary.objects.create(
+        user=user, nickname='Landlord', transfer_type='ach', recipient_name='Jane Doe', bank_name='Chase'
+    )
+    rows['bank_account'] = BankAccount.objects.create(
+        user=user, account_name='Checking', account_number='000987654321', routing_number='021000021', bank_name='Chase'
+    )
+    rows['direct_deposit'] = DirectDeposit.objects.create(
+        user=user, employer_name='Acme', account_number='000987654321', routing_number='021000021',
+        frequency='biweekly', start_date=today
+    )
+    # bulk_create skips the Celery fan-out in CheckDeposit.save()
+    rows['check_deposit'] = CheckDeposit.objects.bulk_create([
+        CheckDeposit(user=user, amount=Decimal('250.00'), front_image='checks/front.jpg', check_number='1001')
+    ])[0]
+    rows['bill'] = Bill.objects.create(user=user, amount=Decimal('120.00'), due_date=today + timedelta(days=10))
+    rows['investment'] = Investment.objects.create(
+        user=user, investment_type='stocks', name='Apple Inc.', symbol='AAPL', quantity=Decimal('3'),
+        price_per_unit=Decimal('190.00'), amount_invested=Decimal('570.00')
+    )
+    rows['bitcoin_transaction'] = BitcoinTransaction.objects.create(
+        user=user, transaction_type='incoming', amount=Decimal('0.01000000'),
+        bitcoin_address='bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdq'
+    )
+    rows['account_bitcoin_transaction'] = AccountBitcoinTransaction.objects.create(
+        user=user, transaction_type='send', balance_source='fiat', amount_btc=Decimal('0.00500000'),
+        bitcoin_price_at_time=Decimal('60000.00'), recipient_wallet_address='bc1qxy2kgdygjrsqtzq2n0yrf2493p83kkfjhx0wlh'
+    )
+    # Detail rows with fixed state, so their query counts do not depend on the scale
+    rows['transaction'] = Transaction.objects.create(
+        user=user, transaction_type='deposit', amount=Decimal('500.00'), status='completed',
+        reference_number='PTXDETAIL', description='Payroll', balance_before=Decimal('24500.00'),
+        balance_after=Decimal('25000.00')
+    )
+    rows['transfer'] = Transfer.objects.create(
+        sender=user, recipient=other_user, amount=Decimal('75.00'), reference_number='PTRDETAIL',
+        transfer_type='internal', status='completed', description='Rent share'
+    )
+    rows['notification'] = Notification.objects.create(
+        user=user, notification_type='account', title='Statement ready', message='Your statement is ready.'
+    )
+    rows['security_log'] = SecurityAuditLog.objects.create(
+        user=user, event_type='2fa_enabled', description='Two-factor authentication enabled'
+    )
+
+    loan = Loan.objects.create(
+        user=user, loan_type='personal', amount=Decimal('15000.00'), interest_rate=Decimal('8.50'),
+        term_months=48, monthly_payment=Decimal('369.72'), remaining_balance=Decimal('15000.00'),
+        next_payment_date=today + timedelta(days=30), status='active', purpose='Car'
+    )
+    build_schedule(loan)
+    rows['loan'] = loan
+    # The portfolio endpoint only reads the snapshot the nightly task writes
+    rows['portfolio_snapshot'] = take_portfolio_snapshot()
+    rows['loan_application'] = LoanApplication.objects.create(
+        user=user, loan_type='personal', requested_amount=Decimal('5000.00'), purpose='Furniture',
+        employment_status='employed', annual_income=Decimal('85000.00')
+    )
+
+    rows['bitcoin_wallet'], _ = BitcoinWallet.objects.get_or_create(user=user)
+    rows['incoming_bitcoin'] = IncomingBitcoinTransaction.objects.create(
+        user=user, transaction_hash=f'{rng.getrandbits(256):064x}', amount_btc=Decimal('0.05000000'),
+        amount_usd=Decimal('3000.00'), sender_address='bc1qxy2kgdygjrsqtzq2n0yrf2493p83kkfjhx0wlh'
+    )
+    rows['outgoing_bitcoin'] = OutgoingBitcoinTransaction.objects.create(
+        user=user, recipient_wallet_address='bc1qxy2kgdygjrsqtzq2n0yrf2493p83kkfjhx0wlh',
+        amount_btc=Decimal('0.01000000'), bitcoin_price_at_time=Decimal('60000.00'),
+        transaction_hash=f'{rng.getrandbits(256):064x}'
+    )
+    rows['currency_swap'] = CurrencySwap.objects.create(
+        user=user, swap_type='usd_to_btc', amount_from=Decimal('600.00'),
+        amount_to=Decimal('0.01000000'), exchange_rate=Decimal('60000.00')
+    )
+
+    rows['maintenance'] = MaintenanceMode.get_maintenance()
+    state = State.objects.create(name='California', abbreviation='CA')
+    City.objects.bulk_create([City(name=f'City {i}', state=state) for i in range(50)])
+    rows['state'] = state
+    FAQ.objects.create(question='How do I reset my PIN?', answer='From Settings.', category='account')
+    SystemStatus.objects.create(component='database', status='operational')
+    return rows
+
+
+def seed_dataset(scale=1.0, seed=DEFAULT_SEED):
+    """
+    Create the full performance dataset.
+
+    Returns:
+        dict: name -> instance for the primary ``user``, the ``admin`` and one
+        row of each model the detail endpoints need (see ``make_account_rows``)
+    """
+    from accounts.models import User, UserProfile
+
+    rng = random.Random(seed)
+    sizes = {name: max(int(size * scale), 1) for name, size in SIZES.items()}
+
+    user = User.objects.create_user(
+        username='perf-user', email='perf-user@example.com', password=PASSWORD,
+        first_name='Perf', last_name='User', balance=Decimal('25000.00')
+    )
+    UserProfile.objects.create(user=user)
+    admin = User.objects.create_user(
+        username='perf-admin', email='perf-admin@example.com', password=PASSWORD,
+        is_staff=True, is_superuser=True
+    )
+
+    users = make_users(sizes['users'], rng)
+    make_transactions(sizes['transactions'], rng, user, users)
+    make_transfers(sizes['transfers'], rng, user, users)
+    make_notifications(sizes['notifications'], rng, user, users)
+
+    dataset = {'user': user, 'admin': admin, 'other_user': users[0]}
+    dataset.update(make_account_rows(user, users[0], rng))
+    return dataset
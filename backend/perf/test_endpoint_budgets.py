@@ -0,0 +1,93 @@
+"""
+Query count, payload size and wall time for every GET endpoint, against budgets.
+
+Each endpoint is requested ``PERF_REPEAT`` times with a real JWT and a cleared
+cache, so cold-cache work is always counted. The query count and size come
+from the first request, and the time is the median of all of them.
+"""
+import os
+import statistics
+import time
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .budgets import load_budgets, over_budget
+from .endpoints import get_endpoints
+
+ENDPOINTS = get_endpoints()
+BUDGETS = load_budgets()
+
+REPEAT = int(os.environ.get('PERF_REPEAT', '3'))
+
+
+def _client(dataset, identity):
+    client = APIClient(HTTP_HOST='localhost')
+    if identity != 'anonymous':
+        token = RefreshToken.for_user(dataset[identity]).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def _default_identity(path):
+    return 'admin' if '/admin/' in path else 'user'
+
+
+def _url(path, entry, dataset):
+    kwargs = {name: dataset[row].pk for name, row in entry.get('kwargs', {}).items()}
+    try:
+        url = path.format(**kwargs)
+    except KeyError as missing:
+        pytest.fail(f"{path}: add \"kwargs\" naming a dataset row for {missing} to perf/budgets.json")
+    return f"{url}?{entry['query']}" if entry.get('query') else url
+
+
+def _body_size(response):
+    if getattr(response, 'streaming', False):
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def _measure(client, url):
+    timings = []
+    for run in range(REPEAT):
+        for backend in caches.all(initialized_only=True):
+            backend.clear()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.get(url)
+            size = _body_size(response)
+            timings.append((time.perf_counter() - started) * 1000)
+        if run == 0:
+            first = response, len(queries), size
+    response, query_count, size = first
+    return response, {'queries': query_count, 'bytes': size, 'ms': round(statistics.median(timings), 1)}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('path', list(ENDPOINTS))
+def test_endpoint_budget(path, perf_dataset, request):
+    updating = request.config.getoption('--update-budgets')
+    entry = BUDGETS.get(path)
+    if entry is None and not updating:
+        pytest.fail(f"{path} has no budget; run `pytest --update-budgets` and check in perf/budgets.json")
+    entry = entry or {}
+    if entry.get('skip'):
+        pytest.skip(entry['skip'])
+
+    client = _client(perf_dataset, entry.get('as', _default_identity(path)))
+    response, measurement = _measure(client, _url(path, entry, perf_dataset))
+
+    expected_status = entry.get('status', 200)
+    assert response.status_code == expected_status, (
+        f"{path} returned {response.status_code}, expected {expected_status}: {response.content[:500]!r}"
+    )
+
+    request.config.perf_measurements[path] = measurement
+    if not updating:
+        problems = over_budget(measurement, entry)
+        assert not problems, f"{path} is over budget ({measurement}): " + '; '.join(problems)
@@ -4,6 +4,7 @@ Celery configuration for PrimeTrust
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_shutdown
 
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'primetrust.settings')
@@ -24,12 +25,52 @@ app.conf.beat_schedule = {
     },
     'detect-duplicate-checks': {
         'task': 'banking.tasks.detect_duplicate_checks',
-        'schedule': crontab(hour='*/6'),  # Run every 6 hours
+        'schedule': crontab(minute=0),  # Hourly safety net; only unchecked deposits are scanned
     },
     'auto-approve-pending-transfers': {
         'task': 'banking.tasks.auto_approve_pending_transfers',
         'schedule': crontab(minute='*'),  # Run every minute
     },
+    'archive-security-audit-logs': {
+        'task': 'accounts.tasks.archive_security_audit_logs',
+        'schedule': crontab(hour=3, minute=15),  # Run daily at 03:15
+    },
+    'reconcile-unread-notification-counters': {
+        'task': 'api.tasks.reconcile_unread_notification_counters',
+        'schedule': crontab(minute=5),  # Run hourly
+    },
+    'prune-old-notifications': {
+        'task': 'api.tasks.prune_old_notifications',
+        'schedule': crontab(hour=3, minute=45),  # Run daily at 03:45
+    },
+    'refresh-bitcoin-fee-rates': {
+        'task': 'accounts.tasks.refresh_bitcoin_fee_rates',
+        'schedule': crontab(minute='*/2'),  # Run every 2 minutes
+    },
+    'poll-bitcoin-confirmations': {
+        'task': 'bitcoin_wallet.tasks.poll_bitcoin_confirmations',
+        'schedule': crontab(minute='*'),  # Run every minute; each deposit is only checked when due
+    },
+    'refresh-system-status': {
+        'task': 'api.tasks.refresh_system_status',
+        'schedule': crontab(minute='*'),  # Run every minute
+    },
+    'reset-card-spending-counters': {
+        'task': 'banking.tasks.reset_card_spending_counters',
+        'schedule': crontab(minute='*/15'),  # Run every 15 minutes; cards are reset after their local midnight
+    },
+    'reconcile-card-spending': {
+        'task': 'banking.tasks.reconcile_card_spending',
+        'schedule': crontab(minute='*'),  # Run every minute
+    },
+    'build-missing-loan-schedules': {
+        'task': 'loans.tasks.build_missing_loan_schedules',
+        'schedule': crontab(hour=2, minute=15),  # Run daily at 02:15
+    },
+    'snapshot-loan-portfolio': {
+        'task': 'loans.tasks.snapshot_loan_portfolio',
+        'schedule': crontab(hour=2, minute=30),  # Run daily at 02:30
+    },
 }
 
 app.conf.timezone = 'UTC'
@@ -43,6 +84,13 @@ if sys.platform == 'win32':
     app.conf.worker_concurrency = 1
 
 
+@worker_process_shutdown.connect
+def drain_buffered_writers(**kwargs):
+    # Prefork children exit via os._exit, which skips atexit handlers
+    from utils.buffered_flush import flush_all_buffers
+    flush_all_buffers()
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
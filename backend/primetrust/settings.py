@@ -15,6 +15,8 @@ import os
 import environ
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -119,6 +121,65 @@ DATABASES = {
     )
 }
 
+# Cache
+# Defaults to per-process memory. State that every worker must see (auth snapshots,
+# invalidation versions, counters) uses the shared alias (utils/shared_cache.py):
+# SHARED_CACHE_URL, else CACHE_URL when that is shared, else (DEBUG off) the Redis
+# that Celery already uses. Set SHARED_CACHE_URL to keep it off the broker database.
+REDIS_URL = env('REDIS_URL', default='redis://localhost:6379/0')
+CACHE_URL = env('CACHE_URL', default='locmemcache://')
+SHARED_CACHE_ALIAS = 'shared'
+LOCAL_CACHE_BACKENDS = ('.LocMemCache', '.DummyCache')
+CACHES = {
+    'default': env.cache_url_config(CACHE_URL),
+}
+CACHE_IS_LOCAL = CACHES['default']['BACKEND'].endswith(LOCAL_CACHE_BACKENDS)
+CACHES[SHARED_CACHE_ALIAS] = env.cache_url_config(
+    env('SHARED_CACHE_URL', default=CACHE_URL if DEBUG or not CACHE_IS_LOCAL else REDIS_URL)
+)
+SHARED_CACHE_IS_LOCAL = CACHES[SHARED_CACHE_ALIAS]['BACKEND'].endswith(LOCAL_CACHE_BACKENDS)
+if SHARED_CACHE_IS_LOCAL and not DEBUG:
+    # Only reachable by configuring SHARED_CACHE_URL as local: per-process counters and
+    # invalidations silently diverge between workers
+    raise ImproperlyConfigured('SHARED_CACHE_URL must point at a shared cache such as Redis when DEBUG is off')
+
+# Serve request.user from a cached snapshot (see accounts/user_cache.py). Off when the
+# shared cache is process-local, where another worker's invalidation would never arrive.
+AUTH_USER_SNAPSHOT_ENABLED = env.bool('AUTH_USER_SNAPSHOT_ENABLED', default=not SHARED_CACHE_IS_LOCAL)
+if AUTH_USER_SNAPSHOT_ENABLED and SHARED_CACHE_IS_LOCAL:
+    raise ImproperlyConfigured('AUTH_USER_SNAPSHOT_ENABLED needs a shared SHARED_CACHE_URL (e.g. Redis)')
+# Seconds a cached auth user snapshot is trusted
+AUTH_USER_SNAPSHOT_TTL = env.int('AUTH_USER_SNAPSHOT_TTL', default=60)
+
+# Seconds a cached dashboard payload lives without an invalidating event (see api/dashboard.py)
+DASHBOARD_CACHE_TTL = env.int('DASHBOARD_CACHE_TTL', default=300)
+
+# Notifications older than this are deleted by api.tasks.prune_old_notifications
+NOTIFICATION_RETENTION_DAYS = env.int('NOTIFICATION_RETENTION_DAYS', default=180)
+
+# Seconds the admin system status snapshot is cached, and after which stored probe
+# results are too old to show without re-probing (see api/health.py)
+SYSTEM_STATUS_CACHE_TTL = env.int('SYSTEM_STATUS_CACHE_TTL', default=90)
+SYSTEM_STATUS_STALE_AFTER = env.int('SYSTEM_STATUS_STALE_AFTER', default=300)
+
+# Seconds fetched Bitcoin fee rates count as fresh; refreshed every 2 minutes by
+# accounts.tasks.refresh_bitcoin_fee_rates (see accounts/fee_oracle.py)
+BITCOIN_FEE_RATES_TTL = env.int('BITCOIN_FEE_RATES_TTL', default=600)
+
+# Chain backend used by the deposit confirmation poller (bitcoin_wallet/confirmations.py);
+# set to bitcoin_wallet.confirmations.FakeChainBackend for tests and local development
+BITCOIN_CHAIN_BACKEND = env('BITCOIN_CHAIN_BACKEND', default='bitcoin_wallet.confirmations.BlockCypherBackend')
+BITCOIN_AUTO_COMPLETE_DEPOSITS = env.bool('BITCOIN_AUTO_COMPLETE_DEPOSITS', default=True)
+
+# Redis for the virtual card authorization fast path (see banking/card_authorization.py);
+# empty keeps every card limit check on the database
+CARD_AUTH_REDIS_URL = env('CARD_AUTH_REDIS_URL', default='')
+# Seconds a card's spending window stays cached in Redis before it is reloaded from the database
+CARD_AUTH_WINDOW_TTL = env.int('CARD_AUTH_WINDOW_TTL', default=300)
+
+# Seconds a /readyz result is reused before the database and cache are checked again
+READINESS_CACHE_SECONDS = env.float('READINESS_CACHE_SECONDS', default=2.0)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -159,6 +220,16 @@ STORAGES = {
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
+    # Archived security audit logs (accounts/audit_retention.py). Never served, so keep it
+    # outside MEDIA_ROOT; in production point it at durable private storage.
+    "audit_archive": {
+        "BACKEND": env('AUDIT_ARCHIVE_STORAGE_BACKEND', default='django.core.files.storage.FileSystemStorage'),
+        "OPTIONS": env.json('AUDIT_ARCHIVE_STORAGE_OPTIONS', default={
+            'location': os.path.join(BASE_DIR, 'audit_archive'),
+            'file_permissions_mode': 0o600,
+            'directory_permissions_mode': 0o700,
+        }),
+    },
 }
 
 # Media files
@@ -242,7 +313,9 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'if-none-match',
 ]
+CORS_EXPOSE_HEADERS = ['ETag']
 
 # Email settings - Using Resend API (Direct)
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend' # Use locmem to prevent SMTP attempts
@@ -261,8 +334,8 @@ cloudinary.config(
 )
 
 # Celery settings
-CELERY_BROKER_URL = env('REDIS_URL', default='redis://localhost:6379/0')
-CELERY_RESULT_BACKEND = env('REDIS_URL', default='redis://localhost:6379/0')
+CELERY_BROKER_URL = REDIS_URL
+CELERY_RESULT_BACKEND = REDIS_URL
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
@@ -270,13 +343,29 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 
+# Buffered log writers (SearchLog, SecurityAuditLog)
+# Set BUFFERED_LOG_WRITES=False to write synchronously, e.g. in tests
+BUFFERED_LOG_WRITES = env.bool('BUFFERED_LOG_WRITES', default=True)
+BUFFERED_LOG_BATCH_SIZE = env.int('BUFFERED_LOG_BATCH_SIZE', default=100)
+BUFFERED_LOG_FLUSH_INTERVAL = env.float('BUFFERED_LOG_FLUSH_INTERVAL', default=2.0)
+
+# Buffered counters (FAQ view/feedback counts); False applies each increment immediately
+BUFFERED_COUNTERS = env.bool('BUFFERED_COUNTERS', default=True)
+BUFFERED_COUNTER_FLUSH_INTERVAL = env.float('BUFFERED_COUNTER_FLUSH_INTERVAL', default=5.0)
+
+# Security audit log retention
+# Whole months older than this are archived to the audit_archive storage and removed from the live table
+SECURITY_AUDIT_RETENTION_DAYS = env.int('SECURITY_AUDIT_RETENTION_DAYS', default=365)
+# Default window for the admin audit log list (?days= overrides)
+SECURITY_AUDIT_ADMIN_WINDOW_DAYS = env.int('SECURITY_AUDIT_ADMIN_WINDOW_DAYS', default=90)
+
 # Security settings
 if not DEBUG:
     SECURE_BROWSER_XSS_FILTER = True
     SECURE_CONTENT_TYPE_NOSNIFF = True
     SECURE_HSTS_INCLUDE_SUBDOMAINS = True
     SECURE_HSTS_SECONDS = 31536000
-    SECURE_REDIRECT_EXEMPT = []
+    SECURE_REDIRECT_EXEMPT = [r'^livez$', r'^readyz$']  # Probes hit instances over plain HTTP
     SECURE_SSL_REDIRECT = True
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
@@ -20,6 +20,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenRefreshView
 from transactions import views as transaction_views
+from api import views as api_views
 
 from django.http import JsonResponse
 
@@ -30,6 +31,10 @@ urlpatterns = [
     path('', api_root, name='api-root'),
     path('admin/', admin.site.urls),
     
+    # Load balancer / orchestrator probes (plain Django views, no DRF auth or throttling)
+    path('livez', api_views.livez, name='livez'),
+    path('readyz', api_views.readyz, name='readyz'),
+    
     # API endpoints
     path('api/auth/', include('accounts.urls')),
     path('api/banking/', include('banking.urls')),
@@ -298,6 +298,7 @@ class Bill(models.Model):
         if payment_amount > self.amount:
             return False, "Payment amount cannot exceed bill amount"
         
+        authorization = None
         try:
             with db_transaction.atomic():
                 # Lock bill row to prevent concurrent payments (definitive check)
@@ -315,11 +316,11 @@ class Bill(models.Model):
                 if new_paid_amount > bill.amount:
                     return False, f"Payment exceeds remaining balance of {bill.amount - bill.paid_amount}"
                 
-                # Lock user row to prevent concurrent balance modifications
-                user = self.user.__class__.objects.select_for_update().get(pk=self.user.pk)
-                
                 # For account balance payments, check funds and debit
                 if payment_method == 'account_balance':
+                    # Lock user row to prevent concurrent balance modifications
+                    user = self.user.__class__.objects.select_for_update().get(pk=self.user.pk)
+                    
                     if user.balance < payment_amount:
                         return False, "Insufficient funds in account balance"
                     
@@ -350,22 +351,20 @@ class Bill(models.Model):
                     
                     # Import here to avoid circular imports
                     from banking.models import VirtualCard
+                    from banking.card_authorization import authorize
                     
-                    # Lock and load the virtual card
+                    # The card balance is not touched, so neither the user nor the card row is locked
+                    user = self.user
                     try:
-                        card = VirtualCard.objects.select_for_update().get(pk=card_id, user=user)
+                        card = VirtualCard.objects.get(pk=card_id, user=user)
                     except VirtualCard.DoesNotExist:
                         return False, "Card not found or does not belong to user"
                     
-                    # Validate card can make transaction
-                    can_transact, validation_message = card.can_make_transaction(payment_amount)
-                    if not can_transact:
-                        return False, f"Card transaction denied: {validation_message}"
-                    
-                    # Update card spending counters
-                    card.current_daily_spent += payment_amount
-                    card.current_monthly_spent += payment_amount
-                    card.save(update_fields=['current_daily_spent', 'current_monthly_spent'])
+                    # Check the limits and count the charge (Redis fast path, or the locked card row)
+                    authorization = authorize(card, payment_amount)
+                    if not authorization.approved:
+                        return False, f"Card transaction denied: {authorization.message}"
+                    card = authorization.card
                     
                     # Create transaction record with card metadata
                     Transaction.objects.create(
@@ -410,6 +409,9 @@ class Bill(models.Model):
             import logging
             logger = logging.getLogger(__name__)
             logger.error(f"Bill payment failed: Error processing payment (bill_id={self.pk}, method={payment_method})", exc_info=True)
+            # The card charge was counted outside the rolled-back transaction
+            if authorization is not None:
+                authorization.release()
             return False, "Payment failed"
 
 
@@ -0,0 +1,181 @@
+"""
+Offline Bitcoin address validation.
+
+Checks Base58Check (P2PKH, P2SH) and Bech32/Bech32m (BIP173/BIP350: P2WPKH, P2WSH,
+Taproot) checksums locally on mainnet and testnet, so validation needs no network
+call. Results for recently seen addresses are kept in an LRU cache.
+"""
+import hashlib
+from collections import namedtuple
+from functools import lru_cache
+
+
+AddressInfo = namedtuple('AddressInfo', ['valid', 'network', 'script_type'])
+
+INVALID = AddressInfo(False, None, None)
+
+NETWORKS = ('mainnet', 'testnet')
+
+# Base58Check version byte -> (network, script type)
+BASE58_VERSIONS = {
+    0x00: ('mainnet', 'p2pkh'),
+    0x05: ('mainnet', 'p2sh'),
+    0x6f: ('testnet', 'p2pkh'),
+    0xc4: ('testnet', 'p2sh'),
+}
+
+BECH32_HRPS = {'bc': 'mainnet', 'tb': 'testnet'}
+
+BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+BASE58_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET)}
+
+BECH32_CHARSET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+BECH32_INDEX = {char: index for index, char in enumerate(BECH32_CHARSET)}
+BECH32_CONST = 1
+BECH32M_CONST = 0x2bc830a3
+
+ADDRESS_CACHE_SIZE = 4096
+
+
+def _base58check_decode(address):
+    number = 0
+    for char in address:
+        index = BASE58_INDEX.get(char)
+        if index is None:
+            return None
+        number = number * 58 + index
+
+    leading_zeros = len(address) - len(address.lstrip('1'))
+    body = number.to_bytes((number.bit_length() + 7) // 8, 'big') if number else b''
+    raw = b'\x00' * leading_zeros + body
+    if len(raw) < 5:
+        return None
+
+    payload, checksum = raw[:-4], raw[-4:]
+    if hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4] != checksum:
+        return None
+    return payload
+
+
+def _bech32_polymod(values):
+    generator = (0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3)
+    checksum = 1
+    for value in values:
+        top = checksum >> 25
+        checksum = (checksum & 0x1ffffff) << 5 ^ value
+        for i in range(5):
+            checksum ^= generator[i] if (top >> i) & 1 else 0
+    return checksum
+
+
+def _bech32_hrp_expand(hrp):
+    return [ord(char) >> 5 for char in hrp] + [0] + [ord(char) & 31 for char in hrp]
+
+
+def _convert_bits(data, from_bits, to_bits):
+    # Regroup 5-bit words into bytes; padding must be zero and shorter than a word
+    accumulator = 0
+    bits = 0
+    result = []
+    max_value = (1 << to_bits) - 1
+    for value in data:
+        accumulator = (accumulator << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            result.append((accumulator >> bits) & max_value)
+    if bits >= from_bits or (accumulator << (to_bits - bits)) & max_value:
+        return None
+    return result
+
+
+def _validate_segwit(address):
+    if len(address) > 90 or (address.lower() != address and address.upper() != address):
+        return INVALID
+    address = address.lower()
+    separator = address.rfind('1')
+    hrp, data_part = address[:separator], address[separator + 1:]
+    network = BECH32_HRPS.get(hrp)
+    if network is None or len(data_part) < 6:
+        return INVALID
+
+    data = []
+    for char in data_part:
+        index = BECH32_INDEX.get(char)
+        if index is None:
+            return INVALID
+        data.append(index)
+
+    const = _bech32_polymod(_bech32_hrp_expand(hrp) + data)
+    if const not in (BECH32_CONST, BECH32M_CONST) or not data[:-6]:
+        return INVALID
+
+    version = data[0]
+    program = _convert_bits(data[1:-6], 5, 8)
+    if program is None or version > 16 or not 2 <= len(program) <= 40:
+        return INVALID
+    # BIP350: version 0 uses Bech32, every later version Bech32m
+    if (version == 0) != (const == BECH32_CONST):
+        return INVALID
+
+    if version == 0:
+        script_types = {20: 'p2wpkh', 32: 'p2wsh'}
+        if len(program) not in script_types:
+            return INVALID
+        return AddressInfo(True, network, script_types[len(program)])
+    if version == 1 and len(program) == 32:
+        return AddressInfo(True, network, 'p2tr')
+    return AddressInfo(True, network, f'witness_v{version}')
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _validate(address):
+    if not 14 <= len(address) <= 90:
+        return INVALID
+
+    if address.lower().startswith(tuple(f'{hrp}1' for hrp in BECH32_HRPS)):
+        return _validate_segwit(address)
+
+    payload = _base58check_decode(address)
+    if payload is None or len(payload) != 21 or payload[0] not in BASE58_VERSIONS:
+        return INVALID
+    network, script_type = BASE58_VERSIONS[payload[0]]
+    return AddressInfo(True, network, script_type)
+
+
+def validate_address(address, network=None):
+    """
+    Validate a Bitcoin address.
+
+    Args:
+        address (str): Address to check (surrounding whitespace is ignored)
+        network (str): 'mainnet' or 'testnet' to require a network; None accepts both
+
+    Returns:
+        AddressInfo: valid, network and script type ('p2pkh', 'p2sh', 'p2wpkh',
+        'p2wsh', 'p2tr' or 'witness_vN' for future witness versions)
+    """
+    if not isinstance(address, str):
+        return INVALID
+    info = _validate(address.strip())
+    if info.valid and network is not None and info.network != network:
+        return INVALID
+    return info
+
+
+def is_valid_address(address, network=None):
+    return validate_address(address, network).valid
+
+
+def validate_addresses(addresses, network=None):
+    """
+    Validate a list of addresses.
+
+    Returns:
+        dict: address -> AddressInfo, in input order with duplicates collapsed
+    """
+    return {address: validate_address(address, network) for address in addresses}
+
+
+def clear_address_cache():
+    _validate.cache_clear()
@@ -0,0 +1,93 @@
+"""
+Background flushing shared by the in-process write buffers.
+
+``BufferedModelWriter`` (utils.buffered_writer) and ``BufferedCounter``
+(utils.buffered_counter) hold writes in memory and implement ``flush()``. This
+base runs it on a daemon thread every ``flush_interval`` seconds or when woken,
+starts a fresh thread in forked children (gunicorn/celery prefork workers), and
+drains every buffer at interpreter exit.
+"""
+import atexit
+import logging
+import os
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_buffers = []
+
+
+class BufferedFlusher:
+    """Base for buffers of writes to one model, flushed in the background."""
+
+    thread_name = 'buffered-flush'
+    flush_interval_setting = None
+    default_flush_interval = 5.0
+
+    def __init__(self, model_label, flush_interval=None):
+        self.model_label = model_label
+        self._flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher = None
+        self._pid = None
+        _buffers.append(self)
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval:
+            return self._flush_interval
+        return getattr(settings, self.flush_interval_setting or '', self.default_flush_interval)
+
+    def flush(self):
+        """Write everything buffered and return how much was written."""
+        raise NotImplementedError
+
+    def _wake(self):
+        """Flush now instead of at the next interval."""
+        self._wakeup.set()
+
+    def _ensure_flusher(self):
+        # Start lazily, and again after a fork: the parent's thread does not survive it
+        if self._flusher is not None and self._pid == os.getpid() and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._pid == os.getpid() and self._flusher.is_alive():
+                return
+            self._pid = os.getpid()
+            self._flusher = threading.Thread(
+                target=self._run, name=f'{self.thread_name}-{self.model_label}', daemon=True
+            )
+            self._flusher.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Background flush failed for {self.model_label}: {e}")
+
+
+def flush_all_buffers():
+    """Drain every registered buffer. Returns the total number of writes applied."""
+    total = 0
+    for buffer in _buffers:
+        try:
+            total += buffer.flush()
+        except Exception as e:
+            logger.error(f"Failed to drain {buffer.model_label} buffer: {e}")
+    return total
+
+
+atexit.register(flush_all_buffers)
@@ -0,0 +1,78 @@
+"""
+In-process buffered writer for append-only log tables.
+
+Records are queued in memory and written with ``bulk_create`` once the buffer
+reaches ``BUFFERED_LOG_BATCH_SIZE`` rows or every ``BUFFERED_LOG_FLUSH_INTERVAL``
+seconds, whichever comes first. Buffers are drained at interpreter exit (see
+utils.buffered_flush). Set ``BUFFERED_LOG_WRITES = False`` to write
+synchronously (e.g. in tests).
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from .buffered_flush import BufferedFlusher
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedModelWriter(BufferedFlusher):
+    """Queue model rows in memory and persist them in batches."""
+
+    thread_name = 'buffered-writer'
+    flush_interval_setting = 'BUFFERED_LOG_FLUSH_INTERVAL'
+    default_flush_interval = 2.0
+
+    def __init__(self, model_label, batch_size=None, flush_interval=None):
+        super().__init__(model_label, flush_interval)
+        self._batch_size = batch_size
+        self._buffer = []
+
+    @property
+    def batch_size(self):
+        return self._batch_size or getattr(settings, 'BUFFERED_LOG_BATCH_SIZE', 100)
+
+    def add(self, **fields):
+        """Queue a row, or write it immediately when buffering is disabled."""
+        if not getattr(settings, 'BUFFERED_LOG_WRITES', True):
+            self.model.objects.create(**fields)
+            return
+
+        with self._lock:
+            self._buffer.append(self.model(**fields))
+            full = len(self._buffer) >= self.batch_size
+
+        self._ensure_flusher()
+        if full:
+            self._wake()
+
+    def flush(self):
+        """Write everything currently buffered. Returns the number of rows written."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+
+        if not batch:
+            return 0
+
+        # Savepoints keep a failed write from breaking an enclosing transaction
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create(batch, batch_size=self.batch_size)
+            return len(batch)
+        except Exception as e:
+            # Fall back to row-by-row so one bad row does not drop the batch
+            logger.error(f"Bulk write of {len(batch)} {self.model_label} rows failed: {e}")
+            written = 0
+            for obj in batch:
+                try:
+                    with transaction.atomic():
+                        obj.save()
+                    written += 1
+                except Exception as row_error:
+                    logger.error(f"Dropping {self.model_label} row: {row_error}")
+            return written
+
+    def pending(self):
+        with self._lock:
+            return len(self._buffer)
@@ -0,0 +1,117 @@
+"""
+Query plans derived from serializers.
+
+A serializer declares the relations its output touches, and list views load
+them up front instead of once per row. The plan for a ``ModelSerializer`` is
+built from:
+
+* dotted field sources: ``source='user.username'`` -> ``select_related('user')``
+* nested serializers: forward relations are joined, to-many relations prefetched
+* ``Meta.select_related`` / ``Meta.prefetch_related``: relations read inside
+  ``SerializerMethodField`` methods or model methods, which cannot be inferred
+* ``Meta.only``: optional column list. Nothing is deferred unless declared,
+  because a deferred column read by a method field costs a query per row
+
+``QueryPlanMixin`` applies the plan in ``filter_queryset``, so a view's
+``get_queryset`` only has to filter and order.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+QueryPlan = namedtuple('QueryPlan', ['select_related', 'prefetch_related', 'only'])
+
+EMPTY_PLAN = QueryPlan((), (), ())
+
+
+def _relation_path(model, attrs):
+    """
+    Longest relation lookup along ``attrs`` and whether it crosses a to-many relation.
+
+    Walking stops at the first attribute that is not a relation (a column, a
+    property or a method).
+    """
+    path = []
+    for attr in attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation or field.related_model is None:
+            break
+        path.append(attr)
+        if field.many_to_many or field.one_to_many:
+            return '__'.join(path), True
+        model = field.related_model
+    return '__'.join(path), False
+
+
+def _prefixed(prefix, lookups):
+    return [f'{prefix}__{lookup}' for lookup in lookups]
+
+
+@lru_cache(maxsize=None)
+def get_query_plan(serializer_class):
+    """
+    Relations and columns to load for a serializer's output.
+
+    Returns:
+        QueryPlan: select_related, prefetch_related and only lookups (tuples)
+    """
+    meta = getattr(serializer_class, 'Meta', None)
+    model = getattr(meta, 'model', None)
+    if model is None:
+        return EMPTY_PLAN
+
+    select = list(getattr(meta, 'select_related', ()))
+    prefetch = list(getattr(meta, 'prefetch_related', ()))
+
+    for field in serializer_class().fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        attrs = field.source.split('.')
+        nested = isinstance(field, serializers.BaseSerializer)
+
+        # A plain related field only reads the key column; the last attribute
+        # of a dotted source is read from the related object
+        lookup, many = _relation_path(model, attrs if nested else attrs[:-1])
+        if not lookup:
+            continue
+        many = many or getattr(field, 'many', False)
+        (prefetch if many else select).append(lookup)
+        if nested:
+            child_plan = get_query_plan(type(getattr(field, 'child', field)))
+            # Joins below a prefetched relation run inside the prefetch query
+            (prefetch if many else select).extend(_prefixed(lookup, child_plan.select_related))
+            prefetch.extend(_prefixed(lookup, child_plan.prefetch_related))
+
+    return QueryPlan(
+        tuple(dict.fromkeys(select)),
+        tuple(dict.fromkeys(prefetch)),
+        tuple(getattr(meta, 'only', ())),
+    )
+
+
+def apply_query_plan(queryset, serializer_class):
+    """Load everything ``serializer_class`` reads with a fixed number of queries."""
+    if not isinstance(queryset, QuerySet):
+        return queryset
+    plan = get_query_plan(serializer_class)
+    if plan.select_related:
+        queryset = queryset.select_related(*plan.select_related)
+    if plan.prefetch_related:
+        queryset = queryset.prefetch_related(*plan.prefetch_related)
+    if plan.only:
+        queryset = queryset.only(*plan.only)
+    return queryset
+
+
+class QueryPlanMixin:
+    """Apply the serializer's query plan to the view's queryset."""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return apply_query_plan(queryset, self.get_serializer_class())
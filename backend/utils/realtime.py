@@ -4,6 +4,7 @@ Utility functions for Ably real-time updates
 import os
 import logging
 import asyncio
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +36,55 @@ def publish_to_ably_sync(channel_name, event_name, data):
     except Exception as e:
         logger.error(f"Error publishing to Ably: {str(e)}")
 
+# Channels per Ably batch publish request
+ABLY_BATCH_CHANNEL_LIMIT = 100
+
+_ably_loop = None
+_ably_loop_lock = threading.Lock()
+
+
+def _run_ably(result):
+    """Wait for an Ably SDK call; the REST client returns coroutines."""
+    global _ably_loop
+    if not asyncio.iscoroutine(result):
+        return result
+    with _ably_loop_lock:
+        # One loop per process so the SDK's HTTP client is reused across calls
+        if _ably_loop is None or _ably_loop.is_closed():
+            _ably_loop = asyncio.new_event_loop()
+        return _ably_loop.run_until_complete(result)
+
+
+def publish_batch_to_ably_sync(channel_names, event_name, data):
+    """
+    Publish the same event to many channels using Ably's batch publish endpoint.
+
+    Sends one request per ABLY_BATCH_CHANNEL_LIMIT channels instead of one per channel.
+
+    Returns:
+        int: Number of channels published to
+    """
+    if not ably_client:
+        return 0
+
+    channel_names = list(channel_names)
+    published = 0
+    for start in range(0, len(channel_names), ABLY_BATCH_CHANNEL_LIMIT):
+        channels = channel_names[start:start + ABLY_BATCH_CHANNEL_LIMIT]
+        try:
+            response = _run_ably(ably_client.request(
+                'POST', '/messages', '2',
+                body={'channels': channels, 'messages': {'name': event_name, 'data': data}}
+            ))
+            if getattr(response, 'success', True):
+                published += len(channels)
+            else:
+                logger.error(f"Ably batch publish of {event_name} failed: {getattr(response, 'error_message', '')}")
+        except Exception as e:
+            logger.error(f"Error batch publishing to Ably: {str(e)}")
+    logger.info(f"Batch published {event_name} to {published} channels")
+    return published
+
 def notify_balance_update(user_id, balance):
     """Notify user of balance update"""
     publish_to_ably_sync(f'user:{user_id}', 'balance_updated', {
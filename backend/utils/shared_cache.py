@@ -0,0 +1,13 @@
+"""
+Cache for state that every worker process must agree on.
+
+Invalidation counters, auth snapshots and other entries that one process writes
+and another reads go through ``shared_cache``, the ``SHARED_CACHE_ALIAS`` entry
+in ``CACHES`` (``SHARED_CACHE_URL``). ``primetrust/settings.py`` refuses a
+process-local backend for it outside DEBUG.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+
+shared_cache = ConnectionProxy(caches, settings.SHARED_CACHE_ALIAS)
@@ -0,0 +1,50 @@
+"""
+Version counters for cache invalidation.
+
+Cached entries embed the current version of their key in the cache key; bumping
+the version orphans every entry built from an older one, including entries being
+rebuilt concurrently with the invalidation.
+"""
+import time
+
+from .shared_cache import shared_cache
+
+
+def _version_key(name):
+    return f'version:{name}'
+
+
+def get_version(name):
+    """Current version number for ``name``."""
+    key = _version_key(name)
+    version = shared_cache.get(key)
+    if version is None:
+        # Seed from the clock so a version evicted from the cache never reuses an old number
+        shared_cache.add(key, int(time.time() * 1000), None)
+        version = shared_cache.get(key)
+    return version
+
+
+def bump_version(name):
+    """Invalidate everything cached under the current version of ``name``."""
+    key = _version_key(name)
+    try:
+        shared_cache.incr(key)
+    except ValueError:
+        shared_cache.set(key, int(time.time() * 1000), None)
+
+
+def bump_versions(names):
+    """
+    Invalidate many names with two cache round trips instead of one per name.
+
+    Call this after the underlying writes have committed: every name ends up with a
+    version different from the one read here, so entries built before the write are
+    orphaned even if a concurrent bump is overwritten.
+    """
+    keys = [_version_key(name) for name in names]
+    if not keys:
+        return
+    current = shared_cache.get_many(keys)
+    seed = int(time.time() * 1000)
+    shared_cache.set_many({key: current[key] + 1 if key in current else seed for key in keys}, None)